@@ -1,13 +1,23 @@
+import json
 import logging
+import os
 import sys
+from typing import Optional
 
 import asyncclick as click
 import structlog
 import uvicorn
 from kink import di
+from taskiq.cli.worker.args import WorkerArgs
+from taskiq.cli.worker.run import run_worker
 from uvicorn.config import LOGGING_CONFIG
 
+from src.application.services.user_service import UserService
 from src.config import Settings
+from src.di import handle_shutdown, handle_startup
+from src.domain.users.value_objects import UserFilter
+from src.presentation.taskiq.tasks.registry import min_worker_slots
+from src.presentation.taskiq.worker import WORKER_BROKER
 
 logger = structlog.get_logger()
 
@@ -45,12 +55,83 @@ async def run_rest_server(host: str, port: int, workers: int):
 
 
 @click.command()
-async def run_celery_worker():
-    container = get_container()
-    await container.init_resources()
-    celery_processor = await container.task_processor()
-    celery_app = celery_processor.celery_app
-    celery_app.worker_main(["worker", "-l", "info"])
+@click.option("--workers", type=int, default=None, help="Number of worker processes")
+@click.option(
+    "--max-async-tasks", type=int, default=None, help="Concurrent tasks per worker process"
+)
+@click.option("--prefetch", type=int, default=None, help="AMQP prefetch count per process")
+@click.option(
+    "--queues", default=None, help="Comma-separated queues to consume, all of them by default"
+)
+@click.option(
+    "--max-tasks-per-child",
+    type=int,
+    default=None,
+    help="Replace a worker process after it ran this many tasks",
+)
+def run_taskiq_worker(
+    workers: Optional[int],
+    max_async_tasks: Optional[int],
+    prefetch: Optional[int],
+    queues: Optional[str],
+    max_tasks_per_child: Optional[int],
+):
+    """Consume background tasks; options default to the TASKIQ__WORKER_* settings."""
+    settings = Settings().taskiq
+    if prefetch is not None:
+        # Read by the broker factory in every worker process
+        os.environ["TASKIQ__WORKER_PREFETCH"] = str(prefetch)
+    if queues is not None:
+        os.environ["TASKIQ__WORKER_QUEUES"] = json.dumps(queues.split(","))
+
+    max_async_tasks = max_async_tasks or settings.worker_max_async_tasks
+    needed_slots = min_worker_slots(
+        prefetch or settings.worker_prefetch,
+        queues.split(",") if queues is not None else settings.worker_queues,
+    )
+    if max_async_tasks < needed_slots:
+        # Messages beyond the slots wait behind tasks that wait on their rate limits
+        logger.warning(
+            "Fewer concurrent tasks than prefetched messages",
+            max_async_tasks=max_async_tasks,
+            needed_slots=needed_slots,
+        )
+
+    status = run_worker(
+        WorkerArgs(
+            broker=WORKER_BROKER,
+            modules=[],
+            tasks_pattern=(),
+            configure_logging=False,
+            workers=workers or settings.worker_processes,
+            max_async_tasks=max_async_tasks,
+            max_tasks_per_child=max_tasks_per_child or settings.worker_max_tasks_per_child,
+            shutdown_timeout=settings.worker_shutdown_timeout,
+        )
+    )
+    sys.exit(status or 0)
+
+@click.command()
+@click.option(
+    "--inactive-only/--all", default=True, help="Only users that are not active yet"
+)
+@click.option("--chunk-size", type=int, default=None, help="Recipients per task")
+async def resend_welcome_emails(inactive_only: bool, chunk_size: Optional[int]):
+    """Kick welcome emails for existing users, a chunk of recipients per task."""
+    await handle_startup()
+    try:
+        settings = di[Settings].taskiq
+        job = di[UserService].resend_welcome_emails(
+            UserFilter(is_active=False if inactive_only else None),
+            chunk_size=chunk_size or settings.map_chunk_size,
+            max_in_flight=settings.map_max_in_flight,
+        )
+        progress = await job.wait()
+        if progress.chunks_failed:
+            sys.exit(1)
+    finally:
+        await handle_shutdown()
+
 
 @click.group()
 def cli():
@@ -58,7 +139,8 @@ def cli():
 
 
 cli.add_command(run_rest_server, name="run_rest_server")
-cli.add_command(run_celery_worker, name="run_celery_worker")
+cli.add_command(run_taskiq_worker, name="run_taskiq_worker")
+cli.add_command(resend_welcome_emails, name="resend_welcome_emails")
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Optional
 from uuid import UUID
 
@@ -27,5 +28,53 @@ class UserReadDTO(BaseModel):
     addresses: list[UserAddress] = []
 
 
+class UserListDTO(BaseModel):
+    """Data transfer object for a list of users."""
+
+    users: list[UserReadDTO]
+    missing_ids: list[UUID] = []
+    next_page_token: Optional[str] = None
+
+
+USER_PAGE_DEFAULT_SIZE = 50
+USER_PAGE_MAX_SIZE = 500
+USER_BATCH_MAX_SIZE = 500
+USER_BATCH_GET_MAX_SIZE = 1000
+
+
+class UserBatchGetDTO(BaseModel):
+    """Data transfer object for fetching several users by ID."""
+
+    ids: list[UUID] = Field(..., min_length=1, max_length=USER_BATCH_GET_MAX_SIZE)
+
+
+class UserBatchCreateDTO(BaseModel):
+    """Data transfer object for creating several users in one request."""
+
+    users: list[UserCreateDTO] = Field(..., min_length=1, max_length=USER_BATCH_MAX_SIZE)
+
+
+class BatchItemStatus(str, Enum):
+    Created = "created"
+    Conflict = "conflict"
+    Error = "error"
+
+
+class UserBatchItemResultDTO(BaseModel):
+    """Outcome of a single item of a batch registration, by position in the request."""
+
+    index: int
+    email: EmailStr
+    status: BatchItemStatus
+    user: Optional[UserReadDTO] = None
+    detail: Optional[str] = None
+
+
+class UserBatchResultDTO(BaseModel):
+    """Data transfer object for batch registration results."""
+
+    results: list[UserBatchItemResultDTO]
+
+
 class WelcomeEmailTaskPayload(BackgroundTaskPayload):
     recipients: list[EmailStr]
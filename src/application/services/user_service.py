@@ -1,74 +1,262 @@
+import asyncio
+import hashlib
 import uuid
+from typing import Any, AsyncIterator, Optional
 
 import structlog
-from pydantic import EmailStr
+from pydantic import EmailStr, ValidationError
 
-from src.application.dto.user_dto import UserCreateDTO, UserReadDTO, WelcomeEmailTaskPayload
+from src.application.dto.user_dto import (
+    BatchItemStatus,
+    UserBatchItemResultDTO,
+    UserCreateDTO,
+    UserListDTO,
+    UserReadDTO,
+    WelcomeEmailTaskPayload,
+)
 from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.domain.background_task.task_map import TaskMap
 from src.domain.users.entities import User
-from src.domain.users.exceptions import UserAlreadyExistsError, UserNotFoundError
+from src.domain.users.exceptions import (
+    InvalidCredentialsError,
+    UserAlreadyExistsError,
+    UserNotFoundError,
+)
 from src.domain.users.repositories import UserRepository
+from src.domain.users.services import PasswordHashingService
+from src.domain.users.value_objects import UserFilter, UserPageCursor, UserPublic, UserSummary
+from src.utils.page_token import InvalidPageTokenError, decode_page_token, encode_page_token
 
 logger = structlog.get_logger()
 
 
 class UserService:
     def __init__(
-        self, user_repository: UserRepository, task_processor: BackgroundTaskProcessor
+        self,
+        user_repository: UserRepository,
+        task_processor: BackgroundTaskProcessor,
+        password_hasher: PasswordHashingService,
     ):
         self.user_repository = user_repository
         self.task_processor = task_processor
+        self.password_hasher = password_hasher
 
     async def register(self, user_dto: UserCreateDTO) -> UserReadDTO:
         # Check if a user already exists
-        existing_user = await self.user_repository.get_by_email(user_dto.email)
+        existing_user = await self.user_repository.get_by_email(
+            user_dto.email, projection=UserSummary
+        )
         if existing_user:
             raise UserAlreadyExistsError(user_dto.email)
 
-        # Create a user entity
-        user = User(
-            email=user_dto.email,
-            first_name=user_dto.first_name or "",
-            last_name=user_dto.last_name or "",
-            addresses=user_dto.addresses,
-        )
-        user.set_password(user_dto.password)
+        # Create a user entity, hashing off the event loop
+        user = self._create_entity(user_dto)
+        user.set_password_hash(await self.password_hasher.hash_password(user_dto.password))
 
         # Save user
         created_user = await self.user_repository.save(user)
 
-        # Send a welcome email
+        # Send a welcome email, once per user however often the kick is repeated
         await self.task_processor.execute_task(
             task_name='send_welcome_email',
-            payload=WelcomeEmailTaskPayload(recipients=[created_user.email])
+            payload=WelcomeEmailTaskPayload(recipients=[created_user.email]),
+            idempotency_key=f"welcome_email:{created_user.id}",
         )
 
         # Return user DTO
-        return UserReadDTO(
-            id=created_user.id,
-            email=created_user.email,
-            first_name=created_user.first_name,
-            last_name=created_user.last_name,
-            addresses=created_user.addresses,
+        return self._to_read_dto(created_user)
+
+    async def register_many(
+        self, user_dtos: list[UserCreateDTO]
+    ) -> list[UserBatchItemResultDTO]:
+        results: list[UserBatchItemResultDTO | None] = [None] * len(user_dtos)
+
+        # Check every email with a single query
+        existing_emails = {
+            user.email
+            for user in await self.user_repository.get_many_by_email(
+                list(dict.fromkeys(user_dto.email for user_dto in user_dtos)),
+                projection=UserSummary,
+            )
+        }
+
+        pending: list[tuple[int, UserCreateDTO]] = []
+        seen_emails: set[str] = set()
+        for index, user_dto in enumerate(user_dtos):
+            if user_dto.email in existing_emails or user_dto.email in seen_emails:
+                results[index] = UserBatchItemResultDTO(
+                    index=index,
+                    email=user_dto.email,
+                    status=BatchItemStatus.Conflict,
+                    detail=str(UserAlreadyExistsError(user_dto.email)),
+                )
+                continue
+            seen_emails.add(user_dto.email)
+            pending.append((index, user_dto))
+
+        # Hash in parallel on the hashing pool
+        hashed_passwords = await asyncio.gather(
+            *(self.password_hasher.hash_password(user_dto.password) for _, user_dto in pending)
         )
+        users = []
+        for (_, user_dto), hashed_password in zip(pending, hashed_passwords):
+            user = self._create_entity(user_dto)
+            user.set_password_hash(hashed_password)
+            users.append(user)
+
+        # Save users with a single write
+        created_users: list[User] = []
+        outcomes = await self.user_repository.save_many(users)
+        for (index, user_dto), outcome in zip(pending, outcomes):
+            result = UserBatchItemResultDTO(
+                index=index, email=user_dto.email, status=BatchItemStatus.Created
+            )
+            if isinstance(outcome, UserAlreadyExistsError):
+                result.status, result.detail = BatchItemStatus.Conflict, str(outcome)
+            elif isinstance(outcome, Exception):
+                logger.error("Failed to save user", email=user_dto.email, error=str(outcome))
+                result.status, result.detail = BatchItemStatus.Error, str(outcome)
+            else:
+                created_users.append(outcome)
+                result.user = self._to_read_dto(outcome)
+            results[index] = result
+
+        # Send welcome emails with a single task
+        if created_users:
+            try:
+                await self.task_processor.execute_task(
+                    task_name='send_welcome_email',
+                    payload=WelcomeEmailTaskPayload(
+                        recipients=[user.email for user in created_users]
+                    ),
+                    idempotency_key=self._welcome_email_key(created_users),
+                )
+            except Exception as e:
+                # The users exist already, report them as created regardless
+                logger.error("Failed to enqueue welcome emails", exc_info=e)
+
+        return results
+
+    async def authenticate(self, email: EmailStr, password: str) -> UserReadDTO:
+        user = await self.user_repository.get_by_email(email)
+        if not user or not await self.password_hasher.verify_password(
+            password, user.password_hash
+        ):
+            raise InvalidCredentialsError()
+
+        # Transparently upgrade hashes produced under an older cost policy
+        if self.password_hasher.needs_rehash(user.password_algorithm, user.password_params):
+            user.set_password_hash(await self.password_hasher.hash_password(password))
+            await self.user_repository.update_password(user)
+            logger.info("Upgraded password hash", user_id=str(user.id))
+
+        return self._to_read_dto(user)
 
     async def get_user(self, user_id: uuid.UUID) -> UserReadDTO:
-        user = await self.user_repository.get_by_id(user_id)
+        user = await self.user_repository.get_by_id(user_id, projection=UserPublic)
         if not user:
             raise UserNotFoundError(user_id)
-        return UserReadDTO(
-            id=user.id,
-            email=user.email,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            addresses=user.addresses,
+        return self._to_read_dto(user)
+
+    async def get_users(self, user_ids: list[uuid.UUID]) -> UserListDTO:
+        # Deduplicate while keeping the caller's order
+        user_ids = list(dict.fromkeys(user_ids))
+        users_by_id = {
+            user.id: user
+            for user in await self.user_repository.get_many_by_ids(
+                user_ids, projection=UserPublic
+            )
+        }
+        return UserListDTO(
+            users=[
+                self._to_read_dto(users_by_id[user_id])
+                for user_id in user_ids
+                if user_id in users_by_id
+            ],
+            missing_ids=[user_id for user_id in user_ids if user_id not in users_by_id],
+        )
+
+    async def list_users(self, page_size: int, page_token: Optional[str] = None) -> UserListDTO:
+        """
+        List users newest first using keyset pagination.
+
+        :raises InvalidPageTokenError: if ``page_token`` was not issued by this method.
+        """
+        after = None
+        if page_token:
+            try:
+                after = UserPageCursor.model_validate(decode_page_token(page_token))
+            except ValidationError:
+                raise InvalidPageTokenError()
+
+        users, next_cursor = await self.user_repository.list_page(
+            page_size, after=after, projection=UserPublic
+        )
+        return UserListDTO(
+            users=[self._to_read_dto(user) for user in users],
+            next_page_token=(
+                encode_page_token(next_cursor.model_dump(mode="json")) if next_cursor else None
+            ),
+        )
+
+    def stream_users(
+        self,
+        user_filter: UserFilter,
+        fields: Optional[list[str]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[dict[str, Any]]:
+        return self.user_repository.stream(user_filter, fields=fields, batch_size=batch_size)
+
+    def resend_welcome_emails(
+        self, user_filter: UserFilter, chunk_size: int = 500, max_in_flight: int = 4
+    ) -> TaskMap[dict[str, Any]]:
+        """
+        Kick welcome emails for every user matching ``user_filter``, streamed from the
+        repository, with ``chunk_size`` recipients per task.
+        """
+        return self.task_processor.map(
+            'send_welcome_email',
+            self.user_repository.stream(user_filter, fields=["email"], batch_size=chunk_size),
+            lambda users: WelcomeEmailTaskPayload(recipients=[user["email"] for user in users]),
+            chunk_size=chunk_size,
+            max_in_flight=max_in_flight,
         )
 
     async def get_user_by_email(self, email: EmailStr) -> UserReadDTO:
-        user = await self.user_repository.get_by_email(email)
+        user = await self.user_repository.get_by_email(email, projection=UserSummary)
         if not user:
             raise UserNotFoundError(email)
-        return UserReadDTO(
+        return UserReadDTO.model_construct(id=user.id, email=user.email)
+
+    async def get_users_by_email(self, emails: list[EmailStr]) -> list[UserReadDTO]:
+        """Return the users matching any of ``emails`` with a single query, in no particular order."""
+        if not emails:
+            return []
+        users = await self.user_repository.get_many_by_email(emails, projection=UserSummary)
+        return [UserReadDTO.model_construct(id=user.id, email=user.email) for user in users]
+
+    @staticmethod
+    def _create_entity(user_dto: UserCreateDTO) -> User:
+        return User(
+            email=user_dto.email,
+            first_name=user_dto.first_name or "",
+            last_name=user_dto.last_name or "",
+            addresses=user_dto.addresses,
+        )
+
+    @staticmethod
+    def _welcome_email_key(users: list[User]) -> str:
+        # The same set of users always gets the same key
+        digest = hashlib.sha256(",".join(sorted(str(user.id) for user in users)).encode())
+        return f"welcome_email:{digest.hexdigest()}"
+
+    @staticmethod
+    def _to_read_dto(user: User | UserPublic) -> UserReadDTO:
+        # Users come from the repository already validated, skip re-running validators
+        return UserReadDTO.model_construct(
             id=user.id,
             email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            addresses=user.addresses,
         )
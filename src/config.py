@@ -21,7 +21,154 @@ class RestServerSettings(BaseModel):
 
 
 class TaskiqSettings(BaseModel):
+    # "in_process" runs tasks on asyncio workers in the API process, without a broker
+    processor: Literal["broker", "in_process"] = "broker"
+    in_process_concurrency: int = 10
+    in_process_queue_size: int = 1000
     broker_url: Optional[str] = None
+    # run_taskiq_worker: processes, concurrent tasks per process, AMQP prefetch (QoS),
+    # and how many tasks a process runs before it is replaced (unlimited when unset).
+    # The prefetch applies per consumed queue; keep max_async_tasks at least prefetch
+    # times the queues, or tasks waiting on rate limits can hold every slot
+    worker_processes: int = 2
+    worker_max_async_tasks: int = 200
+    worker_prefetch: int = 100
+    # Queues a worker consumes, all of them when unset; run separate workers for
+    # "transactional" to keep welcome emails clear of bulk jobs
+    worker_queues: Optional[list[str]] = None
+    worker_max_tasks_per_child: Optional[int] = None
+    worker_shutdown_timeout: float = 5.0
+    # Batch-aware tasks gather up to this many messages, waiting at most this long;
+    # batches are capped by the prefetch
+    worker_batch_size: int = 50
+    worker_batch_wait_ms: float = 20.0
+    # "compact" drops payload field names from task messages. Roll out in two steps:
+    # deploy workers of this version, which read both formats, then switch producers
+    # to "compact". The msgpack codec needs the msgpack package
+    wire_format: Literal["compact", "json"] = "json"
+    compact_codec: Literal["json", "msgpack"] = "json"
+    # Channels with publisher confirms that kicks are spread over
+    publish_channels: int = 1
+    # Task results are kept in Mongo this long; GET /v1/tasks/{id}?wait= waits at most
+    # result_max_wait_seconds, checking for results of other processes every poll interval
+    result_ttl_seconds: float = 86_400.0
+    result_poll_interval_ms: float = 200.0
+    result_max_wait_seconds: float = 30.0
+    # Bulk jobs fanned out with map(): items per task, and chunks kicked at once
+    map_chunk_size: int = 500
+    map_max_in_flight: int = 4
+    # Buffer kicks and publish them in batches; ignored when the outbox is enabled
+    batching: bool = False
+    buffer_size: int = 10_000
+    batch_size: int = 100
+    linger_ms: float = 5.0
+    # How long shutdown waits for buffered kicks to be published
+    drain_timeout_seconds: float = 10.0
+
+
+class PasswordHashingSettings(BaseModel):
+    executor: Literal["process", "thread"] = "thread"
+    pool_size: int = 4
+    queue_depth: int = 64
+    target_latency_ms: float = 250.0
+    min_rounds: int = 10
+    max_rounds: int = 16
+    # Pins the bcrypt cost and skips the startup benchmark
+    rounds: Optional[int] = None
+
+
+class UserCacheSettings(BaseModel):
+    enabled: bool = False
+    max_size: int = 10_000
+    ttl_seconds: float = 30.0
+    negative_ttl_seconds: float = 5.0
+    # "memory" is a single-process stand-in for a real shared cache
+    shared_backend: Literal["none", "memory"] = "none"
+    shared_ttl_seconds: float = 300.0
+
+
+class OutboxSettings(BaseModel):
+    # Record task kicks in the Mongo outbox and publish them from a background relay
+    enabled: bool = False
+    batch_size: int = 100
+    flush_interval_seconds: float = 1.0
+    lease_seconds: float = 30.0
+    max_attempts: int = 10
+    retry_backoff_seconds: float = 5.0
+
+
+class IdempotencySettings(BaseModel):
+    # Drop kicks and skip task runs repeating an idempotency key within the window.
+    # Costs a Mongo round trip per kick; enable on the workers before the producers
+    enabled: bool = False
+    window_seconds: float = 3600.0
+    # Keys known to be taken are also kept in each process, for at most this long
+    local_cache_size: int = 10_000
+    local_cache_ttl_seconds: float = 60.0
+
+
+class EmailSettings(BaseModel):
+    smtp_host: str = "localhost"
+    smtp_port: int = 25
+    smtp_username: Optional[str] = None
+    smtp_password: Optional[str] = None
+    # Implicit TLS, as used on port 465. Otherwise sessions are upgraded with STARTTLS
+    # when offered, or must be with smtp_start_tls=true; credentials are only ever
+    # sent over an encrypted session
+    smtp_use_tls: bool = False
+    smtp_start_tls: Optional[bool] = None
+    smtp_timeout_seconds: float = 30.0
+    sender: str = "no-reply@example.com"
+    # Persistent SMTP sessions per process, and how many of them may deliver to the
+    # same recipient domain at once
+    pool_size: int = 4
+    per_domain_concurrency: int = 2
+    max_messages_per_session: int = 50
+    max_idle_seconds: float = 60.0
+
+
+class LogQueueSettings(BaseModel):
+    # Render and write log lines on a background thread, in batches, instead of on
+    # the event loop
+    enabled: bool = False
+    max_size: int = 10_000
+    # What a full queue does with new lines: drop them, or make the logging call wait
+    overflow: Literal["drop", "block"] = "drop"
+    batch_size: int = 256
+    flush_interval_ms: int = 100
+
+
+class LogSamplingSettings(BaseModel):
+    # Keep only a share of the info and debug lines of each event; warnings and
+    # errors are always kept
+    enabled: bool = False
+    # Share of lines kept per event, e.g. {"Registered task": 0.1}
+    rates: dict[str, float] = {}
+    default_rate: float = 1.0
+    # Keep or drop the lines of a request together
+    key_on_request_id: bool = True
+    # Lines per second each event may log after sampling, unlimited when unset
+    rate_limit_per_second: Optional[float] = None
+    rate_limit_burst: int = 100
+    summary_interval_seconds: float = 60.0
+
+
+class RequestTimingSettings(BaseModel):
+    # Share of requests written to the access log, by request ID; server errors are
+    # always written
+    access_log_sample_rate: float = 1.0
+    # Tell clients how long requests spent in the database and kicking tasks
+    server_timing: bool = True
+
+
+class MetricsSettings(BaseModel):
+    # Prometheus metrics served at /metrics
+    enabled: bool = True
+    # Shared by the processes of one deployment so a scrape sees all of them, e.g.
+    # several uvicorn workers; prometheus_client's multiprocess directory, should be
+    # emptied on deploy
+    multiprocess_dir: Optional[str] = None
+    flush_interval_seconds: float = 5.0
 
 
 class CelerySettings(BaseModel):
@@ -40,7 +187,16 @@ class Settings(BaseSettings):
     service: ServiceConfig = ServiceConfig()
     environment: Literal["production", "staging", "development"] = "development"
     log_level: Literal["debug", "info", "warning", "error", "critical"] = "info"
+    log_queue: Optional[LogQueueSettings] = LogQueueSettings()
+    log_sampling: Optional[LogSamplingSettings] = LogSamplingSettings()
     mongo: Optional[MongoDBSettings] = MongoDBSettings()
     rest_server: Optional[RestServerSettings] = RestServerSettings()
     celery: Optional[CelerySettings] = CelerySettings()
     taskiq: Optional[TaskiqSettings] = TaskiqSettings()
+    outbox: Optional[OutboxSettings] = OutboxSettings()
+    idempotency: Optional[IdempotencySettings] = IdempotencySettings()
+    password_hashing: Optional[PasswordHashingSettings] = PasswordHashingSettings()
+    user_cache: Optional[UserCacheSettings] = UserCacheSettings()
+    email: Optional[EmailSettings] = EmailSettings()
+    metrics: Optional[MetricsSettings] = MetricsSettings()
+    request_timing: Optional[RequestTimingSettings] = RequestTimingSettings()
@@ -1,19 +1,65 @@
+from typing import Any, Callable, Optional, TypeVar
+
 from kink import di
 from taskiq import AsyncBroker
-from taskiq_aio_pika import AioPikaBroker
 
 from src.application.services.user_service import UserService
 from src.config import Settings
-from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.domain.background_task.repositories import (
+    BackgroundTaskProcessor,
+    TaskDeduplicationStore,
+    TaskResultRepository,
+)
+from src.domain.email.services import EmailSender
 from src.domain.users.repositories import UserRepository
+from src.domain.users.services import PasswordHasher, PasswordHashingService
+from src.infrastructure.cache.local import LocalTTLCache
+from src.infrastructure.cache.repositories.user import CachingUserRepository
+from src.infrastructure.cache.shared import InMemorySharedCache, SharedCache
+from src.infrastructure.email.delivery import SMTPEmailSender
+from src.infrastructure.email.smtp import SMTPConnectionPool
+from src.infrastructure.email.templates import EmailTemplateRenderer
+from src.infrastructure.idempotency.processor import DeduplicatingTaskProcessor
+from src.infrastructure.idempotency.store import MongoTaskDeduplicationStore
 from src.infrastructure.mongodb.config import BeanieClient
 from src.infrastructure.mongodb.repositories.user import BeanieUserRepository
+from src.infrastructure.outbox.processor import OutboxTaskProcessor
+from src.infrastructure.outbox.relay import OutboxRelay
+from src.infrastructure.security.password import (
+    PooledPasswordHashingService,
+    build_password_hasher,
+)
 
+from src.observability.instrumentation import (
+    TimedTaskProcessor,
+    TimedUserRepository,
+    processor_stats,
+)
+from src.observability.log_queue import QueuedLogWriter
 from src.observability.logging import AppLogger
+from src.observability.metrics import MetricsRegistry, process_stats
+from src.observability.sampling import LogSampler
 from src.presentation.taskiq.app import TaskiqProcessor
+from src.presentation.taskiq.batching import BatchingTaskiqProcessor
+from src.presentation.taskiq.broker import PooledAioPikaBroker
+from src.presentation.taskiq.in_process import InProcessTaskProcessor
+from src.presentation.taskiq.result_backend import MongoResultBackend
+from src.presentation.taskiq.serialization import (
+    CODECS,
+    CompactTaskFormatter,
+    task_payload_types,
+)
+from src.presentation.taskiq.tasks.registry import MAX_PRIORITY, TASK_REGISTRY, task_queues
+from src.presentation.taskiq.tasks.user import WelcomeEmailBatcher, send_welcome_emails
+
+
+T = TypeVar("T")
 
+# Services built by close_on_shutdown factories, still to be closed
+_created_services: list[Any] = []
 
-def setup_di_container(settings: Settings = None):
+
+def setup_di_container(settings: Settings = None, broker: AsyncBroker = None):
     """Initialize the dependency injection container."""
     if settings is None:
         settings = Settings()
@@ -21,9 +67,33 @@ def setup_di_container(settings: Settings = None):
     # Register configuration
     di[Settings] = settings
 
-    # Taskiq Broker
-    taskiq_broker = AioPikaBroker(settings.taskiq.broker_url)
-    di[AsyncBroker] = taskiq_broker
+    # Taskiq Broker, worker processes bring their own
+    if broker is None:
+        broker = PooledAioPikaBroker(
+            settings.taskiq.broker_url,
+            publish_channels=settings.taskiq.publish_channels,
+            task_queues=task_queues(),
+            task_queue_max_priority=MAX_PRIORITY,
+        )
+    broker.with_formatter(
+        CompactTaskFormatter(
+            task_payload_types(TASK_REGISTRY),
+            codec=CODECS[settings.taskiq.compact_codec](),
+            wire_format=settings.taskiq.wire_format,
+        )
+    )
+    # Workers record results through the broker, the API reads them back
+    result_backend = MongoResultBackend(
+        ttl_seconds=settings.taskiq.result_ttl_seconds,
+        poll_interval_seconds=settings.taskiq.result_poll_interval_ms / 1000,
+    )
+    broker.with_result_backend(result_backend)
+    di[AsyncBroker] = broker
+    di[TaskResultRepository] = result_backend
+
+    # Metrics shared by every layer, registered first so the others can record into it
+    if settings.metrics.enabled:
+        di[MetricsRegistry] = MetricsRegistry(multiprocess_dir=settings.metrics.multiprocess_dir)
 
     # Register MongoDB
     di[BeanieClient] = lambda _di: BeanieClient(
@@ -36,50 +106,316 @@ def setup_di_container(settings: Settings = None):
     # Register services
     register_services()
 
+    if settings.metrics.enabled:
+        register_metrics()
+
     return di
 
 
+def metrics_registry(_di) -> Optional[MetricsRegistry]:
+    return _di[MetricsRegistry] if _di[Settings].metrics.enabled else None
+
+
+def close_on_shutdown(factory: Callable[[Any], T]) -> Callable[[Any], T]:
+    """
+    Wrap a service factory so the services it builds are closed by
+    close_created_services. Services that were never used are never created just
+    to be closed.
+    """
+    # kink only calls, and memoizes, factories that are lambdas
+    return lambda _di: _created(factory(_di))
+
+
+def _created(service: T) -> T:
+    _created_services.append(service)
+    return service
+
+
+async def close_created_services() -> None:
+    """Close the services built by close_on_shutdown factories, newest first."""
+    while _created_services:
+        await _created_services.pop().close()
+
+
 def register_repositories():
     """Register all repositories in the DI container."""
-    di[UserRepository] = lambda _di: BeanieUserRepository()
+    cache_settings = di[Settings].user_cache
+
+    def user_repository(_di) -> UserRepository:
+        # Timed for the request's Server-Timing breakdown, and metrics when enabled
+        return TimedUserRepository(BeanieUserRepository(), metrics_registry(_di))
+
+    if cache_settings.shared_backend == "memory":
+        di[SharedCache] = lambda _di: InMemorySharedCache()
+
+    if cache_settings.enabled:
+        # Timed behind the cache, so only the queries reaching Mongo are measured
+        di[UserRepository] = lambda _di: CachingUserRepository(
+            user_repository(_di),
+            local_cache=LocalTTLCache(
+                max_size=cache_settings.max_size, ttl_seconds=cache_settings.ttl_seconds
+            ),
+            shared_cache=_di[SharedCache] if SharedCache in _di else None,
+            shared_ttl_seconds=cache_settings.shared_ttl_seconds,
+            negative_ttl_seconds=cache_settings.negative_ttl_seconds,
+        )
+    else:
+        di[UserRepository] = user_repository
 
 
 def register_services():
     """Register all application services."""
-    di[BackgroundTaskProcessor] = lambda _di: TaskiqProcessor(_di[AsyncBroker])
+    outbox_settings = di[Settings].outbox
+    taskiq_settings = di[Settings].taskiq
+    idempotency_settings = di[Settings].idempotency
+    in_process = taskiq_settings.processor == "in_process"
+
+    if idempotency_settings.enabled:
+        di[TaskDeduplicationStore] = lambda _di: MongoTaskDeduplicationStore(
+            window_seconds=idempotency_settings.window_seconds,
+            local_cache=LocalTTLCache(
+                max_size=idempotency_settings.local_cache_size,
+                ttl_seconds=idempotency_settings.local_cache_ttl_seconds,
+            ),
+        )
+
+    def dedup_store(_di):
+        return _di[TaskDeduplicationStore] if TaskDeduplicationStore in _di else None
+
+    if in_process:
+        di[InProcessTaskProcessor] = lambda _di: InProcessTaskProcessor(
+            concurrency=taskiq_settings.in_process_concurrency,
+            queue_size=taskiq_settings.in_process_queue_size,
+            dedup_store=dedup_store(_di),
+            result_backend=_di[AsyncBroker].result_backend,
+        )
+
+    if outbox_settings.enabled:
+        di[OutboxRelay] = lambda _di: OutboxRelay(
+            _di[InProcessTaskProcessor]
+            if in_process
+            else TaskiqProcessor(_di[AsyncBroker], dedup_store(_di)),
+            batch_size=outbox_settings.batch_size,
+            flush_interval_seconds=outbox_settings.flush_interval_seconds,
+            lease_seconds=outbox_settings.lease_seconds,
+            max_attempts=outbox_settings.max_attempts,
+            retry_backoff_seconds=outbox_settings.retry_backoff_seconds,
+        )
+        processor = lambda _di: OutboxTaskProcessor(_di[OutboxRelay])
+    elif in_process:
+        processor = lambda _di: _di[InProcessTaskProcessor]
+    elif taskiq_settings.batching:
+        processor = lambda _di: BatchingTaskiqProcessor(
+            _di[AsyncBroker],
+            buffer_size=taskiq_settings.buffer_size,
+            batch_size=taskiq_settings.batch_size,
+            linger_ms=taskiq_settings.linger_ms,
+            drain_timeout_seconds=taskiq_settings.drain_timeout_seconds,
+            dedup_store=dedup_store(_di),
+        )
+    else:
+        processor = lambda _di: TaskiqProcessor(_di[AsyncBroker], dedup_store(_di))
+
+    if idempotency_settings.enabled:
+        # Repeated kicks are dropped before they reach the outbox or the broker
+        deduplicated = processor
+        processor = lambda _di: DeduplicatingTaskProcessor(
+            deduplicated(_di), _di[TaskDeduplicationStore]
+        )
+
+    di[BackgroundTaskProcessor] = lambda _di: TimedTaskProcessor(
+        processor(_di), metrics_registry(_di)
+    )
+
+    di[PasswordHasher] = lambda _di: build_password_hasher(_di[Settings].password_hashing)
+
+    di[PasswordHashingService] = close_on_shutdown(
+        lambda _di: PooledPasswordHashingService(
+            hasher=_di[PasswordHasher],
+            executor=_di[Settings].password_hashing.executor,
+            pool_size=_di[Settings].password_hashing.pool_size,
+            queue_depth=_di[Settings].password_hashing.queue_depth,
+        )
+    )
+
+    email_settings = di[Settings].email
+    di[EmailSender] = close_on_shutdown(
+        lambda _di: SMTPEmailSender(
+            SMTPConnectionPool(
+                email_settings.smtp_host,
+                email_settings.smtp_port,
+                sender=email_settings.sender,
+                size=email_settings.pool_size,
+                username=email_settings.smtp_username,
+                password=email_settings.smtp_password,
+                use_tls=email_settings.smtp_use_tls,
+                start_tls=email_settings.smtp_start_tls,
+                timeout_seconds=email_settings.smtp_timeout_seconds,
+                max_idle_seconds=email_settings.max_idle_seconds,
+            ),
+            per_domain_concurrency=email_settings.per_domain_concurrency,
+            max_messages_per_session=email_settings.max_messages_per_session,
+        )
+    )
+    di[EmailTemplateRenderer] = lambda _di: EmailTemplateRenderer(
+        service_name=_di[Settings].service.name
+    )
+
+    di[WelcomeEmailBatcher] = lambda _di: WelcomeEmailBatcher(
+        lambda payloads: send_welcome_emails(
+            payloads, _di[UserService], _di[EmailSender], _di[EmailTemplateRenderer]
+        ),
+        max_batch_size=taskiq_settings.worker_batch_size,
+        max_wait_ms=taskiq_settings.worker_batch_wait_ms,
+    )
 
     di[UserService] = lambda _di: UserService(
-        user_repository=_di[UserRepository], task_processor=_di[BackgroundTaskProcessor]
+        user_repository=_di[UserRepository],
+        task_processor=_di[BackgroundTaskProcessor],
+        password_hasher=_di[PasswordHashingService],
     )
 
 
-async def handle_startup():
-    setup_di_container()
+def register_metrics():
+    """Publish the counters the components keep as gauges, read on each scrape."""
+    registry = di[MetricsRegistry]
+
+    # Per-process peaks are not added up across processes
+    registry.register_stats(
+        "process",
+        "Process resource usage",
+        process_stats,
+        multiprocess_mode={"max_rss_bytes": "livemax"},
+        counters=["cpu_seconds_total"],
+    )
+    registry.register_stats(
+        "task_processor",
+        "Background task processor",
+        lambda: processor_stats(di[BackgroundTaskProcessor]),
+    )
+    registry.register_stats(
+        "task_results",
+        "Task result lookups",
+        lambda: {"waiting": di[TaskResultRepository].waiting},
+    )
+    registry.register_stats("email", "Email delivery", lambda: di[EmailSender].stats())
+    registry.register_stats(
+        "user_cache",
+        "User cache",
+        lambda: di[UserRepository].stats() if hasattr(di[UserRepository], "stats") else {},
+    )
+    if TaskDeduplicationStore in di:
+        registry.register_stats(
+            "idempotency", "Idempotency keys", lambda: di[TaskDeduplicationStore].stats()
+        )
+    registry.register_stats(
+        "log_queue",
+        "Queued log writer",
+        lambda: di[QueuedLogWriter].stats() if QueuedLogWriter in di else {},
+        multiprocess_mode={"queued": "livemax"},
+    )
+    if OutboxRelay in di:
+        registry.register_stats("outbox", "Task outbox relay", lambda: di[OutboxRelay].stats())
+
+    if di[Settings].taskiq.processor == "broker":
+        async def queue_depths():
+            return await di[AsyncBroker].queue_depths()
+
+        # Broker-wide, so read by the scraped process only
+        registry.register_stats(
+            "task_queue_depth", "Messages waiting in each task queue", queue_depths, "queue"
+        )
+
+
+def configure_logging(settings: Settings):
+    # Lines queued under an earlier configuration are written out first
+    if QueuedLogWriter in di:
+        di[QueuedLogWriter].close()
+
+    log_writer = None
+    if settings.log_queue.enabled:
+        log_writer = QueuedLogWriter(
+            max_size=settings.log_queue.max_size,
+            overflow=settings.log_queue.overflow,
+            batch_size=settings.log_queue.batch_size,
+            flush_interval_seconds=settings.log_queue.flush_interval_ms / 1000,
+        )
+        di[QueuedLogWriter] = log_writer
+
+    log_sampler = None
+    if settings.log_sampling.enabled:
+        log_sampler = LogSampler(
+            rates=settings.log_sampling.rates,
+            default_rate=settings.log_sampling.default_rate,
+            key_on_request_id=settings.log_sampling.key_on_request_id,
+            rate_limit_per_second=settings.log_sampling.rate_limit_per_second,
+            rate_limit_burst=settings.log_sampling.rate_limit_burst,
+            summary_interval_seconds=settings.log_sampling.summary_interval_seconds,
+        )
 
-    settings = di[Settings]
-    # Initialize logger
     AppLogger(
         service_name=settings.service.name,
         log_level=settings.log_level,
         environment=settings.environment,
         service_version=settings.service.version,
         service_namespace=settings.service.namespace,
+        log_writer=log_writer,
+        log_sampler=log_sampler,
     )
 
+
+async def handle_startup():
+    setup_di_container()
+
+    settings = di[Settings]
+    # Initialize logger
+    configure_logging(settings)
+
+    # Benchmark the host and pick the password hashing cost
+    di[PasswordHasher]
+
     # Initialize Mongo
     await di[BeanieClient].initialize()
 
     # Start broker
-    await di[AsyncBroker].startup()
+    if settings.taskiq.processor == "broker":
+        await di[AsyncBroker].startup()
 
     # Register background tasks
     await di[BackgroundTaskProcessor].register_tasks()
 
+    # Start publishing tasks recorded in the outbox
+    if OutboxRelay in di:
+        await di[OutboxRelay].start()
+
+    # Share this process's metrics with the other processes of the deployment
+    if MetricsRegistry in di:
+        await di[MetricsRegistry].start(settings.metrics.flush_interval_seconds)
+
 
 async def handle_shutdown():
+    if MetricsRegistry in di:
+        await di[MetricsRegistry].stop()
+
+    # Flush the outbox while the broker is still up
+    if OutboxRelay in di:
+        await di[OutboxRelay].stop()
+
+    # Publish buffered kicks, or finish in-process tasks
+    await di[BackgroundTaskProcessor].close()
+
     # Stop broker
-    await di[AsyncBroker].shutdown()
+    if di[Settings].taskiq.processor == "broker":
+        await di[AsyncBroker].shutdown()
 
     await di[BeanieClient].close()
+
+    # Stop the password hashing pool and close pooled SMTP sessions, if they were used
+    await close_created_services()
+
+    # Write out queued log lines, later ones are written straight away
+    if QueuedLogWriter in di:
+        di[QueuedLogWriter].close()
+
     # Clear DI container cache
     di.clear_cache()
@@ -1,9 +1,11 @@
 import abc
-from typing import TypeVar
+from typing import AsyncIterable, Callable, Iterable, Optional, TypeVar
 
-from src.domain.background_task.value_objects import BackgroundTaskPayload
+from src.domain.background_task.task_map import TaskMap
+from src.domain.background_task.value_objects import BackgroundTaskPayload, TaskResult
 
 T = TypeVar("T", bound="BackgroundTaskProcessor")
+Item = TypeVar("Item")
 
 
 class BackgroundTaskProcessor(abc.ABC):
@@ -19,7 +21,9 @@ class BackgroundTaskProcessor(abc.ABC):
     async def execute_task(
             self,
             task_name: str,
-            payload: BackgroundTaskPayload
+            payload: BackgroundTaskPayload,
+            task_id: Optional[str] = None,
+            idempotency_key: Optional[str] = None,
     ) -> str:
         """
         Abstract method that executes a specific background task identified by its name and utilizes
@@ -30,6 +34,83 @@ class BackgroundTaskProcessor(abc.ABC):
         :param task_name: The unique identifier or name of the specific task to be executed.
         :param payload: An instance of BackgroundTaskPayload containing the data or parameters
             needed to execute the specified task.
+        :param task_id: Reuse an ID that was handed out earlier, e.g. when relaying a task
+            from the outbox. A new one is generated when omitted.
+        :param idempotency_key: Identifies the unit of work, e.g. "welcome_email:<user id>".
+            Kicks repeating a key within the deduplication window are dropped and return
+            the task ID of the first one, and a task runs at most once per key.
         :return: A string representing the result or outcome of the executed task.
         """
         pass
+
+    def map(
+            self,
+            task_name: str,
+            items: AsyncIterable[Item] | Iterable[Item],
+            to_payload: Callable[[list[Item]], BackgroundTaskPayload],
+            chunk_size: int = 500,
+            max_in_flight: int = 4,
+            idempotency_key: Optional[str] = None,
+    ) -> TaskMap[Item]:
+        """
+        Run one task over a large set of items, kicking one task per chunk of
+        ``chunk_size`` items instead of one per item. Kicks happen in the background,
+        the returned handle reports progress; see TaskMap.
+
+        :param task_name: The task every chunk is kicked as.
+        :param items: The items, e.g. streamed from a database cursor; read lazily.
+        :param to_payload: Builds a chunk's payload from its items.
+        :param chunk_size: Items per task.
+        :param max_in_flight: Chunks being kicked at once.
+        :param idempotency_key: Prefix of the chunks' idempotency keys, the job ID
+            by default.
+        """
+        return TaskMap(
+            self,
+            task_name,
+            items,
+            to_payload,
+            chunk_size=chunk_size,
+            max_in_flight=max_in_flight,
+            idempotency_key=idempotency_key,
+        ).start()
+
+    async def close(self) -> None:
+        """Flush anything still buffered; called once on shutdown."""
+        pass
+
+
+class TaskDeduplicationStore(abc.ABC):
+    """
+    Remembers idempotency keys for a while, so repeated kicks and deliveries of the
+    same work can be told apart from new work.
+    """
+
+    @abc.abstractmethod
+    async def claim(self, key: str, task_id: str) -> Optional[str]:
+        """
+        Record ``key`` as taken by ``task_id``.
+
+        :return: None if the key was free and is now claimed, otherwise the task ID
+            that claimed it first.
+        """
+        pass
+
+    @abc.abstractmethod
+    async def release(self, key: str, task_id: str) -> None:
+        """Free a key claimed by ``task_id``, e.g. because the work did not go through."""
+        pass
+
+
+class TaskResultRepository(abc.ABC):
+    """Looks up how background tasks ended."""
+
+    @abc.abstractmethod
+    async def get(self, task_id: str) -> Optional[TaskResult]:
+        """Return the task's result, or None while it has not ended."""
+        pass
+
+    @abc.abstractmethod
+    async def wait(self, task_id: str, timeout_seconds: float) -> Optional[TaskResult]:
+        """Like ``get``, but wait up to ``timeout_seconds`` for the task to end."""
+        pass
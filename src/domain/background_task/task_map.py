@@ -0,0 +1,148 @@
+import asyncio
+import uuid
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Generic,
+    Iterable,
+    Optional,
+    TypeVar,
+)
+
+import structlog
+
+from src.domain.background_task.value_objects import BackgroundTaskPayload, TaskMapProgress
+
+if TYPE_CHECKING:
+    from src.domain.background_task.repositories import BackgroundTaskProcessor
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+async def chunked(items: AsyncIterable[T] | Iterable[T], size: int) -> AsyncIterator[list[T]]:
+    """Lazily group ``items`` into lists of ``size``, the last one possibly shorter."""
+    chunk: list[T] = []
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    else:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+class TaskMap(Generic[T]):
+    """
+    One job fanned out over many items, kicked as one task per chunk of them.
+
+    Items are read lazily and at most ``max_in_flight`` chunks are being kicked at
+    once, so a slow broker holds back reading the input instead of buffering it.
+    Every chunk is kicked with the idempotency key ``<key>:<chunk index>``, the key
+    defaulting to the job ID, so a redelivered chunk does not run twice and
+    repeating a map with the same key skips the chunks kicked already.
+
+    A chunk whose kick fails is logged and counted, the rest of the job carries on.
+    If reading the input fails, the job stops and ``wait`` raises the error.
+    """
+
+    def __init__(
+        self,
+        processor: "BackgroundTaskProcessor",
+        task_name: str,
+        items: AsyncIterable[T] | Iterable[T],
+        to_payload: Callable[[list[T]], BackgroundTaskPayload],
+        chunk_size: int = 500,
+        max_in_flight: int = 4,
+        idempotency_key: Optional[str] = None,
+    ):
+        if chunk_size < 1 or max_in_flight < 1:
+            raise ValueError("chunk_size and max_in_flight must be at least 1")
+
+        self.processor = processor
+        self.items = items
+        self.to_payload = to_payload
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        job_id = str(uuid.uuid4())
+        self.idempotency_key = idempotency_key or job_id
+        self._progress = TaskMapProgress(job_id=job_id, task_name=task_name)
+        # Task ID of every kicked chunk, by chunk index
+        self.task_ids: dict[int, str] = {}
+        self._runner: Optional[asyncio.Task] = None
+
+    @property
+    def job_id(self) -> str:
+        return self._progress.job_id
+
+    def progress(self) -> TaskMapProgress:
+        return self._progress.model_copy()
+
+    def start(self) -> "TaskMap[T]":
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+        return self
+
+    async def wait(self) -> TaskMapProgress:
+        """Wait until every chunk was kicked and return the final progress."""
+        await self.start()._runner
+        return self.progress()
+
+    async def cancel(self) -> None:
+        """Stop reading the input; chunks being kicked are still awaited."""
+        if self._runner is None:
+            return
+        self._runner.cancel()
+        try:
+            await self._runner
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        slots = asyncio.Semaphore(self.max_in_flight)
+        kicks: set[asyncio.Task] = set()
+        try:
+            index = 0
+            async for chunk in chunked(self.items, self.chunk_size):
+                await slots.acquire()
+                kick = asyncio.create_task(self._kick(index, chunk))
+                kick.add_done_callback(lambda _: slots.release())
+                kicks.add(kick)
+                kick.add_done_callback(kicks.discard)
+                index += 1
+        finally:
+            if kicks:
+                await asyncio.gather(*kicks)
+            self._progress.done = True
+            logger.info("Fanned out task", **self._progress.model_dump())
+
+    async def _kick(self, index: int, chunk: list[T]) -> None:
+        try:
+            self.task_ids[index] = await self.processor.execute_task(
+                self._progress.task_name,
+                self.to_payload(chunk),
+                idempotency_key=f"{self.idempotency_key}:{index}",
+            )
+        except Exception as e:
+            self._progress.chunks_failed += 1
+            self._progress.items_failed += len(chunk)
+            logger.error(
+                "Failed to kick chunk",
+                job_id=self.job_id,
+                task_name=self._progress.task_name,
+                chunk=index,
+                exc_info=e,
+            )
+        else:
+            self._progress.chunks_enqueued += 1
+            self._progress.items_enqueued += len(chunk)
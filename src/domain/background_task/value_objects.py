@@ -1,6 +1,9 @@
 import abc
+from datetime import datetime
+from enum import Enum
+from typing import Any, ClassVar, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class BackgroundTaskPayload(BaseModel, abc.ABC):
@@ -8,10 +11,64 @@ class BackgroundTaskPayload(BaseModel, abc.ABC):
     Represents the payload for a background task.
     All payloads sent to background task processors must inherit from this class.
 
+    Payloads may be sent as positional values, without field names, so producers and
+    consumers running different versions must agree on the field order: new fields
+    are only ever appended, with a default, and ``schema_version`` is bumped. Older
+    consumers ignore the extra values, newer ones fill in the defaults, and
+    ``upgrade`` can rewrite data sent by an older producer.
+
     Example:
         class EmailTaskPayload(BackgroundTaskPayload):
             subject: str
             recipients: list[str]
             cc: list[str] = []
     """
-    pass
+
+    schema_version: ClassVar[int] = 1
+
+    @classmethod
+    def upgrade(cls, data: dict[str, Any], schema_version: int) -> dict[str, Any]:
+        """Adapt ``data`` sent with an older ``schema_version`` to the current one."""
+        return data
+
+
+class RawTaskPayload(BackgroundTaskPayload):
+    """
+    Payload that was serialised earlier and is passed on as-is, e.g. when a task is
+    read back from the outbox. The consuming task validates it against its own type.
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+
+class TaskMapProgress(BaseModel):
+    """Where a fan-out started with ``BackgroundTaskProcessor.map`` stands."""
+
+    job_id: str
+    task_name: str
+    chunks_enqueued: int = 0
+    items_enqueued: int = 0
+    # Chunks whose kick failed; their items were not enqueued
+    chunks_failed: int = 0
+    items_failed: int = 0
+    # Every item was read and every chunk kicked, or the input failed
+    done: bool = False
+
+
+class TaskState(str, Enum):
+    # Queued, running, or not known at all; IDs are not recorded until the task ends
+    Pending = "pending"
+    Succeeded = "succeeded"
+    Failed = "failed"
+
+
+class TaskResult(BaseModel):
+    """Outcome of a background task, as recorded once it ended."""
+
+    task_id: str
+    state: TaskState = TaskState.Pending
+    return_value: Any = None
+    # The exception a failed task raised, as "<type>: <message>"
+    error: Optional[str] = None
+    execution_time: Optional[float] = None
+    finished_at: Optional[datetime] = None
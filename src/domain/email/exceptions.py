@@ -0,0 +1,13 @@
+class EmailDeliveryError(Exception):
+    """Exception raised when the mail server refuses a message."""
+
+    def __init__(self, recipient: str, code: int, reply: str):
+        self.recipient = recipient
+        self.code = code
+        self.reply = reply
+        super().__init__(f"Delivery to {recipient} failed: {code} {reply}")
+
+    @property
+    def is_transient(self) -> bool:
+        """4xx replies are temporary, the message may be accepted if sent again later."""
+        return 400 <= self.code < 500
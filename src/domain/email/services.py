@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+from src.domain.email.value_objects import EmailMessage
+
+
+class EmailSender(ABC):
+    """Delivers rendered emails."""
+
+    @abstractmethod
+    async def send_many(self, messages: list[EmailMessage]) -> list[None | Exception]:
+        """
+        Deliver ``messages``, returning one result per message, in order.
+
+        A message that could not be delivered gets its exception in the result list
+        instead of failing the whole call.
+        """
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        return {}
+
+    async def close(self) -> None:
+        """Release any resources (connections) held by the sender."""
+        pass
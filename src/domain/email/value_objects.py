@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class EmailMessage(BaseModel):
+    """A rendered, single-recipient plain text email."""
+
+    recipient: str
+    subject: str
+    body: str
+
+    @property
+    def domain(self) -> str:
+        return self.recipient.rpartition("@")[2].lower()
@@ -1,13 +1,8 @@
 import uuid
-from typing import Optional
+from typing import Any, Optional
 
-import bcrypt
 from pydantic import BaseModel, Field, EmailStr, PrivateAttr, computed_field
-from src.domain.users.value_objects import UserAddress
-
-
-def hash_password(password: str) -> bytes:
-    return bcrypt.hashpw(password.encode("utf-8"), salt=bcrypt.gensalt())
+from src.domain.users.value_objects import HashedPassword, UserAddress
 
 
 class User(BaseModel):
@@ -16,13 +11,12 @@ class User(BaseModel):
     last_name: str
     email: EmailStr
     password_hash: Optional[bytes] = Field(exclude=True, default=None)
+    password_algorithm: Optional[str] = Field(exclude=True, default=None)
+    password_params: dict[str, Any] = Field(exclude=True, default_factory=dict)
     addresses: list[UserAddress] = []
 
-    def set_password(self, password: str):
-        pwd_hash = bcrypt.hashpw(password.encode("utf-8"), salt=bcrypt.gensalt())
-        self.password_hash = pwd_hash
+    def set_password_hash(self, hashed_password: HashedPassword):
+        self.password_hash = hashed_password.value
+        self.password_algorithm = hashed_password.algorithm
+        self.password_params = hashed_password.params
 
-    def check_password(self, password: str) -> bool:
-        if self.password_hash is None:
-            return False
-        return bcrypt.checkpw(password.encode("utf-8"), self.password_hash)
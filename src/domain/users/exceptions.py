@@ -20,3 +20,10 @@ class UserNotFoundError(Exception):
         else:
             message = "User not found"
         super().__init__(message)
+
+
+class InvalidCredentialsError(Exception):
+    """Exception raised when an email/password pair does not match a user."""
+
+    def __init__(self):
+        super().__init__("Invalid email or password")
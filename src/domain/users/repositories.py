@@ -1,20 +1,94 @@
 import uuid
 from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Optional, TypeVar
 
 from pydantic import EmailStr
 
 from src.domain.users.entities import User
+from src.domain.users.value_objects import UserFilter, UserPageCursor, UserProjection
+
+P = TypeVar("P", bound=UserProjection)
 
 
 class UserRepository(ABC):
+    """
+    Persistence for users.
+
+    Lookups return full User entities by default. Passing a ``projection`` model
+    instead fetches and returns only the fields declared on that model.
+    """
+
     @abstractmethod
     async def save(self, user: User) -> User:
         pass
 
     @abstractmethod
-    async def get_by_id(self, user_id: uuid.UUID) -> User:
+    async def save_many(self, users: list[User]) -> list[User | Exception]:
+        """
+        Insert several users at once.
+
+        The result is aligned with ``users``: each item is either the saved user or
+        the exception that prevented it from being saved, e.g. UserAlreadyExistsError.
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_id(
+        self, user_id: uuid.UUID, projection: Optional[type[P]] = None
+    ) -> Optional[User | P]:
+        pass
+
+    @abstractmethod
+    async def get_many_by_ids(
+        self, user_ids: list[uuid.UUID], projection: Optional[type[P]] = None
+    ) -> list[User | P]:
+        """Return the users matching any of ``user_ids``, in no particular order."""
+        pass
+
+    @abstractmethod
+    async def get_by_email(
+        self, email: EmailStr, projection: Optional[type[P]] = None
+    ) -> Optional[User | P]:
+        pass
+
+    @abstractmethod
+    async def get_many_by_email(
+        self, emails: list[EmailStr], projection: Optional[type[P]] = None
+    ) -> list[User | P]:
+        """Return the users matching any of ``emails``, in no particular order."""
+        pass
+
+    @abstractmethod
+    async def update_password(self, user: User) -> None:
+        """Persist the user's password hash together with its algorithm and parameters."""
+        pass
+
+    @abstractmethod
+    async def list_page(
+        self,
+        page_size: int,
+        after: Optional[UserPageCursor] = None,
+        projection: Optional[type[P]] = None,
+    ) -> tuple[list[User | P], Optional[UserPageCursor]]:
+        """
+        Return up to ``page_size`` users, newest first, that come after ``after``.
+
+        The second item is the cursor of the next page, or None on the last page.
+        """
         pass
 
     @abstractmethod
-    async def get_by_email(self, email: EmailStr) -> User:
+    def stream(
+        self,
+        user_filter: UserFilter,
+        fields: Optional[list[str]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Lazily iterate over the users matching ``user_filter``.
+
+        Only ``fields`` (all public fields when omitted) are fetched, and at most
+        ``batch_size`` users are held in memory at once. Password fields are never
+        returned.
+        """
         pass
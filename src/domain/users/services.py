@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar, Optional
+
+from src.domain.users.value_objects import HashedPassword
+
+
+class PasswordHasher(ABC):
+    """
+    Synchronous, CPU-bound password hashing algorithm.
+
+    Implementations must be picklable so they can be shipped to a process pool.
+    """
+
+    algorithm: ClassVar[str]
+
+    @property
+    @abstractmethod
+    def params(self) -> dict[str, Any]:
+        """Cost parameters stored alongside every hash produced by this hasher."""
+        pass
+
+    @abstractmethod
+    def hash(self, password: str) -> bytes:
+        pass
+
+    @abstractmethod
+    def verify(self, password: str, password_hash: bytes) -> bool:
+        pass
+
+    def needs_rehash(self, algorithm: Optional[str], params: dict[str, Any]) -> bool:
+        """
+        Whether a hash produced with ``algorithm``/``params`` is weaker than the current policy.
+
+        Only ever upgrades: a cost parameter above the current one, e.g. from a pod that
+        calibrated a higher bcrypt cost, is kept rather than rehashed on every login.
+        """
+        if algorithm != self.algorithm:
+            return True
+        return any(
+            params.get(name) is None or params[name] < value
+            for name, value in self.params.items()
+        )
+
+
+class PasswordHashingService(ABC):
+    """
+    Asynchronous facade over password hashing.
+
+    Hashing is deliberately expensive, so implementations must never run it on the
+    event loop thread. The User entity only stores the resulting hash.
+    """
+
+    @abstractmethod
+    async def hash_password(self, password: str) -> HashedPassword:
+        pass
+
+    @abstractmethod
+    async def verify_password(self, password: str, password_hash: Optional[bytes]) -> bool:
+        pass
+
+    @abstractmethod
+    def needs_rehash(self, algorithm: Optional[str], params: dict[str, Any]) -> bool:
+        pass
+
+    async def close(self) -> None:
+        """Release any resources (worker pools, connections) held by the service."""
+        pass
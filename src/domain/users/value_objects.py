@@ -1,6 +1,9 @@
+from datetime import datetime
 from enum import Enum
+from uuid import UUID
+from typing import Any, Literal, Optional, get_args
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
 class AddressType(str, Enum):
@@ -10,9 +13,68 @@ class AddressType(str, Enum):
 
 
 class UserAddress(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     type: AddressType
     street: str
     city: str
     state: str
     zipcode: int
     country: str
+
+
+class HashedPassword(BaseModel):
+    """A password hash together with the algorithm and cost parameters that produced it."""
+
+    value: bytes
+    algorithm: str
+    params: dict[str, Any] = {}
+
+
+# Fields that may be exposed when listing users; password fields are never listable
+UserField = Literal[
+    "id", "email", "first_name", "last_name", "is_active", "addresses", "created_at", "updated_at"
+]
+USER_FIELDS: tuple[str, ...] = get_args(UserField)
+
+
+class UserFilter(BaseModel):
+    """Criteria for listing users; ``created_after`` is inclusive, ``created_before`` exclusive."""
+
+    is_active: Optional[bool] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+
+class UserPageCursor(BaseModel):
+    """Keyset position of the last user on a page, in (created_at, id) order."""
+
+    created_at: datetime
+    id: UUID
+
+
+class UserProjection(BaseModel):
+    """
+    Read-only subset of a user's fields.
+
+    Repositories fetch only the fields declared on the projection, so read paths
+    that do not need the password hash or the addresses never load them. Frozen, so
+    caches can hand out the same instance to every caller.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    id: UUID
+
+
+class UserSummary(UserProjection):
+    email: EmailStr
+
+
+class UserPublic(UserSummary):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    addresses: tuple[UserAddress, ...] = ()
+
+
+USER_PROJECTIONS: tuple[type[UserProjection], ...] = (UserSummary, UserPublic)
@@ -0,0 +1,222 @@
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from pydantic import EmailStr
+
+from src.domain.users.entities import User
+from src.domain.users.repositories import P, UserRepository
+from src.domain.users.value_objects import (
+    USER_PROJECTIONS,
+    UserFilter,
+    UserPageCursor,
+    UserProjection,
+)
+from src.infrastructure.cache.local import MISSING, LocalTTLCache
+from src.infrastructure.cache.shared import SharedCache
+from src.infrastructure.cache.single_flight import SingleFlight
+
+# Marks a cached "not found" result
+NEGATIVE: Any = object()
+_NEGATIVE_BYTES = b"\x00"
+
+
+class CachingUserRepository(UserRepository):
+    """
+    Read-through cache in front of another UserRepository.
+
+    Lookups go to the in-process tier first, then to the optional shared tier and
+    finally to the wrapped repository. Concurrent misses for the same key share a
+    single load, and "not found" results are cached for ``negative_ttl_seconds``.
+    Each projection is cached under its own key. Writes go straight to the wrapped
+    repository and invalidate every variant in both tiers; a load that was running
+    when its key was invalidated returns its result without caching it.
+
+    Only projections are shared between processes. Full entities carry the password
+    hash, so they are cached in the in-process tier alone.
+    """
+
+    def __init__(
+        self,
+        repository: UserRepository,
+        local_cache: LocalTTLCache,
+        shared_cache: Optional[SharedCache] = None,
+        shared_ttl_seconds: float = 300.0,
+        negative_ttl_seconds: float = 5.0,
+    ):
+        self.repository = repository
+        self.local_cache = local_cache
+        self.shared_cache = shared_cache
+        self.shared_ttl_seconds = shared_ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._single_flight = SingleFlight()
+        # Generation of every key with a load in flight, bumped when it is invalidated
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    async def save(self, user: User) -> User:
+        saved = await self.repository.save(user)
+        await self.invalidate(saved)
+        return saved
+
+    async def save_many(self, users: list[User]) -> list[User | Exception]:
+        results = await self.repository.save_many(users)
+        for user in users:
+            await self.invalidate(user)
+        return results
+
+    async def update_password(self, user: User) -> None:
+        await self.repository.update_password(user)
+        await self.invalidate(user)
+
+    async def get_by_id(
+        self, user_id: uuid.UUID, projection: Optional[type[P]] = None
+    ) -> Optional[User | P]:
+        return await self._get(
+            self._id_key(user_id, projection),
+            lambda: self.repository.get_by_id(user_id, projection=projection),
+            projection,
+        )
+
+    async def get_by_email(
+        self, email: EmailStr, projection: Optional[type[P]] = None
+    ) -> Optional[User | P]:
+        return await self._get(
+            self._email_key(email, projection),
+            lambda: self.repository.get_by_email(email, projection=projection),
+            projection,
+        )
+
+    async def get_many_by_ids(
+        self, user_ids: list[uuid.UUID], projection: Optional[type[P]] = None
+    ) -> list[User | P]:
+        return await self.repository.get_many_by_ids(user_ids, projection=projection)
+
+    async def get_many_by_email(
+        self, emails: list[EmailStr], projection: Optional[type[P]] = None
+    ) -> list[User | P]:
+        # Bulk lookups are not worth caching, they are mostly existence checks on writes
+        return await self.repository.get_many_by_email(emails, projection=projection)
+
+    async def list_page(
+        self,
+        page_size: int,
+        after: Optional[UserPageCursor] = None,
+        projection: Optional[type[P]] = None,
+    ) -> tuple[list[User | P], Optional[UserPageCursor]]:
+        return await self.repository.list_page(page_size, after=after, projection=projection)
+
+    def stream(
+        self,
+        user_filter: UserFilter,
+        fields: Optional[list[str]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[dict[str, Any]]:
+        return self.repository.stream(user_filter, fields=fields, batch_size=batch_size)
+
+    async def invalidate(self, user: User) -> None:
+        keys = [
+            key
+            for projection in (None, *USER_PROJECTIONS)
+            for key in (self._id_key(user.id, projection), self._email_key(user.email, projection))
+        ]
+        for key in keys:
+            if key in self._generations:
+                self._generations[key] += 1
+        self.local_cache.delete(*keys)
+        if self.shared_cache is not None:
+            await self.shared_cache.delete(*keys)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "coalesced": self._single_flight.coalesced,
+            "evictions": self.local_cache.evictions,
+            "expirations": self.local_cache.expirations,
+            "size": len(self.local_cache),
+        }
+
+    async def _get(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        projection: Optional[type[UserProjection]] = None,
+    ) -> Any:
+        value = self.local_cache.get(key)
+        if value is MISSING:
+            value = await self._single_flight.do(
+                key, lambda: self._load(key, loader, projection)
+            )
+        else:
+            self.hits += 1
+
+        if value is NEGATIVE:
+            return None
+        if isinstance(value, UserProjection):
+            return value
+        # Entities are mutable, hand out deep copies so callers cannot change the
+        # cached one, or the lists it holds
+        return value.model_copy(deep=True)
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        projection: Optional[type[UserProjection]],
+    ) -> Any:
+        self._generations[key] = 0
+        try:
+            return await self._load_fresh(key, loader, projection)
+        finally:
+            del self._generations[key]
+
+    async def _load_fresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        projection: Optional[type[UserProjection]],
+    ) -> Any:
+        shared_cache = self.shared_cache if projection is not None else None
+        if shared_cache is not None:
+            raw = await shared_cache.get(key)
+            if raw is not None:
+                self.shared_hits += 1
+                value = NEGATIVE if raw == _NEGATIVE_BYTES else projection.model_validate_json(raw)
+                if not self._generations[key]:
+                    self._store_local(key, value)
+                return value
+
+        self.misses += 1
+        user = await loader()
+        value = NEGATIVE if user is None else user
+        if self._generations[key]:
+            # Invalidated while loading, the result may predate the write
+            return value
+        self._store_local(key, value)
+        if shared_cache is not None:
+            if user is None:
+                await shared_cache.set(key, _NEGATIVE_BYTES, self.negative_ttl_seconds)
+            else:
+                await shared_cache.set(
+                    key, user.model_dump_json().encode("utf-8"), self.shared_ttl_seconds
+                )
+        return value
+
+    def _store_local(self, key: str, value: Any) -> None:
+        if value is NEGATIVE:
+            self.local_cache.set(key, value, ttl_seconds=self.negative_ttl_seconds)
+        else:
+            self.local_cache.set(key, value)
+
+    @staticmethod
+    def _id_key(user_id: uuid.UUID, projection: Optional[type[UserProjection]] = None) -> str:
+        key = f"user:id:{user_id}"
+        return f"{key}:{projection.__name__}" if projection else key
+
+    @staticmethod
+    def _email_key(email: str, projection: Optional[type[UserProjection]] = None) -> str:
+        key = f"user:email:{email}"
+        return f"{key}:{projection.__name__}" if projection else key
@@ -0,0 +1,48 @@
+import abc
+import time
+from typing import Callable, Optional
+
+
+class SharedCache(abc.ABC):
+    """
+    Byte-oriented cache shared between processes (e.g. Redis or memcached).
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def delete(self, *keys: str) -> None:
+        pass
+
+
+class InMemorySharedCache(SharedCache):
+    """
+    Single-process stand-in for a shared cache, used for local runs and tests.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._entries: dict[str, tuple[float, bytes]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._entries[key] = (self._clock() + ttl_seconds, value)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
@@ -0,0 +1,128 @@
+import asyncio
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import aiosmtplib
+import structlog
+
+from src.domain.email.services import EmailSender
+from src.domain.email.value_objects import EmailMessage
+from src.infrastructure.email.smtp import SMTPConnectionPool
+
+logger = structlog.get_logger()
+
+
+class _DomainSlots:
+    __slots__ = ("semaphore", "users")
+
+    def __init__(self, size: int):
+        self.semaphore = asyncio.Semaphore(size)
+        self.users = 0
+
+
+class SMTPEmailSender(EmailSender):
+    """
+    Sends emails over a pool of persistent SMTP sessions.
+
+    Messages are grouped by recipient domain and each group is split into chunks of
+    at most ``max_messages_per_session``, which are pipelined over one pooled session.
+    No more than ``per_domain_concurrency`` chunks are in flight for the same domain,
+    so a burst of signups from one provider does not trip its rate limits. A domain's
+    slots are dropped once nothing is sent to it, they are not kept per domain ever seen.
+    """
+
+    def __init__(
+        self,
+        pool: SMTPConnectionPool,
+        per_domain_concurrency: int = 2,
+        max_messages_per_session: int = 50,
+    ):
+        if per_domain_concurrency < 1:
+            raise ValueError("per_domain_concurrency must be at least 1")
+        if max_messages_per_session < 1:
+            raise ValueError("max_messages_per_session must be at least 1")
+
+        self.pool = pool
+        self.per_domain_concurrency = per_domain_concurrency
+        self.max_messages_per_session = max_messages_per_session
+        self._domain_slots: dict[str, _DomainSlots] = {}
+        self.sent = 0
+        self.failed = 0
+        self.latency_seconds_sum = 0.0
+        self.latency_seconds_max = 0.0
+
+    async def send_many(self, messages: list[EmailMessage]) -> list[None | Exception]:
+        started = time.perf_counter()
+        results: list[None | Exception] = [None] * len(messages)
+
+        by_domain: defaultdict[str, list[int]] = defaultdict(list)
+        for index, message in enumerate(messages):
+            by_domain[message.domain].append(index)
+
+        chunks = [
+            (domain, indexes[start:start + self.max_messages_per_session])
+            for domain, indexes in by_domain.items()
+            for start in range(0, len(indexes), self.max_messages_per_session)
+        ]
+        await asyncio.gather(*(
+            self._send_chunk(domain, indexes, messages, results, started)
+            for domain, indexes in chunks
+        ))
+        return results
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "latency_seconds_sum": self.latency_seconds_sum,
+            "latency_seconds_max": self.latency_seconds_max,
+            "connections_opened": self.pool.opened,
+            "connections_idle": self.pool.idle,
+        }
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+    @asynccontextmanager
+    async def _domain_slot(self, domain: str) -> AsyncIterator[None]:
+        slots = self._domain_slots.get(domain)
+        if slots is None:
+            slots = self._domain_slots[domain] = _DomainSlots(self.per_domain_concurrency)
+        slots.users += 1
+        try:
+            async with slots.semaphore:
+                yield
+        finally:
+            slots.users -= 1
+            if not slots.users:
+                del self._domain_slots[domain]
+
+    async def _send_chunk(
+        self,
+        domain: str,
+        indexes: list[int],
+        messages: list[EmailMessage],
+        results: list[None | Exception],
+        started: float,
+    ) -> None:
+        try:
+            async with self._domain_slot(domain), self.pool.connection() as connection:
+                chunk_results = await connection.send_many([messages[i] for i in indexes])
+        except (OSError, asyncio.TimeoutError, aiosmtplib.SMTPException) as e:
+            logger.warning(
+                "SMTP session failed", domain=domain, messages=len(indexes), exc_info=e
+            )
+            chunk_results = [e] * len(indexes)
+
+        # Every message of the chunk is done once the session has answered for the last one
+        latency = time.perf_counter() - started
+        for index, result in zip(indexes, chunk_results):
+            results[index] = result
+            if result is None:
+                self.sent += 1
+            else:
+                self.failed += 1
+            self.latency_seconds_sum += latency
+        self.latency_seconds_max = max(self.latency_seconds_max, latency)
@@ -0,0 +1,208 @@
+import asyncio
+import email.message
+import email.policy
+import email.utils
+import ssl
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiosmtplib
+import structlog
+
+from src.domain.email.exceptions import EmailDeliveryError
+from src.domain.email.value_objects import EmailMessage
+
+logger = structlog.get_logger()
+
+
+class InsecureSMTPAuthError(aiosmtplib.SMTPException):
+    """Credentials are configured, but the session to the server is not encrypted."""
+
+
+class SMTPConnection:
+    """
+    A single persistent SMTP session, spoken through aiosmtplib.
+
+    The session is upgraded with STARTTLS whenever the server offers it, or must be
+    when ``start_tls`` is True; ``use_tls`` connects with implicit TLS instead, as on
+    port 465. Servers without EHLO are greeted with HELO. Credentials are only sent
+    over an encrypted session, the connection is refused otherwise.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        start_tls: Optional[bool] = None,
+        timeout_seconds: float = 30.0,
+        local_hostname: str = "localhost",
+        tls_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.local_hostname = local_hostname
+        self._client = aiosmtplib.SMTP(
+            hostname=host,
+            port=port,
+            local_hostname=local_hostname,
+            timeout=timeout_seconds,
+            use_tls=use_tls,
+            start_tls=False if use_tls else start_tls,
+            tls_context=tls_context,
+        )
+
+    @property
+    def is_connected(self) -> bool:
+        return self._client.is_connected
+
+    @property
+    def is_encrypted(self) -> bool:
+        return self.is_connected and self._client.get_transport_info("sslcontext") is not None
+
+    async def connect(self) -> None:
+        await self._client.connect()
+        if self.username is None:
+            return
+        if not self.is_encrypted:
+            await self.close()
+            raise InsecureSMTPAuthError(
+                "Refusing to send SMTP credentials over an unencrypted connection"
+            )
+        await self._client.login(self.username, self.password or "")
+
+    async def send_many(self, messages: list[EmailMessage]) -> list[None | Exception]:
+        """
+        Send ``messages`` over this session, one transaction each.
+
+        Refused messages are returned as EmailDeliveryError. Connection failures are
+        raised, the session is unusable afterwards.
+        """
+        return [await self._send_one(message) for message in messages]
+
+    async def close(self) -> None:
+        if not self._client.is_connected:
+            return
+        try:
+            await self._client.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            self._client.close()
+
+    async def _send_one(self, message: EmailMessage) -> None | Exception:
+        try:
+            await self._client.send_message(
+                self._format(message), sender=self.sender, recipients=[message.recipient]
+            )
+        except aiosmtplib.SMTPRecipientsRefused as e:
+            refused = e.recipients[0]
+            return EmailDeliveryError(message.recipient, refused.code, refused.message)
+        except (aiosmtplib.SMTPSenderRefused, aiosmtplib.SMTPDataError) as e:
+            return EmailDeliveryError(message.recipient, e.code, e.message)
+        return None
+
+    def _format(self, message: EmailMessage) -> email.message.EmailMessage:
+        mime = email.message.EmailMessage(policy=email.policy.SMTP)
+        mime["From"] = self.sender
+        mime["To"] = message.recipient
+        mime["Subject"] = message.subject
+        mime["Date"] = email.utils.formatdate(localtime=False)
+        mime["Message-ID"] = email.utils.make_msgid(domain=self.local_hostname)
+        mime.set_content(message.body)
+        return mime
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to ``size`` SMTP sessions open and hands them out one caller at a time.
+
+    Sessions are opened lazily and reused across batches. A session that failed
+    mid-conversation is closed instead of being returned to the pool, and sessions
+    idle for longer than ``max_idle_seconds`` are replaced, since servers drop them.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        size: int = 4,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = False,
+        start_tls: Optional[bool] = None,
+        timeout_seconds: float = 30.0,
+        max_idle_seconds: float = 60.0,
+        tls_context: Optional[ssl.SSLContext] = None,
+    ):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.size = size
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.start_tls = start_tls
+        self.timeout_seconds = timeout_seconds
+        self.max_idle_seconds = max_idle_seconds
+        self.tls_context = tls_context
+        self._idle: list[tuple[float, SMTPConnection]] = []
+        self._slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[SMTPConnection]:
+        async with self._slots:
+            connection = await self._take_idle() or await self._open()
+            try:
+                yield connection
+            except BaseException:
+                await connection.close()
+                raise
+            self._idle.append((time.monotonic(), connection))
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(connection.close() for _, connection in idle))
+        if idle:
+            logger.info("SMTP connection pool closed", connections=len(idle))
+
+    async def _take_idle(self) -> Optional[SMTPConnection]:
+        while self._idle:
+            # Most recently used first, it is the least likely to have been dropped
+            released_at, connection = self._idle.pop()
+            if connection.is_connected and time.monotonic() - released_at < self.max_idle_seconds:
+                return connection
+            await connection.close()
+        return None
+
+    async def _open(self) -> SMTPConnection:
+        connection = SMTPConnection(
+            self.host,
+            self.port,
+            sender=self.sender,
+            username=self.username,
+            password=self.password,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            timeout_seconds=self.timeout_seconds,
+            tls_context=self.tls_context,
+        )
+        try:
+            await connection.connect()
+        except BaseException:
+            await connection.close()
+            raise
+        self.opened += 1
+        return connection
@@ -0,0 +1,43 @@
+import functools
+from string import Template
+from typing import Any
+
+from src.domain.email.value_objects import EmailMessage
+
+# Raw (subject, body) sources, placeholders use string.Template syntax
+TEMPLATES: dict[str, tuple[str, str]] = {
+    "welcome": (
+        "Welcome to $service_name",
+        "Hi $email,\n"
+        "\n"
+        "Thanks for signing up to $service_name, your account is ready to use.\n"
+        "\n"
+        "The $service_name team\n",
+    ),
+}
+
+
+@functools.cache
+def compile_template(name: str) -> tuple[Template, Template]:
+    """Build the subject and body templates for ``name`` once per process."""
+    try:
+        subject, body = TEMPLATES[name]
+    except KeyError:
+        raise ValueError(f"Unknown email template {name!r}") from None
+    return Template(subject), Template(body)
+
+
+class EmailTemplateRenderer:
+    """Renders emails from the cached templates, filling in values shared by every email."""
+
+    def __init__(self, **defaults: Any):
+        self.defaults = defaults
+
+    def render(self, name: str, recipient: str, **context: Any) -> EmailMessage:
+        subject, body = compile_template(name)
+        values = {**self.defaults, "email": recipient, **context}
+        return EmailMessage(
+            recipient=recipient,
+            subject=subject.substitute(values),
+            body=body.substitute(values),
+        )
@@ -0,0 +1,81 @@
+import uuid
+from typing import Optional
+
+import structlog
+
+from src.domain.background_task.repositories import (
+    BackgroundTaskProcessor,
+    TaskDeduplicationStore,
+)
+from src.domain.background_task.value_objects import BackgroundTaskPayload
+
+logger = structlog.get_logger()
+
+
+def kick_key(task_name: str, idempotency_key: str) -> str:
+    """The store key a kick of ``task_name`` with ``idempotency_key`` claims."""
+    return f"kick:{task_name}:{idempotency_key}"
+
+
+class DeduplicatingTaskProcessor(BackgroundTaskProcessor):
+    """
+    Drops kicks that repeat an idempotency key within the store's window.
+
+    A repeated kick gets the task ID of the first one back and never reaches
+    ``processor``. The key is still passed on with the first kick, so the task runs
+    at most once even when its message is delivered twice. Kicks without a key go
+    straight through. A processor that publishes after returning, like the batching
+    one, must release the key itself when the publish fails.
+    """
+
+    def __init__(self, processor: BackgroundTaskProcessor, store: TaskDeduplicationStore):
+        self.processor = processor
+        self.store = store
+        self.kicks = 0
+        self.duplicates = 0
+
+    async def register_tasks(self) -> None:
+        await self.processor.register_tasks()
+
+    async def close(self) -> None:
+        await self.processor.close()
+
+    async def execute_task(
+        self,
+        task_name: str,
+        payload: BackgroundTaskPayload,
+        task_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        if idempotency_key is None:
+            return await self.processor.execute_task(task_name, payload, task_id=task_id)
+
+        self.kicks += 1
+        task_id = task_id or str(uuid.uuid4())
+        key = kick_key(task_name, idempotency_key)
+        existing = await self.store.claim(key, task_id)
+        if existing is not None:
+            self.duplicates += 1
+            logger.info(
+                "Dropped duplicate task",
+                task_name=task_name,
+                task_id=existing,
+                idempotency_key=idempotency_key,
+            )
+            return existing
+
+        try:
+            return await self.processor.execute_task(
+                task_name, payload, task_id=task_id, idempotency_key=idempotency_key
+            )
+        except Exception:
+            # Nothing was enqueued, let the caller's retry through
+            await self.store.release(key, task_id)
+            raise
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "kicks": self.kicks,
+            "duplicates": self.duplicates,
+            "duplicate_rate": self.duplicates / self.kicks if self.kicks else 0.0,
+        }
@@ -0,0 +1,111 @@
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+from beanie.operators import Set
+from pymongo.errors import DuplicateKeyError
+
+from src.domain.background_task.repositories import TaskDeduplicationStore
+from src.infrastructure.cache.local import MISSING, LocalTTLCache
+from src.infrastructure.mongodb.models.idempotency import IdempotencyKeyDocument
+
+
+class MongoTaskDeduplicationStore(TaskDeduplicationStore):
+    """
+    Keeps idempotency keys in Mongo for ``window_seconds`` after they were claimed.
+
+    Claims are single inserts on the key, so concurrent processes agree on the
+    winner. Keys known to be taken are also kept in ``local_cache``, which answers
+    repeats reaching the same process without a round trip; an entry never outlives
+    its key's window.
+    """
+
+    def __init__(
+        self, window_seconds: float = 3600.0, local_cache: Optional[LocalTTLCache] = None
+    ):
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+
+        self.window_seconds = window_seconds
+        self.local_cache = local_cache
+        self.claimed = 0
+        self.duplicates = 0
+        self.local_hits = 0
+
+    async def claim(self, key: str, task_id: str) -> Optional[str]:
+        if self.local_cache is not None:
+            cached = self.local_cache.get(key)
+            if cached is not MISSING:
+                self.duplicates += 1
+                self.local_hits += 1
+                return cached
+
+        now = datetime.now(UTC)
+        expires_at = now + timedelta(seconds=self.window_seconds)
+        existing = await self._claim(key, task_id, now, expires_at)
+        if existing is None:
+            self.claimed += 1
+            self._remember(key, task_id, expires_at, now)
+            return None
+
+        self.duplicates += 1
+        self._remember(key, existing.task_id, existing.expires_at, now)
+        return existing.task_id
+
+    async def release(self, key: str, task_id: str) -> None:
+        if self.local_cache is not None:
+            self.local_cache.delete(key)
+        await IdempotencyKeyDocument.find_one(
+            IdempotencyKeyDocument.id == key, IdempotencyKeyDocument.task_id == task_id
+        ).delete()
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.claimed + self.duplicates
+        return {
+            "claimed": self.claimed,
+            "duplicates": self.duplicates,
+            "local_hits": self.local_hits,
+            "duplicate_rate": self.duplicates / lookups if lookups else 0.0,
+            "local_hit_rate": self.local_hits / self.duplicates if self.duplicates else 0.0,
+        }
+
+    @staticmethod
+    async def _claim(
+        key: str, task_id: str, now: datetime, expires_at: datetime
+    ) -> Optional[IdempotencyKeyDocument]:
+        while True:
+            try:
+                await IdempotencyKeyDocument(
+                    id=key, task_id=task_id, expires_at=expires_at
+                ).insert()
+                return None
+            except DuplicateKeyError:
+                pass
+
+            # Expired keys linger until the TTL monitor removes them, take those over
+            result = await IdempotencyKeyDocument.find_one(
+                IdempotencyKeyDocument.id == key, IdempotencyKeyDocument.expires_at <= now
+            ).update(
+                Set(
+                    {
+                        IdempotencyKeyDocument.task_id: task_id,
+                        IdempotencyKeyDocument.expires_at: expires_at,
+                    }
+                )
+            )
+            if result is not None and result.modified_count:
+                return None
+
+            existing = await IdempotencyKeyDocument.get(key)
+            if existing is not None:
+                return existing
+            # Removed in the meantime, claim it afresh
+
+    def _remember(self, key: str, task_id: str, expires_at: datetime, now: datetime) -> None:
+        if self.local_cache is None:
+            return
+        if expires_at.tzinfo is None:
+            # Mongo hands datetimes back as naive UTC
+            expires_at = expires_at.replace(tzinfo=UTC)
+        remaining = (expires_at - now).total_seconds()
+        if remaining > 0:
+            self.local_cache.set(key, task_id, min(remaining, self.local_cache.ttl_seconds))
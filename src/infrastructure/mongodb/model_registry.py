@@ -1,7 +1,15 @@
 from beanie import Document
 
+from src.infrastructure.mongodb.models.idempotency import IdempotencyKeyDocument
+from src.infrastructure.mongodb.models.outbox import OutboxMessageDocument
+from src.infrastructure.mongodb.models.task_result import TaskResultDocument
 from src.infrastructure.mongodb.models.user import UserDocument
 
-MONGODB_MODELS: list[type[Document]] = [UserDocument]
+MONGODB_MODELS: list[type[Document]] = [
+    UserDocument,
+    OutboxMessageDocument,
+    IdempotencyKeyDocument,
+    TaskResultDocument,
+]
 
 __all__ = ("MONGODB_MODELS",)
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+
+
+class IdempotencyKeyDocument(Document):
+    """An idempotency key and the task that claimed it, removed once it expires."""
+
+    # The idempotency key
+    id: str
+    task_id: str
+    expires_at: datetime
+
+    class Settings:
+        name = "idempotency_keys"
+        indexes = [
+            # Mongo's TTL monitor deletes expired keys, about once a minute
+            IndexModel([("expires_at", ASCENDING)], name="expires_at", expireAfterSeconds=0),
+        ]
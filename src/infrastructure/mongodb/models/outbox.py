@@ -0,0 +1,45 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+from uuid import UUID
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+from src.utils.datetime_utils import _get_utc_now
+
+
+class OutboxStatus(str, Enum):
+    Pending = "pending"
+    # Gave up after too many failed publishes, kept for inspection
+    Dead = "dead"
+
+
+class OutboxMessageDocument(Document):
+    """A background task waiting to be published to the broker."""
+
+    # Doubles as the task ID handed back to the caller
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    task_name: str
+    payload: dict[str, Any]
+    # Published along with the task, which skips runs repeating it
+    idempotency_key: Optional[str] = None
+    status: OutboxStatus = OutboxStatus.Pending
+    created_at: datetime = Field(default_factory=_get_utc_now)
+    # Not picked up before this time, pushed forward while claimed or backing off
+    available_at: datetime = Field(default_factory=_get_utc_now)
+    claim: Optional[UUID] = None
+    attempts: int = 0
+    last_error: Optional[str] = None
+
+    class Settings:
+        name = "outbox"
+        indexes = [
+            IndexModel(
+                [("status", ASCENDING), ("available_at", ASCENDING)],
+                name="status_available_at",
+            ),
+            IndexModel([("claim", ASCENDING)], name="claim", sparse=True),
+        ]
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+from src.utils.datetime_utils import _get_utc_now
+
+
+class TaskResultDocument(Document):
+    """A finished task's result, removed once it expires."""
+
+    # The task ID
+    id: str
+    # TaskiqResult as JSON, the error included
+    result: dict[str, Any]
+    # The error as "<type>: <message>", readable without rebuilding the exception
+    error: Optional[str] = None
+    finished_at: datetime = Field(default_factory=_get_utc_now)
+    expires_at: datetime
+
+    class Settings:
+        name = "task_results"
+        indexes = [
+            IndexModel([("expires_at", ASCENDING)], name="expires_at", expireAfterSeconds=0),
+        ]
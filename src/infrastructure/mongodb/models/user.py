@@ -1,9 +1,10 @@
 import uuid
-from typing import Optional, Annotated
+from typing import Any, Optional, Annotated
 from uuid import UUID
 
 from beanie import Document, Indexed
 from pydantic import Field, EmailStr
+from pymongo import DESCENDING, IndexModel
 
 from src.domain.users.value_objects import UserAddress
 from src.utils.datetime_utils import DateTimeMixin
@@ -13,7 +14,18 @@ class UserDocument(DateTimeMixin, Document):
     id: UUID = Field(default_factory=uuid.uuid4)
     email: Annotated[EmailStr, Indexed(unique=True)]
     password_hash: Optional[bytes]
+    password_algorithm: Optional[str] = None
+    password_params: dict[str, Any] = {}
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     is_active: bool = True
     addresses: list[UserAddress] = []
+
+    class Settings:
+        indexes = [
+            # Backs keyset pagination, newest first
+            IndexModel(
+                [("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="created_at_id_desc",
+            ),
+        ]
@@ -1,47 +1,246 @@
+import functools
 import uuid
-from typing import Optional
+from datetime import UTC, datetime
+from typing import Any, AsyncIterator, Optional
 
-from pydantic import EmailStr
+from beanie.operators import In, Set
+from bson import Binary
+from pydantic import BaseModel, EmailStr, Field, create_model
+from pymongo import DESCENDING
+from pymongo.errors import BulkWriteError, WriteError
 
 from src.domain.users.entities import User
-from src.domain.users.repositories import UserRepository
+from src.domain.users.exceptions import UserAlreadyExistsError
+from src.domain.users.repositories import P, UserRepository
+from src.domain.users.value_objects import USER_FIELDS, UserFilter, UserPageCursor
 from src.infrastructure.mongodb.models.user import UserDocument
 
 
+DUPLICATE_KEY_ERROR = 11000
+
+
+@functools.cache
+def projection_model(projection: type[P], with_created_at: bool = False) -> type[P]:
+    """
+    Beanie projection model for a domain projection.
+
+    Beanie derives the Mongo projection from the model's field aliases, so the
+    subclass only maps ``id`` onto ``_id``. ``with_created_at`` also fetches the
+    creation time, which keyset pagination needs to build its cursor.
+    """
+    fields: dict[str, Any] = {"id": (uuid.UUID, Field(alias="_id"))}
+    if with_created_at:
+        fields["created_at"] = (datetime, ...)
+    return create_model(
+        f"{projection.__name__}Projection", __base__=projection, **fields
+    )
+
+
 class BeanieUserRepository(UserRepository):
     async def save(self, user: User) -> User:
-        user_document = UserDocument(
+        user_document = self._entity_to_document(user)
+        await UserDocument.insert_one(user_document)
+        return self._document_to_entity(user_document)
+
+    async def save_many(self, users: list[User]) -> list[User | Exception]:
+        if not users:
+            return []
+
+        user_documents = [self._entity_to_document(user) for user in users]
+        results: list[User | Exception] = [
+            self._document_to_entity(document) for document in user_documents
+        ]
+        try:
+            # Unordered, so one bad document does not stop the rest of the batch
+            await UserDocument.insert_many(user_documents, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                index = write_error["index"]
+                if write_error["code"] == DUPLICATE_KEY_ERROR:
+                    results[index] = UserAlreadyExistsError(users[index].email)
+                else:
+                    results[index] = WriteError(
+                        write_error["errmsg"], write_error["code"], write_error
+                    )
+        return results
+
+    async def get_by_id(
+        self, user_id: uuid.UUID, projection: Optional[type[P]] = None
+    ) -> Optional[User | P]:
+        return await self._find_one(UserDocument.id == user_id, projection)
+
+    async def get_many_by_ids(
+        self, user_ids: list[uuid.UUID], projection: Optional[type[P]] = None
+    ) -> list[User | P]:
+        if not user_ids:
+            return []
+        return await self._find_many(In(UserDocument.id, user_ids), projection)
+
+    async def get_by_email(
+        self, email: EmailStr, projection: Optional[type[P]] = None
+    ) -> Optional[User | P]:
+        return await self._find_one(UserDocument.email == email, projection)
+
+    async def get_many_by_email(
+        self, emails: list[EmailStr], projection: Optional[type[P]] = None
+    ) -> list[User | P]:
+        if not emails:
+            return []
+        return await self._find_many(In(UserDocument.email, emails), projection)
+
+    async def list_page(
+        self,
+        page_size: int,
+        after: Optional[UserPageCursor] = None,
+        projection: Optional[type[P]] = None,
+    ) -> tuple[list[User | P], Optional[UserPageCursor]]:
+        query: dict[str, Any] = {}
+        if after is not None:
+            # Seek past the last seen (created_at, _id) instead of skipping rows
+            query = {
+                "$or": [
+                    {"created_at": {"$lt": after.created_at}},
+                    {"created_at": after.created_at, "_id": {"$lt": after.id}},
+                ]
+            }
+
+        # Fetch one extra document to know whether another page exists
+        user_documents = (
+            await UserDocument.find(query)
+            .project(projection_model(projection, with_created_at=True) if projection else None)
+            .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+            .limit(page_size + 1)
+            .to_list()
+        )
+
+        next_cursor = None
+        if len(user_documents) > page_size:
+            user_documents = user_documents[:page_size]
+            last_document = user_documents[-1]
+            next_cursor = UserPageCursor(
+                created_at=last_document.created_at, id=last_document.id
+            )
+        if projection is not None:
+            return [
+                self._view_to_projection(view, projection) for view in user_documents
+            ], next_cursor
+        return [self._document_to_entity(document) for document in user_documents], next_cursor
+
+    async def stream(
+        self,
+        user_filter: UserFilter,
+        fields: Optional[list[str]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[dict[str, Any]]:
+        fields = fields or USER_FIELDS
+        if unknown_fields := set(fields) - set(USER_FIELDS):
+            raise ValueError(f"Cannot stream user fields: {', '.join(sorted(unknown_fields))}")
+
+        projection = {("_id" if field == "id" else field): 1 for field in fields}
+        projection.setdefault("_id", 0)
+
+        # Raw Motor cursor, documents are fetched batch_size at a time and never validated
+        cursor = UserDocument.get_motor_collection().find(
+            self._filter_query(user_filter), projection, batch_size=batch_size
+        )
+        try:
+            async for raw_document in cursor:
+                if "_id" in raw_document:
+                    user_id = raw_document.pop("_id")
+                    raw_document["id"] = (
+                        user_id.as_uuid() if isinstance(user_id, Binary) else user_id
+                    )
+                yield raw_document
+        finally:
+            await cursor.close()
+
+    async def update_password(self, user: User) -> None:
+        await UserDocument.find_one(UserDocument.id == user.id).update(
+            Set(
+                {
+                    UserDocument.password_hash: user.password_hash,
+                    UserDocument.password_algorithm: user.password_algorithm,
+                    UserDocument.password_params: user.password_params,
+                    UserDocument.updated_at: datetime.now(UTC),
+                }
+            )
+        )
+
+    async def _find_one(
+        self, query: Any, projection: Optional[type[P]]
+    ) -> Optional[User | P]:
+        if projection is not None:
+            view = await UserDocument.find_one(
+                query, projection_model=projection_model(projection)
+            )
+            return self._view_to_projection(view, projection) if view else None
+        user_document = await UserDocument.find_one(query)
+        if not user_document:
+            return None
+        return self._document_to_entity(user_document)
+
+    async def _find_many(self, query: Any, projection: Optional[type[P]]) -> list[User | P]:
+        if projection is not None:
+            views = await UserDocument.find(
+                query, projection_model=projection_model(projection)
+            ).to_list()
+            return [self._view_to_projection(view, projection) for view in views]
+        user_documents = await UserDocument.find(query).to_list()
+        return [self._document_to_entity(document) for document in user_documents]
+
+    @staticmethod
+    def _view_to_projection(view: BaseModel, projection: type[P]) -> P:
+        # The view was validated when it was read, only rebind it to the domain type
+        return projection.model_construct(
+            _fields_set=view.model_fields_set,
+            **{name: getattr(view, name) for name in projection.model_fields},
+        )
+
+    @staticmethod
+    def _filter_query(user_filter: UserFilter) -> dict[str, Any]:
+        query: dict[str, Any] = {}
+        if user_filter.is_active is not None:
+            query["is_active"] = user_filter.is_active
+
+        created_at: dict[str, Any] = {}
+        if user_filter.created_after is not None:
+            created_at["$gte"] = user_filter.created_after
+        if user_filter.created_before is not None:
+            created_at["$lt"] = user_filter.created_before
+        if created_at:
+            query["created_at"] = created_at
+        return query
+
+    @staticmethod
+    def _entity_to_document(user: User) -> UserDocument:
+        """Convert a domain entity to a Beanie document."""
+        return UserDocument(
             id=user.id,
             first_name=user.first_name,
             last_name=user.last_name,
             is_active=True,
             email=user.email,
             password_hash=user.password_hash,
+            password_algorithm=user.password_algorithm,
+            password_params=user.password_params,
             addresses=user.addresses,
         )
-        await UserDocument.insert_one(user_document)
-        return self._document_to_entity(user_document)
-
-    async def get_by_id(self, user_id: uuid.UUID) -> Optional[User]:
-        user_document = await UserDocument.find_one(UserDocument.id == user_id)
-        if not user_document:
-            return None
-        return self._document_to_entity(user_document)
-
-    async def get_by_email(self, email: EmailStr) -> Optional[User]:
-        user_document = await UserDocument.find_one(UserDocument.email == email)
-        if not user_document:
-            return None
-        return self._document_to_entity(user_document)
 
     @staticmethod
     def _document_to_entity(document: UserDocument) -> User:
-        """Convert a Beanie document to a domain entity."""
-        return User(
+        """
+        Convert a Beanie document to a domain entity.
+
+        Beanie validated the document when it was read, so the entity is constructed
+        without running the email and address validators a second time.
+        """
+        return User.model_construct(
             id=document.id,
             email=document.email,
             first_name=document.first_name or "",
             last_name=document.last_name or "",
             addresses=document.addresses,
             password_hash=document.password_hash,
+            password_algorithm=document.password_algorithm,
+            password_params=document.password_params,
         )
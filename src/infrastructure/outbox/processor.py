@@ -0,0 +1,43 @@
+import uuid
+from typing import Optional
+
+from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.domain.background_task.value_objects import BackgroundTaskPayload
+from src.infrastructure.mongodb.models.outbox import OutboxMessageDocument
+from src.infrastructure.outbox.relay import OutboxRelay
+
+
+class OutboxTaskProcessor(BackgroundTaskProcessor):
+    """
+    Records tasks in the Mongo outbox instead of publishing them.
+
+    ``execute_task`` costs a single insert, so callers never wait on the broker.
+    The relay later publishes each message through its own processor, under the
+    task ID returned here.
+    """
+
+    def __init__(self, relay: OutboxRelay):
+        self.relay = relay
+
+    async def register_tasks(self) -> None:
+        await self.relay.publisher.register_tasks()
+
+    async def close(self) -> None:
+        await self.relay.publisher.close()
+
+    async def execute_task(
+        self,
+        task_name: str,
+        payload: BackgroundTaskPayload,
+        task_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        message = OutboxMessageDocument(
+            id=task_id or str(uuid.uuid4()),
+            task_name=task_name,
+            payload=payload.model_dump(mode="json"),
+            idempotency_key=idempotency_key,
+        )
+        await message.insert()
+        self.relay.notify()
+        return message.id
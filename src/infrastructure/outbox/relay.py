@@ -0,0 +1,196 @@
+import asyncio
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+import structlog
+from beanie.operators import In, Set
+from pydantic import BaseModel, Field
+
+from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.domain.background_task.value_objects import RawTaskPayload
+from src.infrastructure.mongodb.models.outbox import OutboxMessageDocument, OutboxStatus
+
+logger = structlog.get_logger()
+
+
+class _OutboxMessageId(BaseModel):
+    id: str = Field(alias="_id")
+
+
+class OutboxRelay:
+    """
+    Drains the outbox into ``publisher`` in the background.
+
+    Messages are claimed ``batch_size`` at a time with a lease, so several relays
+    (one per API process) never publish the same message concurrently, and a relay
+    that dies mid-batch only delays its messages until the lease runs out. Claimed
+    messages are published concurrently and deleted once the broker accepted them,
+    which makes delivery at-least-once.
+
+    The relay wakes up every ``flush_interval_seconds``, or as soon as a full batch
+    has been enqueued in this process.
+    """
+
+    def __init__(
+        self,
+        publisher: BackgroundTaskProcessor,
+        batch_size: int = 100,
+        flush_interval_seconds: float = 1.0,
+        lease_seconds: float = 30.0,
+        max_attempts: int = 10,
+        retry_backoff_seconds: float = 5.0,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._enqueued = 0
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.failed = 0
+        self.dead = 0
+
+    def notify(self) -> None:
+        """Signal that a message was enqueued, flushing early once a batch is full."""
+        self._enqueued += 1
+        if self._enqueued >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        logger.info("Outbox relay started", batch_size=self.batch_size)
+
+    async def stop(self) -> None:
+        """Stop after a final drain of whatever is publishable right now."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        task, self._task = self._task, None
+        await task
+        logger.info("Outbox relay stopped")
+
+    def stats(self) -> dict[str, int]:
+        return {"published": self.published, "failed": self.failed, "dead": self.dead}
+
+    async def _run(self) -> None:
+        while True:
+            self._enqueued = 0
+            self._wakeup.clear()
+            try:
+                # Keep going while batches come back full, there is likely a backlog
+                while await self.drain_batch() == self.batch_size:
+                    pass
+            except Exception as e:
+                logger.error("Failed to drain the outbox", exc_info=e)
+
+            if self._stopping:
+                return
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain_batch(self) -> int:
+        """Claim and publish one batch, returning the number of messages claimed."""
+        now = datetime.now(UTC)
+        candidates = (
+            await OutboxMessageDocument.find(
+                OutboxMessageDocument.status == OutboxStatus.Pending,
+                OutboxMessageDocument.available_at <= now,
+            )
+            .sort(+OutboxMessageDocument.available_at)
+            .limit(self.batch_size)
+            .project(_OutboxMessageId)
+            .to_list()
+        )
+        if not candidates:
+            return 0
+
+        # Claim with a conditional update so concurrent relays split the batch
+        claim = uuid.uuid4()
+        await OutboxMessageDocument.find(
+            In(OutboxMessageDocument.id, [candidate.id for candidate in candidates]),
+            OutboxMessageDocument.status == OutboxStatus.Pending,
+            OutboxMessageDocument.available_at <= now,
+        ).update(
+            Set(
+                {
+                    OutboxMessageDocument.claim: claim,
+                    OutboxMessageDocument.available_at: now + timedelta(seconds=self.lease_seconds),
+                }
+            )
+        )
+        messages = await OutboxMessageDocument.find(OutboxMessageDocument.claim == claim).to_list()
+
+        results = await asyncio.gather(
+            *(
+                self.publisher.execute_task(
+                    message.task_name,
+                    RawTaskPayload(**message.payload),
+                    task_id=message.id,
+                    idempotency_key=message.idempotency_key,
+                )
+                for message in messages
+            ),
+            return_exceptions=True,
+        )
+
+        published_ids = []
+        for message, result in zip(messages, results):
+            if isinstance(result, BaseException):
+                await self._record_failure(message, result)
+            else:
+                published_ids.append(message.id)
+        if published_ids:
+            await OutboxMessageDocument.find(In(OutboxMessageDocument.id, published_ids)).delete()
+            self.published += len(published_ids)
+        return len(messages)
+
+    async def _record_failure(self, message: OutboxMessageDocument, error: BaseException) -> None:
+        self.failed += 1
+        attempts = message.attempts + 1
+        status = OutboxStatus.Pending
+        if attempts >= self.max_attempts:
+            status = OutboxStatus.Dead
+            self.dead += 1
+            logger.error(
+                "Giving up on outbox message",
+                task_id=message.id,
+                task_name=message.task_name,
+                attempts=attempts,
+                error=str(error),
+            )
+        else:
+            logger.warning(
+                "Failed to publish outbox message",
+                task_id=message.id,
+                task_name=message.task_name,
+                attempts=attempts,
+                error=str(error),
+            )
+
+        await OutboxMessageDocument.find_one(OutboxMessageDocument.id == message.id).update(
+            Set(
+                {
+                    OutboxMessageDocument.status: status,
+                    OutboxMessageDocument.attempts: attempts,
+                    OutboxMessageDocument.last_error: str(error),
+                    OutboxMessageDocument.claim: None,
+                    # Linear backoff, a broker outage should not turn into a publish storm
+                    OutboxMessageDocument.available_at: datetime.now(UTC)
+                    + timedelta(seconds=self.retry_backoff_seconds * attempts),
+                }
+            )
+        )
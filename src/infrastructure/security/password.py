@@ -0,0 +1,167 @@
+import asyncio
+import math
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Literal, Optional, TypeVar
+
+import bcrypt
+import structlog
+
+from src.config import PasswordHashingSettings
+from src.domain.users.services import PasswordHasher, PasswordHashingService
+from src.domain.users.value_objects import HashedPassword
+
+logger = structlog.get_logger()
+
+R = TypeVar("R")
+
+_CALIBRATION_PASSWORD = "calibration-password"
+
+
+class BcryptPasswordHasher(PasswordHasher):
+    algorithm = "bcrypt"
+
+    # bcrypt accepts cost factors between 4 and 31
+    MIN_ROUNDS = 4
+    MAX_ROUNDS = 31
+
+    def __init__(self, rounds: int = 12):
+        if not self.MIN_ROUNDS <= rounds <= self.MAX_ROUNDS:
+            raise ValueError(
+                f"bcrypt rounds must be between {self.MIN_ROUNDS} and {self.MAX_ROUNDS}"
+            )
+        self.rounds = rounds
+
+    @property
+    def params(self) -> dict[str, Any]:
+        return {"rounds": self.rounds}
+
+    def hash(self, password: str) -> bytes:
+        return bcrypt.hashpw(password.encode("utf-8"), salt=bcrypt.gensalt(rounds=self.rounds))
+
+    def verify(self, password: str, password_hash: bytes) -> bool:
+        return bcrypt.checkpw(password.encode("utf-8"), password_hash)
+
+    @classmethod
+    def measure(cls, rounds: int, samples: int = 3) -> float:
+        """Best-of-``samples`` wall time, in milliseconds, of a single hash at ``rounds``."""
+        hasher = cls(rounds)
+        best = math.inf
+        for _ in range(samples):
+            started = time.perf_counter()
+            hasher.hash(_CALIBRATION_PASSWORD)
+            best = min(best, (time.perf_counter() - started) * 1000)
+        return best
+
+    @classmethod
+    def calibrate(
+        cls, target_latency_ms: float, min_rounds: int = 10, max_rounds: int = 16
+    ) -> "BcryptPasswordHasher":
+        """
+        Pick the highest cost whose hash time stays within ``target_latency_ms``.
+
+        Every extra bcrypt round doubles the work, so a single measurement at
+        ``min_rounds`` is enough to extrapolate the remaining costs.
+        """
+        if min_rounds > max_rounds:
+            raise ValueError("min_rounds must not be greater than max_rounds")
+
+        elapsed_ms = cls.measure(min_rounds)
+        extra_rounds = 0
+        if elapsed_ms < target_latency_ms:
+            extra_rounds = int(math.log2(target_latency_ms / max(elapsed_ms, 1e-6)))
+        rounds = min(min_rounds + extra_rounds, max_rounds)
+
+        logger.info(
+            "Calibrated bcrypt cost",
+            rounds=rounds,
+            target_latency_ms=target_latency_ms,
+            estimated_latency_ms=round(elapsed_ms * 2 ** (rounds - min_rounds), 2),
+        )
+        return cls(rounds)
+
+
+def build_password_hasher(settings: PasswordHashingSettings) -> PasswordHasher:
+    """Create the configured hasher, benchmarking the host unless the cost is pinned."""
+    if settings.rounds is not None:
+        return BcryptPasswordHasher(settings.rounds)
+    return BcryptPasswordHasher.calibrate(
+        settings.target_latency_ms,
+        min_rounds=settings.min_rounds,
+        max_rounds=settings.max_rounds,
+    )
+
+
+class PooledPasswordHashingService(PasswordHashingService):
+    """
+    Runs password hashing on a dedicated worker pool.
+
+    At most ``pool_size + queue_depth`` operations are admitted at any time. Once that
+    bound is reached, further callers wait for a free slot instead of piling work onto
+    an unbounded executor queue, which pushes the backpressure onto the request path.
+    """
+
+    def __init__(
+        self,
+        hasher: PasswordHasher,
+        executor: Literal["process", "thread"] = "thread",
+        pool_size: int = 4,
+        queue_depth: int = 64,
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        if queue_depth < 0:
+            raise ValueError("queue_depth must not be negative")
+
+        self.hasher = hasher
+        self.executor_type = executor
+        self.pool_size = pool_size
+        self.queue_depth = queue_depth
+        self._executor: Optional[Executor] = None
+        self._slots = asyncio.Semaphore(pool_size + queue_depth)
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of admitted operations, either running or queued on the pool."""
+        return self._in_flight
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.pool_size)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.pool_size, thread_name_prefix="password-hashing"
+                )
+        return self._executor
+
+    async def _submit(self, fn: Callable[..., R], *args: Any) -> R:
+        async with self._slots:
+            self._in_flight += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+            finally:
+                self._in_flight -= 1
+
+    async def hash_password(self, password: str) -> HashedPassword:
+        value = await self._submit(self.hasher.hash, password)
+        return HashedPassword(
+            value=value, algorithm=self.hasher.algorithm, params=self.hasher.params
+        )
+
+    async def verify_password(self, password: str, password_hash: Optional[bytes]) -> bool:
+        if password_hash is None:
+            return False
+        return await self._submit(self.hasher.verify, password, password_hash)
+
+    def needs_rehash(self, algorithm: Optional[str], params: dict[str, Any]) -> bool:
+        return self.hasher.needs_rehash(algorithm, params)
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True)
+        logger.info("Password hashing pool stopped")
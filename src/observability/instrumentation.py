@@ -0,0 +1,179 @@
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Optional, TypeVar
+
+from pydantic import EmailStr
+
+from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.domain.background_task.value_objects import BackgroundTaskPayload
+from src.domain.users.entities import User
+from src.domain.users.repositories import P, UserRepository
+from src.domain.users.value_objects import UserFilter, UserPageCursor
+from src.observability.metrics import MetricsRegistry
+from src.observability.request_timing import record_db_call, record_task_kick
+
+T = TypeVar("T")
+
+
+class TimedUserRepository(UserRepository):
+    """
+    Records how long each call to the wrapped repository takes, per method and
+    outcome, in ``user_repository_duration_seconds``, and adds it to the current
+    request's database time. A stream is timed from its first to its last row.
+    Without a registry, only the request's database time is kept.
+    """
+
+    def __init__(self, repository: UserRepository, registry: Optional[MetricsRegistry] = None):
+        self.repository = repository
+        self._duration = None
+        if registry is not None:
+            self._duration = registry.histogram(
+                "user_repository_duration_seconds",
+                "Time spent in UserRepository calls",
+                ["method", "outcome"],
+            )
+
+    async def save(self, user: User) -> User:
+        return await self._timed("save", self.repository.save(user))
+
+    async def save_many(self, users: list[User]) -> list[User | Exception]:
+        return await self._timed("save_many", self.repository.save_many(users))
+
+    async def get_by_id(
+        self, user_id: uuid.UUID, projection: Optional[type[P]] = None
+    ) -> Optional[User | P]:
+        return await self._timed(
+            "get_by_id", self.repository.get_by_id(user_id, projection=projection)
+        )
+
+    async def get_many_by_ids(
+        self, user_ids: list[uuid.UUID], projection: Optional[type[P]] = None
+    ) -> list[User | P]:
+        return await self._timed(
+            "get_many_by_ids", self.repository.get_many_by_ids(user_ids, projection=projection)
+        )
+
+    async def get_by_email(
+        self, email: EmailStr, projection: Optional[type[P]] = None
+    ) -> Optional[User | P]:
+        return await self._timed(
+            "get_by_email", self.repository.get_by_email(email, projection=projection)
+        )
+
+    async def get_many_by_email(
+        self, emails: list[EmailStr], projection: Optional[type[P]] = None
+    ) -> list[User | P]:
+        return await self._timed(
+            "get_many_by_email", self.repository.get_many_by_email(emails, projection=projection)
+        )
+
+    async def update_password(self, user: User) -> None:
+        return await self._timed("update_password", self.repository.update_password(user))
+
+    async def list_page(
+        self,
+        page_size: int,
+        after: Optional[UserPageCursor] = None,
+        projection: Optional[type[P]] = None,
+    ) -> tuple[list[User | P], Optional[UserPageCursor]]:
+        return await self._timed(
+            "list_page", self.repository.list_page(page_size, after=after, projection=projection)
+        )
+
+    async def stream(
+        self,
+        user_filter: UserFilter,
+        fields: Optional[list[str]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[dict[str, Any]]:
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            async for row in self.repository.stream(
+                user_filter, fields=fields, batch_size=batch_size
+            ):
+                yield row
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            self._record("stream", outcome, time.perf_counter() - started)
+
+    async def _timed(self, method: str, call: Awaitable[T]) -> T:
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            return await call
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            self._record(method, outcome, time.perf_counter() - started)
+
+    def _record(self, method: str, outcome: str, seconds: float) -> None:
+        record_db_call(seconds)
+        if self._duration is not None:
+            self._duration.labels(method, outcome).observe(seconds)
+
+
+class TimedTaskProcessor(BackgroundTaskProcessor):
+    """
+    Records the latency of handing a task over to the wrapped processor in
+    ``task_publish_duration_seconds`` and counts kicks by outcome in
+    ``task_publish_total``, both per task name. The latency is also added to the
+    current request's task time, which is all that is kept without a registry.
+    """
+
+    def __init__(
+        self, processor: BackgroundTaskProcessor, registry: Optional[MetricsRegistry] = None
+    ):
+        self.processor = processor
+        self._duration = self._total = None
+        if registry is not None:
+            self._duration = registry.histogram(
+                "task_publish_duration_seconds",
+                "Time taken to hand a background task over for execution",
+                ["task_name"],
+            )
+            self._total = registry.counter(
+                "task_publish_total", "Background tasks kicked", ["task_name", "outcome"]
+            )
+
+    async def register_tasks(self) -> None:
+        await self.processor.register_tasks()
+
+    async def close(self) -> None:
+        await self.processor.close()
+
+    async def execute_task(
+        self,
+        task_name: str,
+        payload: BackgroundTaskPayload,
+        task_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            return await self.processor.execute_task(
+                task_name, payload, task_id=task_id, idempotency_key=idempotency_key
+            )
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            seconds = time.perf_counter() - started
+            record_task_kick(seconds)
+            if self._duration is not None:
+                self._duration.labels(task_name).observe(seconds)
+                self._total.labels(task_name, outcome).inc()
+
+
+def processor_stats(processor: BackgroundTaskProcessor) -> dict[str, Any]:
+    """The ``stats()`` of a processor and of every processor it wraps, merged."""
+    stats: dict[str, Any] = {}
+    while processor is not None:
+        if hasattr(processor, "stats"):
+            stats = {**processor.stats(), **stats}
+        processor = getattr(processor, "processor", None)
+    return stats
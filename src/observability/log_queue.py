@@ -0,0 +1,212 @@
+import contextvars
+import logging
+import sys
+import threading
+from collections import deque
+from typing import Any, BinaryIO, Callable, Literal, Optional
+
+import structlog
+from structlog.typing import EventDict, Processor, WrappedLogger
+
+# Turns a queued entry into its log line, on the writer thread
+Render = Callable[[Any], str | bytes]
+
+
+class QueuedLogWriter:
+    """
+    Writes log lines from a background thread, so logging never waits on stdout.
+
+    Logging calls only append an entry to a bounded buffer; the writer thread renders
+    entries and writes them in batches of up to ``batch_size`` lines, with one write
+    and one flush per batch. It wakes up every ``flush_interval_seconds``, or as soon
+    as a batch is full.
+
+    When the buffer holds ``max_size`` entries, ``overflow`` decides what happens to
+    new lines: ``"drop"`` discards them and counts them in ``dropped``, ``"block"``
+    makes the logging call wait for room, counted in ``blocked``. Appending takes no
+    lock, so concurrent threads may overshoot ``max_size`` by a line each.
+
+    Lines are written to ``stream``, a binary file, standard output by default.
+    ``close`` writes whatever is still queued and stops the thread; lines logged
+    afterwards are written straight away.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[BinaryIO] = None,
+        max_size: int = 10_000,
+        overflow: Literal["drop", "block"] = "drop",
+        batch_size: int = 256,
+        flush_interval_seconds: float = 0.1,
+    ):
+        if max_size < 1 or batch_size < 1:
+            raise ValueError("max_size and batch_size must be at least 1")
+
+        self.stream = stream
+        self.max_size = max_size
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.failed = 0
+        self.batches = 0
+        self._buffer: deque[tuple[Render, Any]] = deque()
+        self._wake = threading.Event()
+        self._not_full = threading.Condition()
+        # Held while draining, keeps batches in order when flush runs on another thread
+        self._drain_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+
+    def start(self) -> None:
+        if self._thread is not None or self._closing:
+            return
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, render: Render, entry: Any) -> bool:
+        """Queue ``entry``, rendered later by ``render``. False when it was dropped."""
+        if self._thread is None:
+            self._write([render(entry)])
+            return True
+
+        if len(self._buffer) >= self.max_size:
+            if self.overflow == "drop":
+                self.dropped += 1
+                return False
+            self.blocked += 1
+            with self._not_full:
+                while len(self._buffer) >= self.max_size and self._thread is not None:
+                    self._wake.set()
+                    self._not_full.wait(self.flush_interval_seconds)
+
+        self._buffer.append((render, entry))
+        self.enqueued += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def flush(self) -> None:
+        """Write every queued line, on the calling thread."""
+        with self._drain_lock:
+            self._drain()
+
+    def close(self) -> None:
+        thread, self._thread = self._thread, None
+        self._closing = True
+        if thread is not None:
+            self._wake.set()
+            thread.join()
+        self.flush()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": len(self._buffer),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "blocked": self.blocked,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    def processor(self, processors: list[Processor]) -> Processor:
+        """
+        A structlog processor that queues the event instead of passing it on.
+
+        It goes last in the chain; ``processors``, typically the renderer, run on
+        the writer thread. Exception info is captured when the event is logged, as
+        the exception is gone by the time the event is rendered.
+        """
+
+        def render(entry: tuple[str, EventDict]) -> str | bytes:
+            method_name, event_dict = entry
+            for processor in processors:
+                event_dict = processor(None, method_name, event_dict)
+            return event_dict
+
+        def enqueue(_: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
+            exc_info = event_dict.get("exc_info")
+            if exc_info and not isinstance(exc_info, (tuple, BaseException)):
+                event_dict["exc_info"] = sys.exc_info()
+            self.put(render, (method_name, event_dict))
+            raise structlog.DropEvent
+
+        return enqueue
+
+    def _run(self) -> None:
+        while not self._closing:
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def _drain(self) -> None:
+        while self._buffer:
+            batch = []
+            try:
+                for _ in range(self.batch_size):
+                    batch.append(self._buffer.popleft())
+            except IndexError:
+                pass
+
+            lines = []
+            for render, entry in batch:
+                try:
+                    lines.append(render(entry))
+                except Exception:
+                    self.failed += 1
+            self._write(lines)
+
+            if self.overflow == "block":
+                with self._not_full:
+                    self._not_full.notify_all()
+
+    def _write(self, lines: list[str | bytes]) -> None:
+        if not lines:
+            return
+        # Resolved on each write, so a redirected stdout is followed
+        stream = self.stream or sys.stdout.buffer
+        try:
+            data = b"\n".join(
+                line if isinstance(line, bytes) else line.encode("utf-8") for line in lines
+            )
+            stream.write(data + b"\n")
+            stream.flush()
+        except Exception:
+            self.failed += len(lines)
+            return
+        self.written += len(lines)
+        self.batches += 1
+
+
+class QueuedLogHandler(logging.Handler):
+    """
+    Standard library handler queueing records on a QueuedLogWriter.
+
+    Records are formatted on the writer thread, inside a copy of the context they
+    were logged in, so formatters reading context variables, e.g. the request ID,
+    still see them.
+    """
+
+    def __init__(self, writer: QueuedLogWriter):
+        super().__init__()
+        self.writer = writer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            # Arguments may change before the record is formatted, like QueueHandler
+            record.msg = record.getMessage()
+            record.args = None
+            self.writer.put(self._render, (contextvars.copy_context(), record))
+        except Exception:
+            self.handleError(record)
+
+    def _render(self, entry: tuple[contextvars.Context, logging.LogRecord]) -> str:
+        context, record = entry
+        return context.run(self.format, record)
+
+
+__all__ = ("QueuedLogHandler", "QueuedLogWriter")
@@ -1,13 +1,16 @@
-import json
 import logging
 import sys
 from typing import Callable, Literal, Optional, List, Any
 
+import pydantic_core
 import structlog
 from asgi_correlation_id import correlation_id
 from structlog.testing import LogCapture
 from structlog.typing import WrappedLogger, EventDict, Processor
 
+from src.observability.log_queue import QueuedLogHandler, QueuedLogWriter
+from src.observability.sampling import LogSampler
+
 LOG_LEVEL_MAP: dict[str, Any] = {
     "debug": logging.DEBUG,
     "info": logging.INFO,
@@ -17,12 +20,28 @@ LOG_LEVEL_MAP: dict[str, Any] = {
 }
 
 
+def json_bytes(value: Any) -> bytes:
+    """
+    Encode ``value`` as JSON. UUIDs, datetimes, enums and the like are encoded natively,
+    anything else that is not JSON as its ``str()``.
+    """
+    return pydantic_core.to_json(value, serialize_unknown=True)
+
+
 class StructuredAppLogRenderer:
+    """
+    Renders an event as a single line of JSON, as bytes.
+
+    The ``resource`` block is the same for every line the process writes, so it is
+    serialised once and spliced into each line; only the event's own fields are
+    serialised per line.
+    """
+
     def __init__(
         self,
         service_name: str,
         env: Literal["production", "staging", "development"],
-        serializer: Callable = json.dumps,
+        serializer: Callable[[Any], bytes] = json_bytes,
         service_namespace: Optional[str] = None,
         service_version: Optional[str] = None,
     ):
@@ -31,27 +50,34 @@ class StructuredAppLogRenderer:
         self._env = env
         self._service_namespace = service_namespace
         self._service_version = service_version
+        resource = serializer({
+            "service": {
+                "name": service_name,
+                "namespace": service_namespace,
+                "version": service_version,
+            },
+            "environment": {"name": env},
+        })
+        # Replaces the closing brace of the per-event object
+        self._resource_suffix = b',"resource":' + resource + b"}"
 
     def __call__(
         self, logger: WrappedLogger, name: str, event_dict: EventDict
-    ) -> str | bytes:
+    ) -> bytes:
         timestamp, level = event_dict.pop("timestamp"), event_dict.pop("level")
         body = event_dict.pop("event")
-        log_data = {
+        log_data = self._dumps({
             "timestamp": int(timestamp),
             "severity_text": level,
             "body": body,
-            "resource": {
-                "service": {
-                    "name": self._service_name,
-                    "namespace": self._service_namespace,
-                    "version": self._service_version,
-                },
-                "environment": {"name": self._env},
-            },
             "attributes": event_dict,
-        }
-        return self._dumps(log_data)
+        })
+        return log_data[:-1] + self._resource_suffix
+
+
+def decode_rendered(_: WrappedLogger, __: str, rendered: str | bytes) -> str:
+    """Standard library formatters must return ``str``."""
+    return rendered.decode("utf-8") if isinstance(rendered, bytes) else rendered
 
 
 def add_correlation(
@@ -71,11 +97,17 @@ class AppLogger:
         environment: str,
         service_namespace: Optional[str] = None,
         service_version: Optional[str] = None,
+        # Renders and writes lines on a background thread instead of the caller's
+        log_writer: Optional[QueuedLogWriter] = None,
+        # Drops part of the info and debug lines of noisy events
+        log_sampler: Optional[LogSampler] = None,
         # Below is just used for testing
         log_output: Optional[LogCapture] = None,
     ):
         # Initialisation
         self.log_output = log_output
+        self.log_writer = log_writer
+        self.log_sampler = log_sampler
         self._service_name = service_name
         self._service_namespace = service_namespace
         self._service_version = service_version
@@ -90,10 +122,14 @@ class AppLogger:
             structlog.processors.StackInfoRenderer(),
             structlog.processors.TimeStamper(utc=True),
         ]
-
+        if self.log_sampler is not None:
+            # Once the level and request ID are known, before any further work on the line
+            self._base_processors.insert(3, self.log_sampler)
 
         self._setup_structlog()
         self._setup_stdlib_log()
+        if self.log_writer is not None:
+            self.log_writer.start()
 
     def _get_final_processors(self) -> List[Processor]:
         if self._environment == "production":
@@ -115,11 +151,20 @@ class AppLogger:
         return processors
 
     def _setup_structlog(self):
+        if self.log_writer is not None:
+            final_processors = [self.log_writer.processor(self._get_final_processors())]
+        else:
+            final_processors = self._get_final_processors()
         structlog.configure(
-            processors=self._base_processors + self._get_final_processors(),
+            processors=self._base_processors + final_processors,
             wrapper_class=structlog.make_filtering_bound_logger(self._log_level),
             context_class=dict,
-            logger_factory=structlog.PrintLoggerFactory(),
+            # The production renderer writes bytes, saving an encode per line
+            logger_factory=(
+                structlog.BytesLoggerFactory()
+                if self._environment == "production"
+                else structlog.PrintLoggerFactory()
+            ),
             cache_logger_on_first_use=True,
         )
 
@@ -127,10 +172,14 @@ class AppLogger:
         formatter = structlog.stdlib.ProcessorFormatter(
             foreign_pre_chain=self._base_processors,
             processors=[structlog.stdlib.ProcessorFormatter.remove_processors_meta]
-            + self._get_final_processors(),
+            + self._get_final_processors()
+            + [decode_rendered],
         )
 
-        handler = logging.StreamHandler(stream=sys.stdout)
+        if self.log_writer is not None:
+            handler = QueuedLogHandler(self.log_writer)
+        else:
+            handler = logging.StreamHandler(stream=sys.stdout)
         handler.setFormatter(formatter)
 
         for logger_name in logging.root.manager.loggerDict.keys():
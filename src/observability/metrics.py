@@ -0,0 +1,279 @@
+import asyncio
+import inspect
+import os
+import resource
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Optional, Sequence
+
+import structlog
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess, values
+from prometheus_client.core import GaugeMetricFamily, Metric
+
+logger = structlog.get_logger()
+
+# Request and query latencies, in seconds
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# The text format generate_latest writes
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+StatsSource = Callable[[], Mapping[str, float] | Awaitable[Mapping[str, float]]]
+
+
+class _Stats:
+    """A ``register_stats`` source and the metrics its values are published as."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        source: StatsSource,
+        label: Optional[str],
+        multiprocess_mode: str | Mapping[str, str],
+        counters: Sequence[str],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.source = source
+        self.label = label
+        self.multiprocess_mode = multiprocess_mode
+        self.counters = frozenset(counters)
+        self.is_async = inspect.iscoroutinefunction(source)
+        # Counters only go up, by the difference to the value read last time
+        self.last_totals: dict[str, float] = {}
+
+    def mode(self, key: Optional[str] = None) -> str:
+        if isinstance(self.multiprocess_mode, str):
+            return self.multiprocess_mode
+        return self.multiprocess_mode.get(key, "livesum")
+
+    async def read(self) -> Optional[dict[str, float]]:
+        try:
+            stats = await self.source() if self.is_async else self.source()
+        except Exception as e:
+            logger.warning("Failed to read stats", metric=self.name, error=str(e))
+            return None
+        return {
+            key: value
+            for key, value in stats.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+
+
+class _LocalStatsCollector:
+    """Publishes the values of coroutine stats sources read for the current scrape."""
+
+    def __init__(self):
+        self.families: list[Metric] = []
+
+    def collect(self) -> Iterable[Metric]:
+        return self.families
+
+
+class MetricsRegistry:
+    """
+    Metrics of this process, kept and rendered by ``prometheus_client``.
+
+    Besides the metrics recorded as things happen, ``register_stats`` adds gauges
+    read from a component's ``stats()``-like mapping on every scrape.
+
+    With ``multiprocess_dir``, processes serving the same app (e.g. several uvicorn
+    workers) record into files in that directory through prometheus_client's
+    multiprocess mode, and a scrape of any of them reports all of them. Counters and
+    histograms are summed over every process, including exited ones; each gauge
+    combines the processes' values by its ``multiprocess_mode``, summing those of
+    live processes by default. Stats sources are read in the background once
+    ``start`` was called and on every scrape. Those that are coroutines, typically
+    broker-wide values such as queue depths, are only read by the scraped process
+    and never combined. Multiprocess mode applies to the whole process, so the
+    registry must be created before any metric; the directory should be emptied
+    when the deployment starts.
+    """
+
+    def __init__(self, multiprocess_dir: Optional[str] = None):
+        self.multiprocess_dir = multiprocess_dir
+        if multiprocess_dir is not None:
+            _enable_multiprocess(multiprocess_dir)
+        self.registry = CollectorRegistry(auto_describe=True)
+        self._metrics: dict[str, tuple[Any, tuple[str, ...]]] = {}
+        self._stats: list[_Stats] = []
+        self._local_stats = _LocalStatsCollector()
+        self.registry.register(self._local_stats)
+        self._flusher: Optional[asyncio.Task] = None
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(name, Counter, documentation, labelnames)
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        multiprocess_mode: str = "livesum",
+    ) -> Gauge:
+        return self._register(
+            name, Gauge, documentation, labelnames, multiprocess_mode=multiprocess_mode
+        )
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(name, Histogram, documentation, labelnames, buckets=buckets)
+
+    def register_stats(
+        self,
+        name: str,
+        documentation: str,
+        source: StatsSource,
+        label: Optional[str] = None,
+        multiprocess_mode: str | Mapping[str, str] = "livesum",
+        counters: Sequence[str] = (),
+    ) -> None:
+        """
+        Publish the mapping returned by ``source`` as gauges, named ``<name>_<key>``,
+        or a single gauge ``name`` labelled ``label=<key>`` when ``label`` is given.
+        Non-numeric values are skipped.
+
+        ``multiprocess_mode`` is how the gauges of several processes are combined,
+        for all of them or per key; keys listed in ``counters`` only ever go up and
+        are published as counters instead.
+        """
+        self._stats.append(
+            _Stats(name, documentation, source, label, multiprocess_mode, counters)
+        )
+
+    async def render(self) -> bytes:
+        await self.refresh()
+        self._local_stats.families = await self._read_local_stats()
+        try:
+            if self.multiprocess_dir is None:
+                return generate_latest(self.registry)
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry, path=self.multiprocess_dir)
+            registry.register(self._local_stats)
+            return generate_latest(registry)
+        finally:
+            self._local_stats.families = []
+
+    async def snapshot(self) -> dict[str, Metric]:
+        """This process's metrics by name, with the stats sources read just now."""
+        await self.refresh()
+        return {metric.name: metric for metric in self.registry.collect()}
+
+    async def refresh(self) -> None:
+        """Record the current values of the stats sources that are not coroutines."""
+        for stats in self._stats:
+            if stats.is_async:
+                continue
+            current = await stats.read()
+            if current is None:
+                continue
+            if stats.label is not None:
+                gauge = self.gauge(stats.name, stats.documentation, [stats.label], stats.mode())
+                for key, value in current.items():
+                    gauge.labels(key).set(value)
+                continue
+            for key, value in current.items():
+                name = f"{stats.name}_{key}"
+                documentation = f"{stats.documentation}: {key}"
+                if key in stats.counters:
+                    increase = value - stats.last_totals.get(key, 0.0)
+                    stats.last_totals[key] = value
+                    counter = self.counter(name, documentation)
+                    if increase > 0:
+                        counter.inc(increase)
+                    continue
+                self.gauge(name, documentation, multiprocess_mode=stats.mode(key)).set(value)
+
+    async def start(self, flush_interval_seconds: float = 5.0) -> None:
+        """Record the stats in the background, when running with ``multiprocess_dir``."""
+        if self.multiprocess_dir is None or self._flusher is not None:
+            return
+        self._flusher = asyncio.create_task(self._flush_loop(flush_interval_seconds))
+
+    async def stop(self) -> None:
+        if self._flusher is None:
+            return
+        flusher, self._flusher = self._flusher, None
+        flusher.cancel()
+        await asyncio.gather(flusher, return_exceptions=True)
+        await self.refresh()
+        # Gauges of live processes stop counting this one
+        multiprocess.mark_process_dead(os.getpid(), self.multiprocess_dir)
+
+    async def _flush_loop(self, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Failed to record stats", error=str(e))
+            await asyncio.sleep(interval)
+
+    async def _read_local_stats(self) -> list[Metric]:
+        families = []
+        for stats in self._stats:
+            if not stats.is_async:
+                continue
+            current = await stats.read()
+            if current is None:
+                continue
+            if stats.label is not None:
+                family = GaugeMetricFamily(
+                    stats.name, stats.documentation, labels=[stats.label]
+                )
+                for key, value in current.items():
+                    family.add_metric([key], value)
+                families.append(family)
+                continue
+            for key, value in current.items():
+                families.append(
+                    GaugeMetricFamily(
+                        f"{stats.name}_{key}", f"{stats.documentation}: {key}", value=value
+                    )
+                )
+        return families
+
+    def _register(
+        self, name: str, metric_type: type, documentation: str, labelnames: Sequence[str], **kwargs
+    ) -> Any:
+        labelnames = tuple(labelnames)
+        existing = self._metrics.get(name)
+        if existing is not None:
+            metric, existing_labelnames = existing
+            if type(metric) is not metric_type or existing_labelnames != labelnames:
+                raise ValueError(f"Metric {name} is already registered differently")
+            return metric
+        metric = metric_type(name, documentation, labelnames, registry=self.registry, **kwargs)
+        self._metrics[name] = (metric, labelnames)
+        return metric
+
+
+def process_stats() -> dict[str, float]:
+    """CPU time, memory and open files of this process, where the platform exposes them."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    stats = {
+        "cpu_seconds_total": usage.ru_utime + usage.ru_stime,
+        "max_rss_bytes": usage.ru_maxrss * 1024,
+    }
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        stats["resident_memory_bytes"] = resident_pages * os.sysconf("SC_PAGE_SIZE")
+        stats["open_fds"] = len(os.listdir("/proc/self/fd"))
+    except OSError:
+        pass
+    return stats
+
+
+def _enable_multiprocess(directory: str) -> None:
+    # prometheus_client reads the directory from the environment, and picks the
+    # value class of new metrics from the environment when it is imported
+    os.makedirs(directory, exist_ok=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+    values.ValueClass = values.get_value_class()
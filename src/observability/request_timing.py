@@ -0,0 +1,45 @@
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestTimings:
+    """Time the current request spent in the database and kicking tasks."""
+
+    __slots__ = ("db_seconds", "db_calls", "task_seconds", "task_kicks")
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.db_calls = 0
+        self.task_seconds = 0.0
+        self.task_kicks = 0
+
+    def server_timing(self, total_seconds: float) -> str:
+        """The timings as a ``Server-Timing`` header value, in milliseconds."""
+        return (
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_calls} calls", '
+            f'task;dur={self.task_seconds * 1000:.2f};desc="{self.task_kicks} kicks", '
+            f"total;dur={total_seconds * 1000:.2f}"
+        )
+
+
+# Set for the duration of each HTTP request
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def record_db_call(seconds: float) -> None:
+    timings = request_timings.get()
+    if timings is not None:
+        timings.db_seconds += seconds
+        timings.db_calls += 1
+
+
+def record_task_kick(seconds: float) -> None:
+    timings = request_timings.get()
+    if timings is not None:
+        timings.task_seconds += seconds
+        timings.task_kicks += 1
+
+
+__all__ = ("RequestTimings", "record_db_call", "record_task_kick", "request_timings")
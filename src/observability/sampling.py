@@ -0,0 +1,163 @@
+import math
+import threading
+import time
+import zlib
+from typing import Any, Callable, Mapping, Optional
+
+import structlog
+from structlog.typing import EventDict, WrappedLogger
+
+# Never sampled nor rate limited
+ALWAYS_KEPT_LEVELS = frozenset({"warning", "error", "critical"})
+
+# Shared by events seen once the sampler tracks ``max_keys`` of them
+OTHER_KEY = "<other>"
+
+
+def keeps_request(request_id: Any, rate: float) -> bool:
+    """
+    Whether a request is kept at sample ``rate``. Stable across processes, unlike
+    ``hash()``, and consistent between rates: what a lower rate keeps, a higher one does.
+    """
+    return zlib.crc32(str(request_id).encode()) < rate * 0x1_0000_0000
+
+
+class _KeyState:
+    __slots__ = ("rate", "seen", "suppressed", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.seen = 0
+        self.suppressed = 0
+        self.tokens = burst
+        self.updated_at = now
+
+
+class LogSampler:
+    """
+    A structlog processor thinning out info and debug lines, per event.
+
+    Lines are keyed on their event, the message passed to the logger, so messages
+    should not have values formatted into them. Of the lines of a key, a share of
+    ``rates[key]``, or ``default_rate``, is kept. With ``key_on_request_id`` the
+    decision is derived from the line's ``request_id``, so a request's lines are kept
+    or dropped together, in every process; other lines are kept evenly, e.g. every
+    tenth at 0.1, starting with the first. On top of that, each key may pass at most
+    ``rate_limit_per_second`` lines, in bursts of up to ``rate_limit_burst``.
+
+    Warnings and errors are always kept, as are records from the standard library,
+    whose volume their loggers' levels control. Every ``summary_interval_seconds``,
+    with the next line logged, the number of suppressed lines per key is logged.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Mapping[str, float]] = None,
+        default_rate: float = 1.0,
+        key_on_request_id: bool = True,
+        rate_limit_per_second: Optional[float] = None,
+        rate_limit_burst: int = 100,
+        summary_interval_seconds: float = 60.0,
+        max_keys: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        rates = dict(rates or {})
+        if any(not 0 <= rate <= 1 for rate in (default_rate, *rates.values())):
+            raise ValueError("Sample rates must be between 0 and 1")
+        if rate_limit_per_second is not None and rate_limit_per_second <= 0:
+            raise ValueError("rate_limit_per_second must be positive")
+
+        self.rates = rates
+        self.default_rate = default_rate
+        self.key_on_request_id = key_on_request_id
+        self.rate_limit_per_second = rate_limit_per_second
+        self.rate_limit_burst = rate_limit_burst
+        self.summary_interval_seconds = summary_interval_seconds
+        self.max_keys = max_keys
+        self._clock = clock
+        self._keys: dict[Any, _KeyState] = {}
+        self._next_summary = clock() + summary_interval_seconds
+        # Set while the summary is logged, which runs through this processor again
+        self._summarizing = threading.local()
+
+    def __call__(self, _: WrappedLogger, __: str, event_dict: EventDict) -> EventDict:
+        if (
+            event_dict.get("level") in ALWAYS_KEPT_LEVELS
+            or "_record" in event_dict
+            or getattr(self._summarizing, "active", False)
+        ):
+            return event_dict
+
+        now = self._clock()
+        if now >= self._next_summary:
+            self._summarize(now)
+
+        key = event_dict.get("event")
+        state = self._keys.get(key)
+        if state is None:
+            state = self._track(key, now)
+        state.seen += 1
+
+        if not (self._sampled(state, event_dict) and self._admitted(state, now)):
+            state.suppressed += 1
+            raise structlog.DropEvent
+        return event_dict
+
+    def suppressed(self) -> dict[str, int]:
+        return {
+            str(key): state.suppressed for key, state in self._keys.items() if state.suppressed
+        }
+
+    def _sampled(self, state: _KeyState, event_dict: EventDict) -> bool:
+        rate = state.rate
+        if rate >= 1:
+            return True
+        request_id = event_dict.get("request_id") if self.key_on_request_id else None
+        if request_id is not None:
+            return keeps_request(request_id, rate)
+        # Keeps the first line, then one whenever the running share reaches a whole line
+        return math.ceil(state.seen * rate) != math.ceil((state.seen - 1) * rate)
+
+    def _admitted(self, state: _KeyState, now: float) -> bool:
+        if self.rate_limit_per_second is None:
+            return True
+        state.tokens = min(
+            self.rate_limit_burst,
+            state.tokens + (now - state.updated_at) * self.rate_limit_per_second,
+        )
+        state.updated_at = now
+        if state.tokens < 1:
+            return False
+        state.tokens -= 1
+        return True
+
+    def _track(self, key: Any, now: float) -> _KeyState:
+        if len(self._keys) >= self.max_keys:
+            key = OTHER_KEY
+            state = self._keys.get(key)
+            if state is not None:
+                return state
+        rate = self.rates.get(key, self.default_rate) if isinstance(key, str) else 1.0
+        state = self._keys[key] = _KeyState(rate, self.rate_limit_burst, now)
+        return state
+
+    def _summarize(self, now: float) -> None:
+        self._next_summary = now + self.summary_interval_seconds
+        suppressed = self.suppressed()
+        for state in self._keys.values():
+            state.suppressed = 0
+        if not suppressed:
+            return
+        self._summarizing.active = True
+        try:
+            structlog.get_logger().info(
+                "Suppressed log lines",
+                suppressed=suppressed,
+                total=sum(suppressed.values()),
+                interval_seconds=self.summary_interval_seconds,
+            )
+        finally:
+            self._summarizing.active = False
+
+
+__all__ = ("LogSampler", "keeps_request")
@@ -3,6 +3,8 @@ from typing import AsyncIterator
 
 from fastapi import FastAPI
 
+from src.presentation.fastapi.metrics import MetricsMiddleware, metrics_endpoint
+from src.presentation.fastapi.timing import RequestTimingMiddleware
 from src.presentation.fastapi.v1.router import router as api_v1_router
 from ...di import handle_startup, handle_shutdown
 
@@ -20,6 +22,11 @@ def create_app() -> FastAPI:
     _app = FastAPI(title="DDD FastAPI Application", lifespan=lifespan)
     # Include API router
     _app.include_router(api_v1_router)
+    # Prometheus scrape endpoint and the request metrics it serves
+    _app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
+    _app.add_middleware(MetricsMiddleware)
+    # Outermost, so the request ID is set for everything else
+    _app.add_middleware(RequestTimingMiddleware)
 
     return _app
 
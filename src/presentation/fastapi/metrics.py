@@ -0,0 +1,85 @@
+import time
+from typing import Optional
+
+from kink import di
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.observability.metrics import CONTENT_TYPE, Gauge, Histogram, MetricsRegistry
+
+# Label of requests that matched no route, so unknown paths do not add series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Records each HTTP request's latency in ``http_request_duration_seconds``, per
+    method, route template and status, and the requests being served in
+    ``http_requests_in_flight``.
+
+    A plain ASGI middleware, so streamed responses are timed until their last chunk
+    is sent. The registry is looked up in the container on each request, the app is
+    built before the container is set up; requests pass through untouched while
+    metrics are disabled.
+    """
+
+    def __init__(self, app: ASGIApp, registry: Optional[MetricsRegistry] = None):
+        self.app = app
+        self._registry = registry
+        self._bound: Optional[MetricsRegistry] = None
+        self._duration: Optional[Histogram] = None
+        self._in_flight: Optional[Gauge] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        registry = self._registry
+        if registry is None and MetricsRegistry in di:
+            registry = di[MetricsRegistry]
+        if scope["type"] != "http" or registry is None:
+            await self.app(scope, receive, send)
+            return
+        if registry is not self._bound:
+            self._bind(registry)
+
+        started = time.perf_counter()
+        method = scope["method"]
+        in_flight = self._in_flight.labels(method)
+        in_flight.inc()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            # Set by the router once a route matched, its path is the template
+            route = scope.get("route")
+            self._duration.labels(
+                method,
+                getattr(route, "path", UNMATCHED_ROUTE),
+                str(status_code),
+            ).observe(time.perf_counter() - started)
+
+    def _bind(self, registry: MetricsRegistry) -> None:
+        self._duration = registry.histogram(
+            "http_request_duration_seconds",
+            "Time taken to serve HTTP requests",
+            ["method", "route", "status"],
+        )
+        self._in_flight = registry.gauge(
+            "http_requests_in_flight", "HTTP requests being served", ["method"]
+        )
+        self._bound = registry
+
+
+async def metrics_endpoint() -> Response:
+    if MetricsRegistry not in di:
+        return PlainTextResponse("Metrics are disabled", status_code=404)
+    return Response(await di[MetricsRegistry].render(), media_type=CONTENT_TYPE)
+
+
+__all__ = ("MetricsMiddleware", "metrics_endpoint")
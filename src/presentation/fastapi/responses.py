@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+
+class ModelResponse(JSONResponse):
+    """
+    JSON response rendered straight from a pydantic model.
+
+    FastAPI dumps a returned model to a dict and validates it again against the
+    route's ``response_model`` before encoding it. Routes whose DTOs are built from
+    data already validated at the storage boundary return this instead, which goes
+    through the model's compiled serializer only. ``response_model`` still documents
+    the schema.
+    """
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
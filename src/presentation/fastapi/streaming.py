@@ -0,0 +1,28 @@
+from typing import Any, AsyncIterator
+
+import pydantic_core
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def ndjson_stream(
+    rows: AsyncIterator[dict[str, Any]], flush_bytes: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Encode rows as newline-delimited JSON.
+
+    Lines are coalesced into chunks of roughly ``flush_bytes`` so a large listing
+    does not turn into one ASGI message per row.
+    """
+    buffer = bytearray()
+    async for row in rows:
+        buffer += pydantic_core.to_json(row, serialize_unknown=True)
+        buffer += b"\n"
+        if len(buffer) >= flush_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+__all__ = ("NDJSON_MEDIA_TYPE", "ndjson_stream")
@@ -0,0 +1,114 @@
+import re
+import time
+import uuid
+
+import structlog
+from asgi_correlation_id import correlation_id
+from kink import di
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import RequestTimingSettings, Settings
+from src.observability.request_timing import RequestTimings, request_timings
+from src.observability.sampling import keeps_request
+
+logger = structlog.get_logger()
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Request IDs sent by clients are kept when they look like one, e.g. a UUID
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,128}")
+
+
+class RequestTimingMiddleware:
+    """
+    Gives each HTTP request an ID and reports where its time went.
+
+    The ID comes from the ``X-Request-ID`` header or is generated, is set as the
+    correlation ID that log lines pick up and is echoed in the response. While the
+    request runs, database and task kick times are added up (see request_timing);
+    the response's ``Server-Timing`` header carries them as of when the response
+    starts, and one access log line per request the totals once it is sent. Access
+    log lines are sampled by request ID, except for server errors.
+
+    A plain ASGI middleware, as ``BaseHTTPMiddleware`` costs a task and a stream
+    per request. Settings are looked up in the container, the app is built before
+    it is set up.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._default_settings = RequestTimingSettings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        settings = di[Settings].request_timing if Settings in di else self._default_settings
+        started = time.perf_counter()
+        request_id = self._request_id(scope)
+        timings = RequestTimings()
+        id_token = correlation_id.set(request_id)
+        timings_token = request_timings.set(timings)
+        status_code = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(REQUEST_ID_HEADER, request_id)
+                if settings.server_timing:
+                    headers.append(
+                        "Server-Timing", timings.server_timing(time.perf_counter() - started)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            try:
+                self._log(scope, request_id, status_code, timings, started, settings)
+            finally:
+                request_timings.reset(timings_token)
+                correlation_id.reset(id_token)
+
+    @staticmethod
+    def _request_id(scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                if _VALID_REQUEST_ID.fullmatch(request_id):
+                    return request_id
+                break
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def _log(
+        scope: Scope,
+        request_id: str,
+        status_code: int,
+        timings: RequestTimings,
+        started: float,
+        settings: RequestTimingSettings,
+    ) -> None:
+        server_error = status_code >= 500
+        if not server_error and not keeps_request(request_id, settings.access_log_sample_rate):
+            return
+        route = scope.get("route")
+        (logger.warning if server_error else logger.info)(
+            "Request served",
+            method=scope["method"],
+            path=scope["path"],
+            route=getattr(route, "path", None),
+            status=status_code,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+            db_ms=round(timings.db_seconds * 1000, 2),
+            db_calls=timings.db_calls,
+            task_ms=round(timings.task_seconds * 1000, 2),
+            task_kicks=timings.task_kicks,
+        )
+
+
+__all__ = ("REQUEST_ID_HEADER", "RequestTimingMiddleware")
@@ -1,8 +1,9 @@
 from fastapi import APIRouter
-from . import users
+from . import tasks, users
 
 router = APIRouter()
 
 router.include_router(users.router, prefix="/v1/users", tags=["users"])
+router.include_router(tasks.router, prefix="/v1/tasks", tags=["tasks"])
 
 __all__ = ("router",)
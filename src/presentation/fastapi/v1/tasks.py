@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, Query
+from kink import di, inject
+
+from src.config import Settings
+from src.domain.background_task.repositories import TaskResultRepository
+from src.domain.background_task.value_objects import TaskResult
+from src.presentation.fastapi.responses import ModelResponse
+
+router = APIRouter()
+
+
+def get_task_results():
+    return di[TaskResultRepository]
+
+
+@router.get(
+    "/{task_id}",
+    response_model=TaskResult,
+    summary="Get a background task's result",
+    description="A task is `pending` until it ends, whether it is queued, running or "
+    "unknown. With `wait`, the request is held for up to that many seconds, capped by the "
+    "server, and answered as soon as the task ends, so a single request replaces a "
+    "polling loop.",
+)
+@inject
+async def get_task(
+    task_id: str,
+    wait: float = Query(0, ge=0),
+    results: TaskResultRepository = Depends(get_task_results),
+):
+    max_wait_seconds = di[Settings].taskiq.result_max_wait_seconds
+    result = await results.wait(task_id, min(wait, max_wait_seconds))
+    return ModelResponse(result or TaskResult(task_id=task_id))
@@ -1,12 +1,30 @@
+from datetime import datetime
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from kink import di, inject
 from starlette import status
 
-from src.application.dto.user_dto import UserReadDTO, UserCreateDTO
+from src.application.dto.user_dto import (
+    USER_BATCH_GET_MAX_SIZE,
+    USER_BATCH_MAX_SIZE,
+    USER_PAGE_DEFAULT_SIZE,
+    USER_PAGE_MAX_SIZE,
+    UserBatchCreateDTO,
+    UserBatchGetDTO,
+    UserBatchResultDTO,
+    UserCreateDTO,
+    UserListDTO,
+    UserReadDTO,
+)
 from src.application.services.user_service import UserService
 from src.domain.users.exceptions import UserAlreadyExistsError, UserNotFoundError
+from src.domain.users.value_objects import UserField, UserFilter
+from src.presentation.fastapi.responses import ModelResponse
+from src.presentation.fastapi.streaming import NDJSON_MEDIA_TYPE, ndjson_stream
+from src.utils.page_token import InvalidPageTokenError
 
 router = APIRouter()
 
@@ -26,11 +44,88 @@ async def register_user(
     data: UserCreateDTO, svc: UserService = Depends(get_user_service)
 ):
     try:
-        return await svc.register(data)
+        return ModelResponse(await svc.register(data), status_code=status.HTTP_201_CREATED)
     except UserAlreadyExistsError as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
 
+@router.post(
+    ":batch",
+    response_model=UserBatchResultDTO,
+    summary="Register several users",
+    description=f"Register up to {USER_BATCH_MAX_SIZE} users in one request. Each item "
+    "reports whether it was created, conflicted with an existing email, or failed.",
+)
+@inject
+async def register_users_batch(
+    data: UserBatchCreateDTO, svc: UserService = Depends(get_user_service)
+):
+    return ModelResponse(UserBatchResultDTO(results=await svc.register_many(data.users)))
+
+
+@router.get(
+    "/",
+    response_model=UserListDTO,
+    summary="List users",
+    description="Without `ids`, list users newest first. Pass the returned `next_page_token` "
+    "as `page_token` to fetch the next page; every page costs the same regardless of depth. "
+    "With `ids`, get those users with a single query, in the requested order, listing "
+    "unknown IDs in `missing_ids`.",
+)
+@inject
+async def list_users(
+    ids: Optional[list[UUID]] = Query(None, min_length=1, max_length=USER_BATCH_GET_MAX_SIZE),
+    page_size: int = Query(USER_PAGE_DEFAULT_SIZE, ge=1, le=USER_PAGE_MAX_SIZE),
+    page_token: Optional[str] = None,
+    svc: UserService = Depends(get_user_service),
+):
+    if ids:
+        return ModelResponse(await svc.get_users(ids))
+    try:
+        return ModelResponse(await svc.list_users(page_size, page_token=page_token))
+    except InvalidPageTokenError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post(
+    ":batchGet",
+    response_model=UserListDTO,
+    summary="Get several users by ID",
+    description="Same as `GET /v1/users?ids=...`, for ID lists too long for a query string.",
+)
+@inject
+async def get_users_batch(
+    data: UserBatchGetDTO, svc: UserService = Depends(get_user_service)
+):
+    return ModelResponse(await svc.get_users(data.ids))
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    summary="Stream users",
+    description="Stream every matching user as newline-delimited JSON. Users are read from "
+    "a database cursor `batch_size` at a time, so memory use does not grow with the result.",
+)
+@inject
+async def stream_users(
+    is_active: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    fields: Optional[list[UserField]] = Query(None),
+    batch_size: int = Query(500, ge=1, le=10_000),
+    svc: UserService = Depends(get_user_service),
+):
+    rows = svc.stream_users(
+        UserFilter(
+            is_active=is_active, created_after=created_after, created_before=created_before
+        ),
+        fields=fields,
+        batch_size=batch_size,
+    )
+    return StreamingResponse(ndjson_stream(rows), media_type=NDJSON_MEDIA_TYPE)
+
+
 @router.get(
     "/{user_id}",
     response_model=UserReadDTO,
@@ -43,7 +138,7 @@ async def get_user(
 ):
     """Get a user by ID."""
     try:
-        return await svc.get_user(user_id)
+        return ModelResponse(await svc.get_user(user_id))
     except UserNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
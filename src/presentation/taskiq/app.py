@@ -1,31 +1,69 @@
 import uuid
+from typing import Optional
 
 import structlog
 from taskiq import AsyncTaskiqDecoratedTask, AsyncBroker
 
-from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.domain.background_task.repositories import (
+    BackgroundTaskProcessor,
+    TaskDeduplicationStore,
+)
 from src.domain.background_task.value_objects import BackgroundTaskPayload
+from src.presentation.taskiq.idempotency import IDEMPOTENCY_KEY_ARGUMENT
 from src.presentation.taskiq.tasks.registry import TASK_REGISTRY
 
 logger = structlog.get_logger()
 
 
 class TaskiqProcessor(BackgroundTaskProcessor):
-    def __init__(self, broker: AsyncBroker):
+    def __init__(self, broker: AsyncBroker, dedup_store: Optional[TaskDeduplicationStore] = None):
         self.broker = broker
+        # Lets the tasks registered here skip runs that repeat an idempotency key
+        self.dedup_store = dedup_store
         self.registered_tasks: dict[str, AsyncTaskiqDecoratedTask] = {}
 
     async def register_tasks(self) -> None:
         logger.info("Registering tasks...")
-        for task_name, fn in TASK_REGISTRY.items():
-            self.registered_tasks[task_name] = self.broker.register_task(fn, task_name=task_name)
-            logger.info(f"Registered task '{task_name}'")
+        for task_name, definition in TASK_REGISTRY.items():
+            # Worker brokers come with their tasks registered, see create_worker_broker
+            task = self.broker.local_task_registry.get(task_name)
+            if task is None:
+                task = definition.register(self.broker, task_name, self.dedup_store)
+            self.registered_tasks[task_name] = task
+            logger.info("Registered task", task_name=task_name)
 
-    async def execute_task(self, task_name: str, payload: BackgroundTaskPayload) -> str:
+    async def execute_task(
+        self,
+        task_name: str,
+        payload: BackgroundTaskPayload,
+        task_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        task = self._get_task(task_name)
+        return await self._kick(task, task_id or str(uuid.uuid4()), payload, idempotency_key)
+
+    def _get_task(self, task_name: str) -> AsyncTaskiqDecoratedTask:
         # Fetch task from registry
         task = self.registered_tasks.get(task_name)
         if not task:
             raise ValueError(f"Task '{task_name}' is not registered.")
+        return task
 
-        task = await task.kicker().with_labels(task_id=str(uuid.uuid4())).kiq(payload=payload)
-        return task.task_id
+    async def _kick(
+        self,
+        task: AsyncTaskiqDecoratedTask,
+        task_id: str,
+        payload: BackgroundTaskPayload,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        kwargs = {}
+        # Only sent when deduplicating, so workers that predate the key never see it
+        if idempotency_key is not None and self.dedup_store is not None:
+            kwargs[IDEMPOTENCY_KEY_ARGUMENT] = idempotency_key
+        kicked = await (
+            task.kicker()
+            .with_task_id(task_id)
+            .with_labels(task_id=task_id)
+            .kiq(payload=payload, **kwargs)
+        )
+        return kicked.task_id
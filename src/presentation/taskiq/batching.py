@@ -0,0 +1,186 @@
+import asyncio
+import time
+import uuid
+from typing import Optional
+
+import structlog
+from taskiq import AsyncBroker, AsyncTaskiqDecoratedTask
+
+from src.domain.background_task.repositories import TaskDeduplicationStore
+from src.domain.background_task.value_objects import BackgroundTaskPayload
+from src.infrastructure.idempotency.processor import kick_key
+from src.presentation.taskiq.app import TaskiqProcessor
+
+logger = structlog.get_logger()
+
+_Kick = tuple[AsyncTaskiqDecoratedTask, str, BackgroundTaskPayload, Optional[str]]
+
+
+class BatchingTaskiqProcessor(TaskiqProcessor):
+    """
+    Buffers kicks and publishes them in batches.
+
+    ``execute_task`` returns the task ID as soon as the kick is buffered. A single
+    flusher publishes up to ``batch_size`` kicks at once, as soon as a batch is full
+    or ``linger_ms`` after its first kick. The publishes of a batch are pipelined
+    rather than awaited one by one. The buffer holds at most ``buffer_size`` kicks;
+    when it is full, callers wait for room instead of growing memory.
+
+    Kicks are fire-and-forget: a publish that fails after the caller got its task
+    ID is logged and counted, not retried. Use the outbox when that matters. The
+    kick's idempotency key is released in ``dedup_store`` though, so a retry of the
+    kick is not dropped as a duplicate of the one that was lost.
+
+    ``close`` waits up to ``drain_timeout_seconds`` for the flusher to publish what
+    is buffered. Kicks left behind by a flusher that died are published inline;
+    those still buffered when the timeout expires are logged and counted as failed.
+    """
+
+    def __init__(
+        self,
+        broker: AsyncBroker,
+        buffer_size: int = 10_000,
+        batch_size: int = 100,
+        linger_ms: float = 5.0,
+        dedup_store: Optional[TaskDeduplicationStore] = None,
+        drain_timeout_seconds: float = 10.0,
+    ):
+        if buffer_size < 1 or batch_size < 1:
+            raise ValueError("buffer_size and batch_size must be at least 1")
+
+        super().__init__(broker, dedup_store)
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.linger_ms = linger_ms
+        self.drain_timeout_seconds = drain_timeout_seconds
+        self._buffer: asyncio.Queue[_Kick] = asyncio.Queue(maxsize=buffer_size)
+        self._flusher: Optional[asyncio.Task] = None
+        self.published = 0
+        self.failed = 0
+        self.flushes = 0
+        self.flush_latency_ms_total = 0.0
+        self.flush_latency_ms_max = 0.0
+
+    @property
+    def buffer_depth(self) -> int:
+        return self._buffer.qsize()
+
+    async def execute_task(
+        self,
+        task_name: str,
+        payload: BackgroundTaskPayload,
+        task_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        task = self._get_task(task_name)
+        task_id = task_id or str(uuid.uuid4())
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+        await self._buffer.put((task, task_id, payload, idempotency_key))
+        return task_id
+
+    async def close(self) -> None:
+        if self._flusher is None:
+            return
+        flusher, self._flusher = self._flusher, None
+        if flusher.done():
+            # Nothing calls task_done() any more, publish what it left behind here
+            await self._flush_buffered()
+            return
+
+        # Let the flusher publish what is buffered, then stop it
+        try:
+            await asyncio.wait_for(self._buffer.join(), self.drain_timeout_seconds)
+        except asyncio.TimeoutError:
+            pass
+        flusher.cancel()
+        await asyncio.gather(flusher, return_exceptions=True)
+        dropped = self._drain()
+        for _ in dropped:
+            self._buffer.task_done()
+        if dropped:
+            self.failed += len(dropped)
+            logger.error("Dropped buffered tasks on shutdown", tasks=len(dropped))
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "buffer_depth": self.buffer_depth,
+            "buffer_size": self.buffer_size,
+            "published": self.published,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "flush_latency_ms_total": self.flush_latency_ms_total,
+            "flush_latency_ms_max": self.flush_latency_ms_max,
+        }
+
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._buffer.get()]
+            deadline = loop.time() + self.linger_ms / 1000
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._buffer.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._buffer.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush_buffered(self) -> None:
+        buffered = self._drain()
+        for start in range(0, len(buffered), self.batch_size):
+            await self._flush(buffered[start:start + self.batch_size])
+
+    def _drain(self) -> list[_Kick]:
+        kicks = []
+        while not self._buffer.empty():
+            kicks.append(self._buffer.get_nowait())
+        return kicks
+
+    async def _flush(self, batch: list[_Kick]) -> None:
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._kick(*kick) for kick in batch),
+            return_exceptions=True,
+        )
+        for (task, task_id, _, idempotency_key), result in zip(batch, results):
+            if isinstance(result, BaseException):
+                self.failed += 1
+                logger.error(
+                    "Failed to publish task",
+                    task_id=task_id,
+                    task_name=task.task_name,
+                    error=str(result),
+                )
+                await self._release(task.task_name, task_id, idempotency_key)
+            else:
+                self.published += 1
+            self._buffer.task_done()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.flushes += 1
+        self.flush_latency_ms_total += elapsed_ms
+        self.flush_latency_ms_max = max(self.flush_latency_ms_max, elapsed_ms)
+
+    async def _release(
+        self, task_name: str, task_id: str, idempotency_key: Optional[str]
+    ) -> None:
+        if idempotency_key is None or self.dedup_store is None:
+            return
+        try:
+            await self.dedup_store.release(kick_key(task_name, idempotency_key), task_id)
+        except Exception as e:
+            logger.error(
+                "Failed to release idempotency key",
+                task_id=task_id,
+                task_name=task_name,
+                idempotency_key=idempotency_key,
+                error=str(e),
+            )
@@ -0,0 +1,142 @@
+import asyncio
+import itertools
+from typing import Any, AsyncGenerator, Iterator, Optional, Sequence
+
+from aio_pika import DeliveryMode, Message
+from aio_pika.abc import AbstractChannel, AbstractIncomingMessage, AbstractQueue
+from taskiq import AckableMessage, BrokerMessage
+from taskiq_aio_pika import AioPikaBroker
+from taskiq_aio_pika.broker import parse_val
+
+
+class PooledAioPikaBroker(AioPikaBroker):
+    """
+    AioPikaBroker that publishes over a pool of channels and routes tasks to queues.
+
+    Every channel has publisher confirms enabled, so a kick completes once RabbitMQ
+    has accepted the message. Kicks are spread round-robin over ``publish_channels``
+    channels of the write connection, so concurrent publishes do not queue up behind
+    a single channel's confirms.
+
+    Tasks labelled with one of ``task_queues`` are published straight to that queue
+    through the default exchange, everything else goes to the stock queue as before.
+    Dedicated queues are declared with ``task_queue_max_priority`` priority levels,
+    so the "priority" label is honoured on them. Workers consume ``listen_queues``,
+    every queue by default, each with its own prefetch of ``qos``. Delayed kicks keep
+    going through the stock path and end up on the stock queue.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        publish_channels: int = 1,
+        task_queues: Sequence[str] = (),
+        listen_queues: Optional[Sequence[str]] = None,
+        task_queue_max_priority: int = 10,
+        **kwargs: Any,
+    ):
+        if publish_channels < 1:
+            raise ValueError("publish_channels must be at least 1")
+        super().__init__(*args, **kwargs)
+        self.publish_channels = publish_channels
+        self.task_queues = list(task_queues)
+        self.listen_queues = list(listen_queues) if listen_queues else None
+        self.task_queue_max_priority = task_queue_max_priority
+        unknown = set(self.listen_queues or ()) - {self._queue_name, *self.task_queues}
+        if unknown:
+            raise ValueError(f"Unknown queues to listen on: {', '.join(sorted(unknown))}")
+        self._channels: list[AbstractChannel] = []
+        self._next_channel: Optional[Iterator[AbstractChannel]] = None
+
+    async def startup(self) -> None:
+        await super().startup()
+        self._channels = [self.write_channel] + [
+            await self.write_conn.channel(publisher_confirms=True)
+            for _ in range(self.publish_channels - 1)
+        ]
+        self._next_channel = itertools.cycle(self._channels)
+
+    async def shutdown(self) -> None:
+        # The first channel is the stock write channel, closed by the base class
+        for channel in self._channels[1:]:
+            await channel.close()
+        self._channels, self._next_channel = [], None
+        await super().shutdown()
+
+    async def declare_queues(self, channel: AbstractChannel) -> AbstractQueue:
+        return (await self._declare_all_queues(channel))[self._queue_name]
+
+    async def kick(self, message: BrokerMessage) -> None:
+        if self._next_channel is None or message.labels.get("delay") is not None:
+            return await super().kick(message)
+
+        channel = next(self._next_channel)
+        rmq_message = Message(
+            body=message.message,
+            headers={
+                "task_id": message.task_id,
+                "task_name": message.task_name,
+                **message.labels,
+            },
+            delivery_mode=DeliveryMode.PERSISTENT,
+            priority=parse_val(int, message.labels.get("priority")),
+        )
+        queue = message.labels.get("queue")
+        if queue in self.task_queues:
+            await channel.default_exchange.publish(rmq_message, routing_key=queue)
+        else:
+            exchange = await channel.get_exchange(self._exchange_name, ensure=False)
+            await exchange.publish(rmq_message, routing_key=message.task_name)
+
+    async def listen(self) -> AsyncGenerator[AckableMessage, None]:
+        if self.read_channel is None:
+            raise ValueError("Call startup before starting listening.")
+        # Not global, every consumer below gets its own prefetch
+        await self.read_channel.set_qos(prefetch_count=self._qos)
+        queues = await self._declare_all_queues(self.read_channel)
+
+        received: asyncio.Queue[AckableMessage] = asyncio.Queue()
+
+        async def on_message(message: AbstractIncomingMessage) -> None:
+            await received.put(AckableMessage(data=message.body, ack=message.ack))
+
+        consumers = []
+        try:
+            for name in self.listen_queues or queues:
+                consumers.append((queues[name], await queues[name].consume(on_message)))
+            while True:
+                yield await received.get()
+        finally:
+            for queue, consumer_tag in consumers:
+                await queue.cancel(consumer_tag)
+
+    async def queue_depths(self) -> dict[str, int]:
+        """Messages waiting in each queue, as reported by RabbitMQ."""
+        if self.write_conn is None:
+            raise ValueError("Please run startup before reading queue depths.")
+        # A passive declare of a missing queue closes its channel, keep it off the write one
+        channel = await self.write_conn.channel()
+        try:
+            depths = {}
+            for name in (self._queue_name, *self.task_queues):
+                queue = await channel.declare_queue(name, passive=True)
+                depths[name] = queue.declaration_result.message_count
+            return depths
+        finally:
+            await channel.close()
+
+    async def _declare_all_queues(self, channel: AbstractChannel) -> dict[str, AbstractQueue]:
+        queues = {self._queue_name: await super().declare_queues(channel)}
+        for name in self.task_queues:
+            dead_letter = f"{name}.dead_letter"
+            await channel.declare_queue(dead_letter, **self._declare_queues_kwargs)
+            queues[name] = await channel.declare_queue(
+                name,
+                arguments={
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": dead_letter,
+                    "x-max-priority": self.task_queue_max_priority,
+                },
+                **self._declare_queues_kwargs,
+            )
+        return queues
@@ -0,0 +1,49 @@
+import functools
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+import structlog
+from taskiq.exceptions import NoResultError
+
+from src.domain.background_task.repositories import TaskDeduplicationStore
+
+logger = structlog.get_logger()
+
+# Keyword argument kicks pass their idempotency key through, only sent when set
+IDEMPOTENCY_KEY_ARGUMENT = "idempotency_key"
+
+
+def deduplicate_task(
+    fn: Callable[..., Awaitable[Any]],
+    task_name: str,
+    store: Optional[TaskDeduplicationStore],
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Wrap a task so that it runs at most once per idempotency key within the store's
+    window, whichever process picks it up.
+
+    The wrapper takes the key off the task's keyword arguments, so tasks never see
+    it; without a store the key is ignored. A run that fails gives its key back,
+    letting a redelivery run the task again. A skipped run raises NoResultError, so
+    no result is recorded for it over the result of the run that went through.
+    """
+
+    @functools.wraps(fn)
+    async def deduplicated(*args: Any, idempotency_key: Optional[str] = None, **kwargs: Any) -> Any:
+        if store is None or idempotency_key is None:
+            return await fn(*args, **kwargs)
+
+        key = f"run:{task_name}:{idempotency_key}"
+        run_id = str(uuid.uuid4())
+        if await store.claim(key, run_id) is not None:
+            logger.info(
+                "Skipped duplicate task run", task_name=task_name, idempotency_key=idempotency_key
+            )
+            raise NoResultError()
+        try:
+            return await fn(*args, **kwargs)
+        except Exception:
+            await store.release(key, run_id)
+            raise
+
+    return deduplicated
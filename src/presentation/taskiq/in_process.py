@@ -0,0 +1,168 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Callable, NamedTuple, Optional, get_type_hints
+
+import structlog
+from pydantic import TypeAdapter
+from taskiq import TaskiqResult
+from taskiq.abc.result_backend import AsyncResultBackend
+from taskiq.exceptions import NoResultError
+from taskiq_dependencies import DependencyGraph
+
+from src.domain.background_task.repositories import (
+    BackgroundTaskProcessor,
+    TaskDeduplicationStore,
+)
+from src.domain.background_task.value_objects import BackgroundTaskPayload
+from src.presentation.taskiq.tasks.registry import TASK_REGISTRY
+
+logger = structlog.get_logger()
+
+
+class _RegisteredTask(NamedTuple):
+    fn: Callable
+    dependencies: DependencyGraph
+    payload_adapter: Optional[TypeAdapter]
+
+
+class InProcessTaskProcessor(BackgroundTaskProcessor):
+    """
+    Runs the tasks from TASK_REGISTRY on asyncio workers in this process.
+
+    There is no broker hop: ``execute_task`` queues the task and ``concurrency``
+    workers run it. Dependencies declared with taskiq's ``Depends`` are resolved the
+    same way a Taskiq worker resolves them, and payloads are validated against the
+    task's annotation, and each task's concurrency and rate limits apply. Given a
+    ``dedup_store``, runs repeating an idempotency key are skipped as well, and given a
+    ``result_backend``, results are recorded there like a Taskiq worker would. Queues
+    and priorities do not apply, tasks run in the order they were queued. At most
+    ``queue_size`` tasks wait to run; once the queue is full, callers wait for room.
+
+    Tasks are lost if the process dies before they ran, which suits single-node
+    deployments, local development and tests.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 10,
+        queue_size: int = 1000,
+        dedup_store: Optional[TaskDeduplicationStore] = None,
+        result_backend: Optional[AsyncResultBackend] = None,
+    ):
+        if concurrency < 1 or queue_size < 1:
+            raise ValueError("concurrency and queue_size must be at least 1")
+
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.dedup_store = dedup_store
+        self.result_backend = result_backend
+        self.registered_tasks: dict[str, _RegisteredTask] = {}
+        self._queue: asyncio.Queue[
+            tuple[str, str, BackgroundTaskPayload, Optional[str]]
+        ] = asyncio.Queue(maxsize=queue_size)
+        self._workers: list[asyncio.Task] = []
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+
+    async def register_tasks(self) -> None:
+        logger.info("Registering tasks...")
+        for task_name, definition in TASK_REGISTRY.items():
+            fn = definition.wrap(task_name, self.dedup_store)
+            payload_type = get_type_hints(fn).get("payload")
+            self.registered_tasks[task_name] = _RegisteredTask(
+                fn=fn,
+                dependencies=DependencyGraph(fn),
+                payload_adapter=TypeAdapter(payload_type) if payload_type else None,
+            )
+            logger.info("Registered task", task_name=task_name)
+
+    async def execute_task(
+        self,
+        task_name: str,
+        payload: BackgroundTaskPayload,
+        task_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        if task_name not in self.registered_tasks:
+            raise ValueError(f"Task '{task_name}' is not registered.")
+
+        task_id = task_id or str(uuid.uuid4())
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work()) for _ in range(self.concurrency)
+            ]
+        await self._queue.put((task_name, task_id, payload, idempotency_key))
+        return task_id
+
+    async def close(self) -> None:
+        """Wait for queued and running tasks to finish, then stop the workers."""
+        if not self._workers:
+            return
+        await self._queue.join()
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        logger.info("In-process task workers stopped")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self.queue_size,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+        }
+
+    async def _work(self) -> None:
+        while True:
+            task_name, task_id, payload, idempotency_key = await self._queue.get()
+            started = time.perf_counter()
+            try:
+                return_value = await self._run(
+                    self.registered_tasks[task_name], payload, idempotency_key
+                )
+                self.succeeded += 1
+                await self._record(task_id, started, return_value=return_value)
+            except NoResultError:
+                # A duplicate run, the result of the first one stays
+                self.skipped += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error("Task failed", task_id=task_id, task_name=task_name, exc_info=e)
+                await self._record(task_id, started, error=e)
+            finally:
+                self._queue.task_done()
+
+    async def _record(
+        self,
+        task_id: str,
+        started: float,
+        return_value: Any = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        if self.result_backend is None:
+            return
+        result = TaskiqResult(
+            is_err=error is not None,
+            return_value=return_value,
+            execution_time=time.perf_counter() - started,
+            error=error,
+        )
+        try:
+            await self.result_backend.set_result(task_id, result)
+        except Exception as e:
+            logger.error("Failed to record task result", task_id=task_id, exc_info=e)
+
+    @staticmethod
+    async def _run(
+        task: _RegisteredTask, payload: BackgroundTaskPayload, idempotency_key: Optional[str]
+    ) -> Any:
+        if task.payload_adapter is not None:
+            # Payloads relayed from the outbox arrive as RawTaskPayload
+            payload = task.payload_adapter.validate_python(payload.model_dump())
+        async with task.dependencies.async_ctx({}) as ctx:
+            kwargs = await ctx.resolve_kwargs()
+            return await task.fn(payload=payload, idempotency_key=idempotency_key, **kwargs)
@@ -0,0 +1,74 @@
+import asyncio
+import functools
+import time
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Callable, Optional
+
+
+class TokenBucket:
+    """
+    Admits ``rate`` acquisitions per second on average, with bursts of up to ``burst``.
+    The default burst of 1 spaces acquisitions evenly.
+
+    Waiters are served in arrival order. Not thread-safe, one bucket per event loop.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1.0
+                self._updated_at = time.monotonic()
+            self._tokens -= 1
+
+
+def limit_task(
+    fn: Callable[..., Awaitable[Any]],
+    max_concurrency: Optional[int] = None,
+    rate_limit: Optional[float] = None,
+) -> Callable[..., Awaitable[Any]]:
+    """
+    Wrap a task so that at most ``max_concurrency`` calls run at once and at most
+    ``rate_limit`` calls start per second, within this process.
+
+    The limits are waited on inside the task, so a throttled call holds one of the
+    worker's ``max_async_tasks`` slots and its prefetched message meanwhile. Limited
+    tasks therefore get a dedicated queue, whose prefetch bounds how many of them
+    wait at once, and workers get a slot for every message they prefetch (see
+    TaskDefinition and min_worker_slots); a burst then cannot starve other tasks.
+
+    The wrapper keeps the task's signature, so Taskiq still resolves its arguments
+    and dependencies from it.
+    """
+    if max_concurrency is None and rate_limit is None:
+        return fn
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    slots = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+    bucket = TokenBucket(rate_limit) if rate_limit is not None else None
+
+    @functools.wraps(fn)
+    async def limited(*args: Any, **kwargs: Any) -> Any:
+        async with AsyncExitStack() as stack:
+            # Take the concurrency slot first, so tokens are not spent while waiting for it
+            if slots is not None:
+                await stack.enter_async_context(slots)
+            if bucket is not None:
+                await bucket.acquire()
+            return await fn(*args, **kwargs)
+
+    return limited
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+import structlog
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BatchHandler = Callable[[list[T]], Awaitable[list[R | Exception]]]
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Gathers items submitted by concurrently running tasks into batches.
+
+    A batch is handed to ``handler`` once it holds ``max_batch_size`` items, or
+    ``max_wait_ms`` after its first item arrived. The handler returns one result per
+    item, in order; an Exception in that list fails only the task that submitted the
+    matching item, while an exception raised by the handler itself fails the whole
+    batch.
+
+    Batches can only be as large as the number of tasks a worker runs at once, which
+    is bounded by the AMQP prefetch and ``max_async_tasks``.
+    """
+
+    def __init__(
+        self,
+        handler: BatchHandler[T, R],
+        max_batch_size: int = 50,
+        max_wait_ms: float = 20.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: T) -> R:
+        """Add ``item`` to the current batch and wait for its own result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return await future
+
+    def stats(self) -> dict[str, int]:
+        return {"batches": self.batches, "items": self.items, "pending": len(self._pending)}
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await self.handler([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch handler returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as e:
+            logger.error("Batch handler failed", batch_size=len(batch), exc_info=e)
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                # The submitting task was cancelled meanwhile
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,136 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Any, Optional
+
+import structlog
+from beanie.operators import In
+from taskiq import TaskiqResult
+from taskiq.abc.result_backend import AsyncResultBackend
+from taskiq.exceptions import ResultGetError
+
+from src.domain.background_task.repositories import TaskResultRepository
+from src.domain.background_task.value_objects import TaskResult, TaskState
+from src.infrastructure.mongodb.models.task_result import TaskResultDocument
+
+logger = structlog.get_logger()
+
+
+class MongoResultBackend(AsyncResultBackend[Any], TaskResultRepository):
+    """
+    Keeps task results in Mongo for ``ttl_seconds`` after the task ended.
+
+    ``wait`` parks callers on an in-process notifier rather than having each of them
+    poll: results recorded by this process wake their waiters right away, and results
+    recorded by other processes are picked up by a single loop that, while anyone is
+    waiting, looks up every awaited task with one query per ``poll_interval_seconds``.
+    """
+
+    def __init__(self, ttl_seconds: float = 86_400.0, poll_interval_seconds: float = 0.2):
+        if ttl_seconds <= 0 or poll_interval_seconds <= 0:
+            raise ValueError("ttl_seconds and poll_interval_seconds must be positive")
+
+        self.ttl_seconds = ttl_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._waiters: dict[str, set[asyncio.Future]] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self.polls = 0
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    async def shutdown(self) -> None:
+        if self._poller is None:
+            return
+        poller = self._poller
+        poller.cancel()
+        try:
+            await poller
+        except asyncio.CancelledError:
+            pass
+
+    async def set_result(self, task_id: str, result: TaskiqResult[Any]) -> None:
+        now = datetime.now(UTC)
+        document = TaskResultDocument(
+            id=task_id,
+            result=result.model_dump(mode="json"),
+            error=f"{type(result.error).__name__}: {result.error}" if result.error else None,
+            finished_at=now,
+            expires_at=now + timedelta(seconds=self.ttl_seconds),
+        )
+        # Replaces the result of an earlier delivery of the same task
+        await document.save()
+        self._notify(document)
+
+    async def is_result_ready(self, task_id: str) -> bool:
+        return await TaskResultDocument.find(TaskResultDocument.id == task_id).count() > 0
+
+    async def get_result(self, task_id: str, with_logs: bool = False) -> TaskiqResult[Any]:
+        document = await TaskResultDocument.get(task_id)
+        if document is None:
+            raise ResultGetError()
+        return TaskiqResult.model_validate(document.result)
+
+    async def get(self, task_id: str) -> Optional[TaskResult]:
+        document = await TaskResultDocument.get(task_id)
+        return self._to_task_result(document) if document is not None else None
+
+    async def wait(self, task_id: str, timeout_seconds: float) -> Optional[TaskResult]:
+        result = await self.get(task_id)
+        if result is not None or timeout_seconds <= 0:
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(task_id, set()).add(future)
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+        try:
+            return await asyncio.wait_for(future, timeout_seconds)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            waiters = self._waiters.get(task_id)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[task_id]
+
+    async def _poll(self) -> None:
+        try:
+            while self._waiters:
+                await asyncio.sleep(self.poll_interval_seconds)
+                if not self._waiters:
+                    break
+                self.polls += 1
+                try:
+                    documents = await TaskResultDocument.find(
+                        In(TaskResultDocument.id, list(self._waiters))
+                    ).to_list()
+                except Exception as e:
+                    logger.warning("Failed to look up awaited task results", error=str(e))
+                    continue
+                for document in documents:
+                    self._notify(document)
+        finally:
+            self._poller = None
+
+    def _notify(self, document: TaskResultDocument) -> None:
+        waiters = self._waiters.pop(document.id, ())
+        if not waiters:
+            return
+        result = self._to_task_result(document)
+        for future in waiters:
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _to_task_result(document: TaskResultDocument) -> TaskResult:
+        failed = document.result.get("is_err", False)
+        return TaskResult(
+            task_id=document.id,
+            state=TaskState.Failed if failed else TaskState.Succeeded,
+            return_value=document.result.get("return_value"),
+            error=document.error,
+            execution_time=document.result.get("execution_time"),
+            finished_at=document.finished_at,
+        )
@@ -0,0 +1,209 @@
+import struct
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar, Literal, Optional, get_type_hints
+
+import pydantic_core
+import structlog
+from pydantic import BaseModel
+from taskiq.abc.formatter import TaskiqFormatter
+from taskiq.message import BrokerMessage, TaskiqMessage
+from taskiq.serializers import JSONSerializer
+
+from src.domain.background_task.value_objects import BackgroundTaskPayload
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = structlog.get_logger()
+
+# Keyword argument every registered task receives its payload through
+PAYLOAD_ARGUMENT = "payload"
+
+
+class PayloadCodec(ABC):
+    """Turns the compact message layout into bytes and back."""
+
+    codec_id: ClassVar[int]
+
+    @abstractmethod
+    def dumps(self, value: list[Any]) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes) -> list[Any]:
+        pass
+
+
+class JSONArrayCodec(PayloadCodec):
+    """JSON arrays, encoded by pydantic-core so no extra dependency is needed."""
+
+    codec_id = 1
+
+    def dumps(self, value: list[Any]) -> bytes:
+        return pydantic_core.to_json(value)
+
+    def loads(self, data: bytes) -> list[Any]:
+        return pydantic_core.from_json(data)
+
+
+class MsgpackCodec(PayloadCodec):
+    """MessagePack, requires the ``msgpack`` package."""
+
+    codec_id = 2
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack is not installed")
+
+    def dumps(self, value: list[Any]) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> list[Any]:
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS: dict[str, type[PayloadCodec]] = {
+    "json": JSONArrayCodec,
+    "msgpack": MsgpackCodec,
+}
+
+
+def task_payload_types(registry: dict[str, Any]) -> dict[str, type[BackgroundTaskPayload]]:
+    """Map each registered task to the payload type its ``payload`` argument is annotated with."""
+    payload_types = {}
+    for task_name, definition in registry.items():
+        payload_type = get_type_hints(definition.fn).get(PAYLOAD_ARGUMENT)
+        if isinstance(payload_type, type) and issubclass(payload_type, BackgroundTaskPayload):
+            payload_types[task_name] = payload_type
+    return payload_types
+
+
+class CompactTaskFormatter(TaskiqFormatter):
+    """
+    Formats task messages without repeating the payload's field names.
+
+    A message starts with a fixed header, the magic ``TQ``, the layout version, the
+    codec and the payload's ``schema_version``, followed by the codec-encoded list
+    ``[task_id, task_name, labels, labels_types, values, args, kwargs]``. ``values``
+    are the payload's fields in declaration order; see BackgroundTaskPayload for how
+    they are matched up when producer and consumer run different schema versions.
+    Payloads are validated once here, the task receives the ready-made model.
+
+    Messages without the header are read as taskiq's default JSON, so workers can be
+    upgraded before the producers. Producers send the default JSON with
+    ``wire_format="json"``, the setting's default; switch them to ``"compact"`` as a
+    second step, once every worker understands the compact layout.
+    """
+
+    HEADER = struct.Struct("!2sBBH")
+    MAGIC = b"TQ"
+    LAYOUT_VERSION = 1
+
+    def __init__(
+        self,
+        payload_types: dict[str, type[BackgroundTaskPayload]],
+        codec: Optional[PayloadCodec] = None,
+        wire_format: Literal["compact", "json"] = "compact",
+    ):
+        self.payload_types = payload_types
+        self.codec = codec or JSONArrayCodec()
+        self.wire_format = wire_format
+        self._json = JSONSerializer()
+        self._codecs: dict[int, PayloadCodec] = {self.codec.codec_id: self.codec}
+
+    def dumps(self, message: TaskiqMessage) -> BrokerMessage:
+        if self.wire_format == "json":
+            data = self._json.dumpb(message.model_dump())
+        else:
+            data = self._dumps_compact(message)
+        return BrokerMessage(
+            task_id=message.task_id,
+            task_name=message.task_name,
+            message=data,
+            labels=message.labels,
+        )
+
+    def loads(self, message: bytes) -> TaskiqMessage:
+        if message[:2] != self.MAGIC:
+            return TaskiqMessage.model_validate(self._json.loadb(message))
+
+        _, layout_version, codec_id, schema_version = self.HEADER.unpack_from(message)
+        if layout_version != self.LAYOUT_VERSION:
+            raise ValueError(f"Unsupported task message layout {layout_version}")
+        task_id, task_name, labels, labels_types, values, args, kwargs = self._codec(
+            codec_id
+        ).loads(message[self.HEADER.size:])
+
+        if values is not None:
+            kwargs[PAYLOAD_ARGUMENT] = self._load_payload(task_name, values, schema_version)
+        return TaskiqMessage.model_construct(
+            task_id=task_id,
+            task_name=task_name,
+            labels=labels,
+            labels_types=labels_types,
+            args=args,
+            kwargs=kwargs,
+        )
+
+    def _dumps_compact(self, message: TaskiqMessage) -> bytes:
+        kwargs = dict(message.kwargs)
+        values, schema_version = None, 0
+        payload_type = self.payload_types.get(message.task_name)
+        payload = kwargs.get(PAYLOAD_ARGUMENT)
+        if payload_type is not None and isinstance(payload, BaseModel):
+            data = payload.model_dump(mode="json")
+            fields = list(payload_type.model_fields)
+            # Payloads relayed as raw data may miss fields, those keep their field names
+            if all(name in data for name in fields):
+                values = [data[name] for name in fields]
+                schema_version = payload_type.schema_version
+                del kwargs[PAYLOAD_ARGUMENT]
+        if values is None:
+            kwargs = pydantic_core.to_jsonable_python(kwargs)
+
+        body = self.codec.dumps([
+            message.task_id,
+            message.task_name,
+            message.labels,
+            message.labels_types,
+            values,
+            pydantic_core.to_jsonable_python(message.args),
+            kwargs,
+        ])
+        header = self.HEADER.pack(
+            self.MAGIC, self.LAYOUT_VERSION, self.codec.codec_id, schema_version
+        )
+        return header + body
+
+    def _load_payload(
+        self, task_name: str, values: list[Any], schema_version: int
+    ) -> BackgroundTaskPayload:
+        payload_type = self.payload_types.get(task_name)
+        if payload_type is None:
+            raise ValueError(f"No payload schema for task '{task_name}'")
+
+        fields = list(payload_type.model_fields)
+        if len(values) > len(fields):
+            # Sent by a newer producer, the appended fields are unknown here
+            logger.debug(
+                "Dropping unknown payload fields",
+                task_name=task_name,
+                schema_version=schema_version,
+                known_version=payload_type.schema_version,
+            )
+        data = dict(zip(fields, values))
+        if schema_version < payload_type.schema_version:
+            data = payload_type.upgrade(data, schema_version)
+        return payload_type.model_validate(data)
+
+    def _codec(self, codec_id: int) -> PayloadCodec:
+        codec = self._codecs.get(codec_id)
+        if codec is None:
+            # Written by a producer configured with another codec
+            factory = next((f for f in CODECS.values() if f.codec_id == codec_id), None)
+            if factory is None:
+                raise ValueError(f"Unknown task message codec {codec_id}")
+            codec = self._codecs[codec_id] = factory()
+        return codec
@@ -1,9 +1,89 @@
-from typing import Callable
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence
 
+from taskiq import AsyncBroker, AsyncTaskiqDecoratedTask
+
+from src.domain.background_task.repositories import TaskDeduplicationStore
+from src.presentation.taskiq.idempotency import deduplicate_task
+from src.presentation.taskiq.limits import limit_task
 from src.presentation.taskiq.tasks.user import send_welcome_email_task
 
-TASK_REGISTRY: dict[str, Callable] = {
-    "send_welcome_email": send_welcome_email_task
+# The broker's stock queue, shared by every task without a dedicated queue
+DEFAULT_QUEUE = "taskiq"
+# Dedicated queues are declared with this many priority levels
+MAX_PRIORITY = 10
+
+
+@dataclass(frozen=True)
+class TaskDefinition:
+    """A registered task, with where it is routed and how fast a worker may run it."""
+
+    fn: Callable
+    queue: str = DEFAULT_QUEUE
+    # 0 to MAX_PRIORITY, higher runs first; only honoured on dedicated queues
+    priority: int = 0
+    # Per worker process: runs of this task at once, and runs started per second
+    max_concurrency: Optional[int] = None
+    rate_limit: Optional[float] = None
+
+    def __post_init__(self):
+        if not 0 <= self.priority <= MAX_PRIORITY:
+            raise ValueError(f"priority must be between 0 and {MAX_PRIORITY}")
+        # Throttled runs hold worker slots, keep them to their own queue's prefetch
+        if self.queue == DEFAULT_QUEUE and (
+            self.max_concurrency is not None or self.rate_limit is not None
+        ):
+            raise ValueError("Tasks with limits must have a dedicated queue")
+
+    @property
+    def labels(self) -> dict[str, Any]:
+        """Labels attached to every kick, read by the broker to route the message."""
+        return {"queue": self.queue, "priority": self.priority}
+
+    def wrap(
+        self, task_name: str, dedup_store: Optional[TaskDeduplicationStore] = None
+    ) -> Callable:
+        """The task as workers run it: duplicates are skipped before limits apply."""
+        fn = limit_task(self.fn, self.max_concurrency, self.rate_limit)
+        return deduplicate_task(fn, task_name, dedup_store)
+
+    def register(
+        self,
+        broker: AsyncBroker,
+        task_name: str,
+        dedup_store: Optional[TaskDeduplicationStore] = None,
+    ) -> AsyncTaskiqDecoratedTask:
+        fn = self.wrap(task_name, dedup_store)
+        return broker.register_task(fn, task_name=task_name, **self.labels)
+
+
+TASK_REGISTRY: dict[str, TaskDefinition] = {
+    # Transactional, users are waiting for it; keep it away from bulk jobs
+    "send_welcome_email": TaskDefinition(
+        send_welcome_email_task, queue="transactional", priority=5
+    ),
 }
 
-__all__ = ("TASK_REGISTRY",)
+
+def task_queues() -> list[str]:
+    """Dedicated queues used by the registered tasks."""
+    return sorted({d.queue for d in TASK_REGISTRY.values()} - {DEFAULT_QUEUE})
+
+
+def min_worker_slots(prefetch: int, queues: Optional[Sequence[str]] = None) -> int:
+    """
+    Concurrent tasks a worker process needs so that every message it prefetched can
+    start, i.e. ``prefetch`` for each queue it consumes, all of them by default.
+    """
+    consumed = set(queues or [DEFAULT_QUEUE, *task_queues()])
+    return prefetch * len(consumed)
+
+
+__all__ = (
+    "DEFAULT_QUEUE",
+    "MAX_PRIORITY",
+    "TASK_REGISTRY",
+    "TaskDefinition",
+    "min_worker_slots",
+    "task_queues",
+)
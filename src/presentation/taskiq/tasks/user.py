@@ -4,12 +4,60 @@ from taskiq_dependencies import Depends
 
 from src.application.dto.user_dto import WelcomeEmailTaskPayload
 from src.application.services.user_service import UserService
+from src.domain.email.services import EmailSender
+from src.infrastructure.email.templates import EmailTemplateRenderer
+from src.presentation.taskiq.micro_batch import MicroBatcher
 
 logger = structlog.get_logger()
 
+
+class WelcomeEmailBatcher(MicroBatcher[WelcomeEmailTaskPayload, None]):
+    pass
+
+
+async def send_welcome_emails(
+    payloads: list[WelcomeEmailTaskPayload],
+    svc: UserService,
+    sender: EmailSender,
+    renderer: EmailTemplateRenderer,
+) -> list[None | Exception]:
+    """
+    Batch handler: resolves the recipients of every payload with a single query and
+    hands all the welcome emails to the sender at once.
+
+    Recipients with no user are skipped and logged rather than failing their payload,
+    whose other recipients have been emailed already and would be again on a retry.
+    """
+    recipients = [recipient for payload in payloads for recipient in payload.recipients]
+    users = {
+        user.email: user for user in await svc.get_users_by_email(list(dict.fromkeys(recipients)))
+    }
+    skipped = [recipient for recipient in dict.fromkeys(recipients) if recipient not in users]
+    if skipped:
+        logger.warning("Skipped welcome emails to unknown users", recipients=skipped)
+
+    messages = [renderer.render("welcome", email) for email in users]
+    delivered = dict(zip(users, await sender.send_many(messages)))
+
+    results: list[None | Exception] = []
+    for payload in payloads:
+        failures = [
+            delivered[recipient]
+            for recipient in payload.recipients
+            if recipient in users and delivered[recipient] is not None
+        ]
+        results.append(failures[0] if failures else None)
+    logger.info(
+        "Sent welcome emails",
+        messages=len(messages),
+        failed=sum(result is not None for result in delivered.values()),
+        skipped=len(skipped),
+    )
+    return results
+
+
 async def send_welcome_email_task(
         payload: WelcomeEmailTaskPayload,
-        svc: UserService = Depends(lambda: di[UserService])
+        batcher: WelcomeEmailBatcher = Depends(lambda: di[WelcomeEmailBatcher])
 ):
-    user = await svc.get_user_by_email(payload.recipients[0])
-    logger.info(f"Sending welcome email to {user.id}")
+    await batcher.submit(payload)
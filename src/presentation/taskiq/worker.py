@@ -0,0 +1,68 @@
+from kink import di
+from taskiq import AsyncBroker, TaskiqEvents, TaskiqState
+
+from src.config import Settings
+from src.di import close_created_services, configure_logging, setup_di_container
+from src.domain.background_task.repositories import (
+    BackgroundTaskProcessor,
+    TaskDeduplicationStore,
+)
+from src.infrastructure.mongodb.config import BeanieClient
+from src.observability.log_queue import QueuedLogWriter
+from src.presentation.taskiq.broker import PooledAioPikaBroker
+from src.presentation.taskiq.tasks.registry import MAX_PRIORITY, TASK_REGISTRY, task_queues
+
+WORKER_BROKER = "src.presentation.taskiq.worker:create_worker_broker"
+
+
+async def on_worker_startup(_: TaskiqState) -> None:
+    """Runs once in every worker process, before it starts consuming."""
+    configure_logging(di[Settings])
+
+    # Tasks resolve their services from the container, which needs Mongo
+    await di[BeanieClient].initialize()
+
+    # Tasks may kick other tasks; the broker's tasks are reused, not registered again
+    await di[BackgroundTaskProcessor].register_tasks()
+
+
+async def on_worker_shutdown(_: TaskiqState) -> None:
+    await di[BackgroundTaskProcessor].close()
+
+    await di[BeanieClient].close()
+
+    # Only what tasks used, creating the hasher now would calibrate it
+    await close_created_services()
+
+    if QueuedLogWriter in di:
+        di[QueuedLogWriter].close()
+
+    di.clear_cache()
+
+
+def create_worker_broker() -> AsyncBroker:
+    """
+    Broker factory for Taskiq worker processes.
+
+    Taskiq calls it once per worker process, so each process gets its own DI
+    container and Mongo pool, set up by the startup hook.
+    """
+    settings = Settings()
+    broker = PooledAioPikaBroker(
+        settings.taskiq.broker_url,
+        qos=settings.taskiq.worker_prefetch,
+        publish_channels=settings.taskiq.publish_channels,
+        task_queues=task_queues(),
+        listen_queues=settings.taskiq.worker_queues,
+        task_queue_max_priority=MAX_PRIORITY,
+    )
+    setup_di_container(settings, broker=broker)
+
+    # Applies each task's routing labels, per-process limits and duplicate run checks
+    dedup_store = di[TaskDeduplicationStore] if TaskDeduplicationStore in di else None
+    for task_name, definition in TASK_REGISTRY.items():
+        definition.register(broker, task_name, dedup_store)
+
+    broker.add_event_handler(TaskiqEvents.WORKER_STARTUP, on_worker_startup)
+    broker.add_event_handler(TaskiqEvents.WORKER_SHUTDOWN, on_worker_shutdown)
+    return broker
@@ -0,0 +1,31 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+
+class InvalidPageTokenError(ValueError):
+    """Raised when a continuation token cannot be decoded."""
+
+    def __init__(self):
+        super().__init__("Invalid page token")
+
+
+def encode_page_token(position: dict[str, Any]) -> str:
+    """Encode a keyset position as an opaque, URL-safe continuation token."""
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_page_token(token: str) -> dict[str, Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidPageTokenError()
+    if not isinstance(position, dict):
+        raise InvalidPageTokenError()
+    return position
+
+
+__all__ = ("InvalidPageTokenError", "encode_page_token", "decode_page_token")
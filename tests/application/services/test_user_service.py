@@ -4,18 +4,37 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 from kink import di
 
-from src.application.dto.user_dto import UserCreateDTO, WelcomeEmailTaskPayload
+from pymongo.errors import WriteError
+
+from src.application.dto.user_dto import BatchItemStatus, UserCreateDTO, WelcomeEmailTaskPayload
 from src.application.services.user_service import UserService
 from src.domain.background_task.repositories import BackgroundTaskProcessor
 from src.domain.users.entities import User
-from src.domain.users.exceptions import UserAlreadyExistsError, UserNotFoundError
+from src.domain.users.exceptions import (
+    InvalidCredentialsError,
+    UserAlreadyExistsError,
+    UserNotFoundError,
+)
 from src.domain.users.repositories import UserRepository
+from src.domain.users.services import PasswordHashingService
+from src.domain.users.value_objects import (
+    HashedPassword,
+    UserFilter,
+    UserPageCursor,
+    UserPublic,
+    UserSummary,
+)
+from src.utils.page_token import InvalidPageTokenError, encode_page_token
 
 # Constants for test data
 TEST_EMAIL = "test@example.com"
 TEST_PASSWORD = "password123"
 TEST_FIRST_NAME = "Test"
 TEST_LAST_NAME = "User"
+TEST_PASSWORD_HASH = b"hashed-password"
+TEST_HASHED_PASSWORD = HashedPassword(
+    value=TEST_PASSWORD_HASH, algorithm="bcrypt", params={"rounds": 12}
+)
 
 
 # Setup DI container with mocks for tests
@@ -28,20 +47,25 @@ def setup_di():
     # Create mock dependencies
     mock_user_repo = AsyncMock(spec=UserRepository)
     mock_task_processor = AsyncMock(spec=BackgroundTaskProcessor)
+    mock_password_hasher = AsyncMock(spec=PasswordHashingService)
+    mock_password_hasher.hash_password.return_value = TEST_HASHED_PASSWORD
 
     # Register mocks in DI container
     di[UserRepository] = mock_user_repo
     di[BackgroundTaskProcessor] = mock_task_processor
+    di[PasswordHashingService] = mock_password_hasher
 
     # Register the service using the mocks
     di[UserService] = lambda _di: UserService(
         user_repository=_di[UserRepository],
-        task_processor=_di[BackgroundTaskProcessor]
+        task_processor=_di[BackgroundTaskProcessor],
+        password_hasher=_di[PasswordHashingService],
     )
 
     yield {
         "user_repository": mock_user_repo,
         "task_processor": mock_task_processor,
+        "password_hasher": mock_password_hasher,
         "user_service": di[UserService]
     }
 
@@ -90,7 +114,6 @@ def create_mock_user():
         user.first_name = first_name
         user.last_name = last_name
         user.addresses = addresses or []
-        user.set_password = MagicMock()
         return user
 
     return _create
@@ -123,11 +146,17 @@ async def test_register_new_user_success(setup_di, create_user_dto, create_mock_
     assert result.last_name == TEST_LAST_NAME
 
     # Verify interactions
-    user_repo.get_by_email.assert_called_once_with(TEST_EMAIL)
+    user_repo.get_by_email.assert_called_once_with(TEST_EMAIL, projection=UserSummary)
+    mocks["password_hasher"].hash_password.assert_awaited_once_with(TEST_PASSWORD)
     user_repo.save.assert_called_once()
+    saved_entity = user_repo.save.call_args.args[0]
+    assert saved_entity.password_hash == TEST_PASSWORD_HASH
+    assert saved_entity.password_algorithm == "bcrypt"
+    assert saved_entity.password_params == {"rounds": 12}
     task_processor.execute_task.assert_called_once_with(
         task_name='send_welcome_email',
-        payload=WelcomeEmailTaskPayload(recipients=[mock_saved_user.email])
+        payload=WelcomeEmailTaskPayload(recipients=[mock_saved_user.email]),
+        idempotency_key=f"welcome_email:{mock_saved_user.id}",
     )
 
 
@@ -152,7 +181,7 @@ async def test_register_existing_user_raises_error(setup_di, create_user_dto, cr
         await user_service.register(user_dto)
 
     # Verify interactions
-    user_repo.get_by_email.assert_called_once_with("existing@example.com")
+    user_repo.get_by_email.assert_called_once_with("existing@example.com", projection=UserSummary)
     user_repo.save.assert_not_called()
     task_processor.execute_task.assert_not_called()
 
@@ -180,7 +209,7 @@ async def test_get_user_by_id_success(setup_di, create_mock_user):
     assert result.last_name == TEST_LAST_NAME
 
     # Verify interactions
-    user_repo.get_by_id.assert_called_once_with(user_id)
+    user_repo.get_by_id.assert_called_once_with(user_id, projection=UserPublic)
 
 
 @pytest.mark.asyncio
@@ -199,7 +228,7 @@ async def test_get_user_by_id_not_found(setup_di):
         await user_service.get_user(user_id)
 
     # Verify interactions
-    user_repo.get_by_id.assert_called_once_with(user_id)
+    user_repo.get_by_id.assert_called_once_with(user_id, projection=UserPublic)
 
 
 # Parametrized test for different name combinations
@@ -259,7 +288,7 @@ async def test_get_user_by_email_success(setup_di, create_mock_user):
     assert result.email == test_email
 
     # Verify interactions
-    user_repo.get_by_email.assert_called_once_with(test_email)
+    user_repo.get_by_email.assert_called_once_with(test_email, projection=UserSummary)
 
 
 @pytest.mark.asyncio
@@ -281,7 +310,7 @@ async def test_get_user_by_email_not_found(setup_di):
     assert test_email in str(exc_info.value)
 
     # Verify interactions
-    user_repo.get_by_email.assert_called_once_with(test_email)
+    user_repo.get_by_email.assert_called_once_with(test_email, projection=UserSummary)
 
 
 @pytest.mark.asyncio
@@ -309,7 +338,7 @@ async def test_get_user_by_email_with_different_emails(setup_di, create_mock_use
     assert result.email == email
     
     # Verify interactions
-    user_repo.get_by_email.assert_called_once_with(email)
+    user_repo.get_by_email.assert_called_once_with(email, projection=UserSummary)
 
 
 @pytest.mark.asyncio
@@ -341,4 +370,275 @@ async def test_get_user_by_email_minimal_fields(setup_di, create_mock_user):
     assert result.email == test_email
     
     # Verify interactions
-    user_repo.get_by_email.assert_called_once_with(test_email)
\ No newline at end of file
+    user_repo.get_by_email.assert_called_once_with(test_email, projection=UserSummary)
+
+
+# Test cases for authenticate method
+@pytest.fixture
+def stored_user():
+    """A persisted user whose hash was produced with an older cost policy."""
+    return User(
+        email=TEST_EMAIL,
+        first_name=TEST_FIRST_NAME,
+        last_name=TEST_LAST_NAME,
+        password_hash=b"old-hash",
+        password_algorithm="bcrypt",
+        password_params={"rounds": 10},
+    )
+
+
+@pytest.mark.asyncio
+async def test_authenticate_success(setup_di, stored_user):
+    """Test authenticating with valid credentials and a current hash."""
+    mocks = setup_di
+    user_repo = mocks["user_repository"]
+    password_hasher = mocks["password_hasher"]
+    user_repo.get_by_email.return_value = stored_user
+    password_hasher.verify_password.return_value = True
+    password_hasher.needs_rehash.return_value = False
+
+    result = await mocks["user_service"].authenticate(TEST_EMAIL, TEST_PASSWORD)
+
+    assert result.id == stored_user.id
+    password_hasher.verify_password.assert_awaited_once_with(TEST_PASSWORD, b"old-hash")
+    password_hasher.needs_rehash.assert_called_once_with("bcrypt", {"rounds": 10})
+    password_hasher.hash_password.assert_not_called()
+    user_repo.update_password.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_upgrades_stale_hash(setup_di, stored_user):
+    """Test that a successful login rehashes a password with a stale cost."""
+    mocks = setup_di
+    user_repo = mocks["user_repository"]
+    password_hasher = mocks["password_hasher"]
+    user_repo.get_by_email.return_value = stored_user
+    password_hasher.verify_password.return_value = True
+    password_hasher.needs_rehash.return_value = True
+
+    await mocks["user_service"].authenticate(TEST_EMAIL, TEST_PASSWORD)
+
+    password_hasher.hash_password.assert_awaited_once_with(TEST_PASSWORD)
+    user_repo.update_password.assert_awaited_once_with(stored_user)
+    assert stored_user.password_hash == TEST_PASSWORD_HASH
+    assert stored_user.password_params == {"rounds": 12}
+
+
+@pytest.mark.asyncio
+async def test_authenticate_wrong_password(setup_di, stored_user):
+    """Test that a wrong password is rejected without touching the stored hash."""
+    mocks = setup_di
+    user_repo = mocks["user_repository"]
+    password_hasher = mocks["password_hasher"]
+    user_repo.get_by_email.return_value = stored_user
+    password_hasher.verify_password.return_value = False
+
+    with pytest.raises(InvalidCredentialsError):
+        await mocks["user_service"].authenticate(TEST_EMAIL, "wrong_password")
+
+    password_hasher.needs_rehash.assert_not_called()
+    user_repo.update_password.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_unknown_email(setup_di):
+    """Test that an unknown email is rejected."""
+    mocks = setup_di
+    mocks["user_repository"].get_by_email.return_value = None
+
+    with pytest.raises(InvalidCredentialsError):
+        await mocks["user_service"].authenticate(TEST_EMAIL, TEST_PASSWORD)
+
+    mocks["password_hasher"].verify_password.assert_not_called()
+
+
+# Test cases for register_many method
+@pytest.mark.asyncio
+async def test_register_many(setup_di, create_user_dto):
+    """Test batch registration reports a per-item status."""
+    mocks = setup_di
+    user_repo = mocks["user_repository"]
+    task_processor = mocks["task_processor"]
+
+    user_dtos = [
+        create_user_dto(email="new@example.com"),
+        create_user_dto(email="existing@example.com"),
+        create_user_dto(email="new@example.com"),  # Duplicate within the batch
+        create_user_dto(email="race@example.com"),
+        create_user_dto(email="broken@example.com"),
+    ]
+    user_repo.get_many_by_email.return_value = [
+        User(email="existing@example.com", first_name="", last_name="")
+    ]
+    user_repo.save_many.side_effect = lambda users: [
+        users[0],
+        UserAlreadyExistsError(users[1].email),
+        WriteError("write failed", 2),
+    ]
+
+    results = await mocks["user_service"].register_many(user_dtos)
+
+    assert [result.status for result in results] == [
+        BatchItemStatus.Created,
+        BatchItemStatus.Conflict,
+        BatchItemStatus.Conflict,
+        BatchItemStatus.Conflict,
+        BatchItemStatus.Error,
+    ]
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert results[0].user.email == "new@example.com"
+    assert results[4].detail == "write failed"
+
+    # One lookup, one write and one task for the whole batch
+    user_repo.get_many_by_email.assert_awaited_once_with(
+        ["new@example.com", "existing@example.com", "race@example.com", "broken@example.com"],
+        projection=UserSummary,
+    )
+    user_repo.save_many.assert_awaited_once()
+    saved_users = user_repo.save_many.call_args.args[0]
+    assert [user.email for user in saved_users] == [
+        "new@example.com", "race@example.com", "broken@example.com"
+    ]
+    assert all(user.password_hash == TEST_PASSWORD_HASH for user in saved_users)
+    assert mocks["password_hasher"].hash_password.await_count == 3
+    task_processor.execute_task.assert_awaited_once()
+    kick = task_processor.execute_task.await_args.kwargs
+    assert kick["task_name"] == 'send_welcome_email'
+    assert kick["payload"] == WelcomeEmailTaskPayload(recipients=["new@example.com"])
+    # Derived from the created users, so a repeated kick for them is dropped
+    assert kick["idempotency_key"] == UserService._welcome_email_key(saved_users[:1])
+
+
+@pytest.mark.asyncio
+async def test_register_many_without_new_users(setup_di, create_user_dto):
+    """Test that no welcome emails are sent when nothing was created."""
+    mocks = setup_di
+    mocks["user_repository"].get_many_by_email.return_value = [
+        User(email=TEST_EMAIL, first_name="", last_name="")
+    ]
+    mocks["user_repository"].save_many.return_value = []
+
+    results = await mocks["user_service"].register_many([create_user_dto()])
+
+    assert results[0].status == BatchItemStatus.Conflict
+    mocks["task_processor"].execute_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_register_many_survives_task_failure(setup_di, create_user_dto):
+    """Test that created users are reported even if enqueueing the emails fails."""
+    mocks = setup_di
+    mocks["user_repository"].get_many_by_email.return_value = []
+    mocks["user_repository"].save_many.side_effect = lambda users: users
+    mocks["task_processor"].execute_task.side_effect = ConnectionError("broker down")
+
+    results = await mocks["user_service"].register_many([create_user_dto()])
+
+    assert results[0].status == BatchItemStatus.Created
+
+
+# Test cases for get_users method
+@pytest.mark.asyncio
+async def test_get_users_preserves_order_and_reports_missing(setup_di, create_mock_user):
+    """Test bulk retrieval keeps the requested order and lists unknown IDs."""
+    mocks = setup_di
+    user_repo = mocks["user_repository"]
+    first, second = create_mock_user(), create_mock_user()
+    missing_id = uuid.uuid4()
+    user_repo.get_many_by_ids.return_value = [first, second]
+
+    result = await mocks["user_service"].get_users([second.id, missing_id, first.id, second.id])
+
+    assert [user.id for user in result.users] == [second.id, first.id]
+    assert result.missing_ids == [missing_id]
+    user_repo.get_many_by_ids.assert_awaited_once_with(
+        [second.id, missing_id, first.id], projection=UserPublic
+    )
+
+
+# Test cases for get_users_by_email method
+@pytest.mark.asyncio
+async def test_get_users_by_email_uses_one_query(setup_di, create_mock_user):
+    """Test that bulk email lookups cost a single summary query."""
+    mocks = setup_di
+    user_repo = mocks["user_repository"]
+    user = create_mock_user()
+    user_repo.get_many_by_email.return_value = [UserSummary(id=user.id, email=user.email)]
+
+    result = await mocks["user_service"].get_users_by_email([user.email, "missing@example.com"])
+
+    assert [(found.id, found.email) for found in result] == [(user.id, user.email)]
+    user_repo.get_many_by_email.assert_awaited_once_with(
+        [user.email, "missing@example.com"], projection=UserSummary
+    )
+    user_repo.get_many_by_email.reset_mock()
+    assert await mocks["user_service"].get_users_by_email([]) == []
+    user_repo.get_many_by_email.assert_not_awaited()
+
+
+# Test cases for stream_users method
+def test_stream_users_delegates_to_repository(setup_di):
+    """Test that streaming is handed straight to the repository cursor."""
+    mocks = setup_di
+    user_repo = mocks["user_repository"]
+    user_filter = UserFilter(is_active=True)
+
+    result = mocks["user_service"].stream_users(user_filter, fields=["id"], batch_size=10)
+
+    assert result is user_repo.stream.return_value
+    user_repo.stream.assert_called_once_with(user_filter, fields=["id"], batch_size=10)
+
+
+# Test cases for resend_welcome_emails method
+def test_resend_welcome_emails_maps_over_the_user_stream(setup_di):
+    """Test that recipients are streamed and kicked a chunk per task."""
+    mocks = setup_di
+    user_repo = mocks["user_repository"]
+    task_processor = mocks["task_processor"]
+    user_filter = UserFilter(is_active=False)
+
+    job = mocks["user_service"].resend_welcome_emails(user_filter, chunk_size=100)
+
+    assert job is task_processor.map.return_value
+    user_repo.stream.assert_called_once_with(user_filter, fields=["email"], batch_size=100)
+    task_name, items, to_payload = task_processor.map.call_args.args
+    assert task_name == 'send_welcome_email'
+    assert items is user_repo.stream.return_value
+    assert to_payload([{"email": TEST_EMAIL}]) == WelcomeEmailTaskPayload(recipients=[TEST_EMAIL])
+    assert task_processor.map.call_args.kwargs == {"chunk_size": 100, "max_in_flight": 4}
+
+
+# Test cases for list_users method
+@pytest.mark.asyncio
+async def test_list_users_round_trips_page_token(setup_di, create_mock_user):
+    """Test that the next page token encodes the repository cursor."""
+    mocks = setup_di
+    user_repo = mocks["user_repository"]
+    cursor = UserPageCursor(created_at="2025-01-01T00:00:00Z", id=uuid.uuid4())
+    user_repo.list_page.return_value = ([create_mock_user()], cursor)
+
+    first_page = await mocks["user_service"].list_users(1)
+    await mocks["user_service"].list_users(1, page_token=first_page.next_page_token)
+
+    assert len(first_page.users) == 1
+    assert user_repo.list_page.await_args_list[0].kwargs == {"after": None, "projection": UserPublic}
+    assert user_repo.list_page.await_args_list[1].kwargs == {"after": cursor, "projection": UserPublic}
+
+
+@pytest.mark.asyncio
+async def test_list_users_last_page(setup_di):
+    """Test that the last page has no continuation token."""
+    mocks = setup_di
+    mocks["user_repository"].list_page.return_value = ([], None)
+
+    result = await mocks["user_service"].list_users(10)
+
+    assert result.next_page_token is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_token", ["not base64!", encode_page_token({"id": "x"})])
+async def test_list_users_invalid_page_token(setup_di, page_token):
+    """Test that tokens not issued by list_users are rejected."""
+    with pytest.raises(InvalidPageTokenError):
+        await setup_di["user_service"].list_users(10, page_token=page_token)
@@ -0,0 +1,131 @@
+"""
+Keyset vs offset pagination over UserDocument.
+
+    python -m tests.benchmarks.bench_pagination --mongo-uri mongodb://localhost:27017
+
+Keyset pages (BeanieUserRepository.list_page) seek on the (created_at, _id) index,
+so a deep page costs the same as the first one. The offset baseline has to walk and
+discard every skipped entry. Against a real server the benchmark also reports the
+documents examined per query, taken from explain().
+
+Without --mongo-uri it runs on mongomock. mongomock has no indexes and scans every
+document for both strategies, so use it only to smoke-test the script.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, UTC
+from typing import Any, Awaitable, Callable, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DESCENDING
+
+from src.domain.users.value_objects import UserPageCursor
+from src.infrastructure.mongodb.config import BeanieClient
+from src.infrastructure.mongodb.models.user import UserDocument
+from src.infrastructure.mongodb.repositories.user import BeanieUserRepository
+
+DATABASE = "bench_pagination"
+SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+
+async def seed(total: int) -> list[UserPageCursor]:
+    """Insert ``total`` users and return their cursors in page order."""
+    started_at = datetime(2020, 1, 1, tzinfo=UTC)
+    documents = [
+        UserDocument(
+            id=uuid.uuid4(),
+            email=f"bench_{index}@example.com",
+            password_hash=None,
+            created_at=started_at + timedelta(milliseconds=index),
+        )
+        for index in range(total)
+    ]
+    for start in range(0, total, 5_000):
+        await UserDocument.insert_many(documents[start:start + 5_000], ordered=False)
+    documents.sort(key=lambda document: (document.created_at, document.id.bytes), reverse=True)
+    return [UserPageCursor(created_at=d.created_at, id=d.id) for d in documents]
+
+
+async def median_ms(fn: Callable[[], Awaitable[Any]], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def docs_examined(query: dict[str, Any], skip: int, limit: int) -> Optional[int]:
+    cursor = UserDocument.get_motor_collection().find(query).sort(SORT).skip(skip).limit(limit)
+    try:
+        plan = await cursor.explain()
+        return plan["executionStats"]["totalDocsExamined"]
+    except Exception:
+        # mongomock does not implement explain
+        return None
+
+
+def keyset_query(after: UserPageCursor) -> dict[str, Any]:
+    return {
+        "$or": [
+            {"created_at": {"$lt": after.created_at}},
+            {"created_at": after.created_at, "_id": {"$lt": after.id}},
+        ]
+    }
+
+
+async def run(users: int, page_size: int, repeat: int, mongo_uri: Optional[str]) -> None:
+    if mongo_uri:
+        client = AsyncIOMotorClient(mongo_uri, serverSelectionTimeoutMS=5000)
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+
+        client = AsyncMongoMockClient()
+    beanie_client = BeanieClient(mongo_uri=mongo_uri or "", mongo_database=DATABASE, client=client)
+    await beanie_client.initialize()
+    await UserDocument.get_motor_collection().delete_many({})
+
+    try:
+        cursors = await seed(users)
+        repository = BeanieUserRepository()
+        last_page = users // page_size - 1
+        pages = sorted({1, 10, 100, last_page} & set(range(1, last_page + 1)))
+
+        print(f"{users} users, page size {page_size}, median of {repeat} runs")
+        print(f"{'page':>8} {'offset ms':>10} {'keyset ms':>10} {'offset docs':>12} {'keyset docs':>12}")
+        for page in pages:
+            skip = page * page_size
+            after = cursors[skip - 1]
+
+            offset_ms = await median_ms(
+                lambda: UserDocument.find({}).sort(SORT).skip(skip).limit(page_size).to_list(),
+                repeat,
+            )
+            keyset_ms = await median_ms(lambda: repository.list_page(page_size, after=after), repeat)
+            offset_docs = await docs_examined({}, skip, page_size)
+            keyset_docs = await docs_examined(keyset_query(after), 0, page_size + 1)
+            print(
+                f"{page:>8} {offset_ms:>10.2f} {keyset_ms:>10.2f} "
+                f"{offset_docs if offset_docs is not None else '-':>12} "
+                f"{keyset_docs if keyset_docs is not None else '-':>12}"
+            )
+    finally:
+        await UserDocument.get_motor_collection().drop()
+        await beanie_client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mongo-uri", default=None)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.page_size, args.repeat, args.mongo_uri))
+
+
+if __name__ == "__main__":
+    main()
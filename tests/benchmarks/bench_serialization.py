@@ -0,0 +1,91 @@
+"""
+Bytes on the wire and encode/decode time of a task message, taskiq's default JSON
+against the compact formatter.
+
+    python -m tests.benchmarks.bench_serialization [--recipients 1] [--number 20000]
+
+"decode" includes validating the payload into its model, which the default JSON
+leaves to the worker's argument parsing, so that step is timed along with it. For
+welcome emails it is dominated by EmailStr validation, which both formats pay.
+The msgpack codec is skipped when the msgpack package is not installed.
+"""
+import argparse
+import timeit
+from typing import Callable
+
+from taskiq.compat import parse_obj_as
+from taskiq.formatters.proxy_formatter import ProxyFormatter
+from taskiq.message import TaskiqMessage
+from taskiq.serializers import JSONSerializer
+
+from src.application.dto.user_dto import WelcomeEmailTaskPayload
+from src.presentation.taskiq.serialization import (
+    CompactTaskFormatter,
+    JSONArrayCodec,
+    MsgpackCodec,
+    task_payload_types,
+)
+from src.presentation.taskiq.tasks.registry import TASK_REGISTRY
+
+
+class _DefaultBroker:
+    # ProxyFormatter only needs the broker for its serializer
+    serializer = JSONSerializer()
+
+
+def make_message(recipients: int) -> TaskiqMessage:
+    task_id = "0b8e0a4c-6f32-4b55-9c0e-0d3c8d8a2f6e"
+    return TaskiqMessage(
+        task_id=task_id,
+        task_name="send_welcome_email",
+        labels={"task_id": task_id},
+        args=[],
+        kwargs={
+            "payload": WelcomeEmailTaskPayload(
+                recipients=[f"user{index}@example.com" for index in range(recipients)]
+            )
+        },
+    )
+
+
+def default_decode(formatter: ProxyFormatter, data: bytes) -> WelcomeEmailTaskPayload:
+    message = formatter.loads(data)
+    return parse_obj_as(WelcomeEmailTaskPayload, message.kwargs["payload"])
+
+
+def run(recipients: int, number: int) -> None:
+    message = make_message(recipients)
+    default = ProxyFormatter(_DefaultBroker())
+    formatters: list[tuple[str, object, Callable[[bytes], object]]] = [
+        ("default json", default, lambda data: default_decode(default, data)),
+    ]
+    codecs = [("compact json", JSONArrayCodec())]
+    try:
+        codecs.append(("compact msgpack", MsgpackCodec()))
+    except ImportError:
+        print("msgpack is not installed, skipping the msgpack codec")
+    for name, codec in codecs:
+        formatter = CompactTaskFormatter(task_payload_types(TASK_REGISTRY), codec=codec)
+        formatters.append((name, formatter, formatter.loads))
+
+    print(f"{recipients} recipients, best of 5 x {number} messages")
+    print(f"{'format':>16} {'bytes':>7} {'encode us':>10} {'decode us':>10}")
+    for name, formatter, decode in formatters:
+        data = formatter.dumps(message).message
+        encode_us = min(
+            timeit.repeat(lambda: formatter.dumps(message), number=number, repeat=5)
+        ) / number * 1e6
+        decode_us = min(timeit.repeat(lambda: decode(data), number=number, repeat=5)) / number * 1e6
+        print(f"{name:>16} {len(data):>7} {encode_us:>10.2f} {decode_us:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipients", type=int, default=1)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+    run(args.recipients, args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Per-read CPU cost of each layer between a Mongo document and the HTTP response body.
+
+    python -m tests.benchmarks.bench_user_read [--addresses 3] [--number 20000]
+
+Every layer is timed twice: the validating construction the read path used to do,
+and the trusted construction it does now. "document" is the Beanie validation at the
+storage boundary, which is kept, so it has no trusted variant.
+"""
+import argparse
+import asyncio
+import timeit
+import uuid
+from datetime import datetime, UTC
+from typing import Callable
+
+from beanie import init_beanie
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import _prepare_response_content
+from fastapi.utils import create_model_field
+from mongomock_motor import AsyncMongoMockClient
+
+from src.application.dto.user_dto import UserReadDTO
+from src.application.services.user_service import UserService
+from src.domain.users.entities import User
+from src.infrastructure.mongodb.models.user import UserDocument
+from src.infrastructure.mongodb.repositories.user import BeanieUserRepository
+from src.presentation.fastapi.responses import ModelResponse
+
+
+def raw_document(addresses: int) -> dict:
+    return {
+        "_id": uuid.uuid4(),
+        "email": "bench.user@example.com",
+        "password_hash": b"$2b$12$" + b"x" * 53,
+        "password_algorithm": "bcrypt",
+        "password_params": {"rounds": 12},
+        "first_name": "Bench",
+        "last_name": "User",
+        "is_active": True,
+        "addresses": [
+            {
+                "type": "home",
+                "street": f"{index} Main St",
+                "city": "Springfield",
+                "state": "IL",
+                "zipcode": 62701,
+                "country": "US",
+            }
+            for index in range(addresses)
+        ],
+        "created_at": datetime.now(UTC),
+        "updated_at": datetime.now(UTC),
+    }
+
+
+def validated_entity(document: UserDocument) -> User:
+    return User(
+        id=document.id,
+        email=document.email,
+        first_name=document.first_name or "",
+        last_name=document.last_name or "",
+        addresses=document.addresses,
+        password_hash=document.password_hash,
+        password_algorithm=document.password_algorithm,
+        password_params=document.password_params,
+    )
+
+
+def validated_dto(user: User) -> UserReadDTO:
+    return UserReadDTO(
+        id=user.id,
+        email=user.email,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        addresses=user.addresses,
+    )
+
+
+def fastapi_response_body(field, dto: UserReadDTO) -> bytes:
+    # What FastAPI does with a returned model: dump, validate against response_model, encode
+    content = _prepare_response_content(dto, exclude_unset=False)
+    value, _ = field.validate(content, {}, loc=("response",))
+    return ModelResponse.__base__(jsonable_encoder(field.serialize(value, mode="json"))).body
+
+
+def run(addresses: int, number: int) -> None:
+    # Documents need an initialised collection even when they are never saved
+    asyncio.run(
+        init_beanie(database=AsyncMongoMockClient()["bench"], document_models=[UserDocument])
+    )
+    raw = raw_document(addresses)
+    document = UserDocument.model_validate(raw)
+    entity = BeanieUserRepository._document_to_entity(document)
+    dto = UserService._to_read_dto(entity)
+    field = create_model_field(name="Response_get_user", type_=UserReadDTO, mode="serialization")
+
+    layers: list[tuple[str, Callable[[], object], Callable[[], object] | None]] = [
+        ("document", lambda: UserDocument.model_validate(raw), None),
+        (
+            "entity",
+            lambda: validated_entity(document),
+            lambda: BeanieUserRepository._document_to_entity(document),
+        ),
+        ("dto", lambda: validated_dto(entity), lambda: UserService._to_read_dto(entity)),
+        (
+            "response",
+            lambda: fastapi_response_body(field, dto),
+            lambda: ModelResponse(dto).body,
+        ),
+    ]
+
+    print(f"{addresses} addresses, best of 5 x {number} reads, microseconds per read")
+    print(f"{'layer':>10} {'validated':>10} {'trusted':>10}")
+    total_validated = total_trusted = 0.0
+    for name, validated, trusted in layers:
+        validated_us = min(timeit.repeat(validated, number=number, repeat=5)) / number * 1e6
+        trusted_us = (
+            min(timeit.repeat(trusted, number=number, repeat=5)) / number * 1e6
+            if trusted
+            else validated_us
+        )
+        total_validated += validated_us
+        total_trusted += trusted_us
+        print(f"{name:>10} {validated_us:>10.2f} {trusted_us:>10.2f}")
+    print(f"{'total':>10} {total_validated:>10.2f} {total_trusted:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--addresses", type=int, default=3)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+    run(args.addresses, args.number)
+
+
+if __name__ == "__main__":
+    main()
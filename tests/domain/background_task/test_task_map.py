@@ -0,0 +1,127 @@
+import asyncio
+from typing import Optional
+
+import pytest
+
+from src.application.dto.user_dto import WelcomeEmailTaskPayload
+from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.domain.background_task.task_map import TaskMap, chunked
+from src.domain.background_task.value_objects import BackgroundTaskPayload
+
+
+class RecordingProcessor(BackgroundTaskProcessor):
+    def __init__(self, fail_chunks: tuple[int, ...] = ()):
+        self.kicks: list[tuple[str, BackgroundTaskPayload, str]] = []
+        self.fail_chunks = fail_chunks
+        self.in_flight = self.peak_in_flight = 0
+
+    async def register_tasks(self):
+        pass
+
+    async def execute_task(
+        self,
+        task_name: str,
+        payload: BackgroundTaskPayload,
+        task_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        if int(idempotency_key.rsplit(":", 1)[1]) in self.fail_chunks:
+            raise ConnectionError("broker down")
+        self.kicks.append((task_name, payload, idempotency_key))
+        return f"task-{len(self.kicks)}"
+
+
+def to_payload(emails: list[str]) -> WelcomeEmailTaskPayload:
+    return WelcomeEmailTaskPayload(recipients=emails)
+
+
+async def emails(count: int):
+    for i in range(count):
+        yield f"{i}@example.com"
+
+
+@pytest.mark.asyncio
+async def test_chunked_handles_sync_and_async_items():
+    assert [chunk async for chunk in chunked(range(5), 2)] == [[0, 1], [2, 3], [4]]
+    assert [chunk async for chunk in chunked(emails(2), 2)] == [
+        ["0@example.com", "1@example.com"]
+    ]
+    assert [chunk async for chunk in chunked([], 2)] == []
+
+
+@pytest.mark.asyncio
+async def test_map_kicks_one_task_per_chunk():
+    processor = RecordingProcessor()
+
+    job = processor.map(
+        "send_welcome_email",
+        emails(25),
+        to_payload,
+        chunk_size=10,
+        max_in_flight=2,
+        idempotency_key="resend",
+    )
+    progress = await job.wait()
+
+    assert [len(payload.recipients) for _, payload, _ in processor.kicks] == [10, 10, 5]
+    assert sorted(key for *_, key in processor.kicks) == ["resend:0", "resend:1", "resend:2"]
+    assert processor.peak_in_flight <= 2
+    assert len(job.task_ids) == 3
+    assert progress.done
+    assert (progress.chunks_enqueued, progress.items_enqueued) == (3, 25)
+
+
+@pytest.mark.asyncio
+async def test_failed_chunks_are_counted_and_the_job_carries_on():
+    processor = RecordingProcessor(fail_chunks=(1,))
+
+    job = processor.map("send_welcome_email", emails(5), to_payload, chunk_size=2)
+    progress = await job.wait()
+
+    assert (progress.chunks_enqueued, progress.items_enqueued) == (2, 3)
+    assert (progress.chunks_failed, progress.items_failed) == (1, 2)
+    # Chunks are keyed by the job ID unless given a key
+    assert processor.kicks[0][2] == f"{progress.job_id}:0"
+
+
+@pytest.mark.asyncio
+async def test_input_errors_stop_the_job():
+    async def broken():
+        yield "0@example.com"
+        raise RuntimeError("cursor lost")
+
+    processor = RecordingProcessor()
+    job = processor.map("send_welcome_email", broken(), to_payload, chunk_size=1)
+
+    with pytest.raises(RuntimeError):
+        await job.wait()
+    assert job.progress().done
+    assert job.progress().chunks_enqueued == 1
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_reading():
+    release = asyncio.Event()
+
+    async def slow():
+        yield "0@example.com"
+        await release.wait()
+        yield "1@example.com"
+
+    processor = RecordingProcessor()
+    job = processor.map("send_welcome_email", slow(), to_payload, chunk_size=1)
+    await asyncio.sleep(0.01)
+
+    await job.cancel()
+
+    assert job.progress().chunks_enqueued == 1
+    assert job.progress().done
+
+
+def test_sizes_must_be_positive():
+    with pytest.raises(ValueError):
+        TaskMap(RecordingProcessor(), "send_welcome_email", [], to_payload, chunk_size=0)
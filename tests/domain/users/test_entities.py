@@ -1,7 +1,7 @@
 import pytest
 from uuid import UUID
-from src.domain.users.entities import User, hash_password
-from src.domain.users.value_objects import UserAddress, AddressType
+from src.domain.users.entities import User
+from src.domain.users.value_objects import AddressType, HashedPassword, UserAddress
 
 
 @pytest.fixture
@@ -22,15 +22,6 @@ def test_user_creation(user):
     assert user.addresses == []
 
 
-def test_password_hashing(user):
-    password = "secure_password123"
-    user.set_password(password)
-    
-    assert user.password_hash is not None
-    assert user.check_password(password)
-    assert not user.check_password("wrong_password")
-
-
 def test_password_hash_none_when_not_set(user):
     assert user.password_hash is None
 
@@ -50,9 +41,12 @@ def test_add_address(user):
     assert user.addresses[0] == address
 
 
-def test_hash_password_function():
-    password = "test_password"
-    hashed = hash_password(password)
-    
-    assert isinstance(hashed, bytes)
-    assert hashed != password.encode('utf-8') 
\ No newline at end of file
+def test_set_password_hash(user):
+    user.set_password_hash(
+        HashedPassword(value=b"hash", algorithm="bcrypt", params={"rounds": 14})
+    )
+
+    assert user.password_hash == b"hash"
+    assert user.password_algorithm == "bcrypt"
+    assert user.password_params == {"rounds": 14}
+    assert "password_params" not in user.model_dump()
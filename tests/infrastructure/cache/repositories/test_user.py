@@ -0,0 +1,351 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.domain.users.entities import User
+from src.domain.users.repositories import UserRepository
+from src.domain.users.value_objects import (
+    AddressType,
+    UserAddress,
+    UserFilter,
+    UserPublic,
+    UserSummary,
+)
+from src.infrastructure.cache.local import LocalTTLCache
+from src.infrastructure.cache.repositories.user import CachingUserRepository
+from src.infrastructure.cache.shared import InMemorySharedCache
+
+TEST_EMAIL = "cached@example.com"
+ADDRESS = UserAddress(
+    type=AddressType.Home,
+    street="1 Main St",
+    city="Springfield",
+    state="IL",
+    zipcode=62701,
+    country="US",
+)
+
+
+@pytest.fixture
+def user_entity():
+    return User(
+        email=TEST_EMAIL,
+        first_name="John",
+        last_name="Doe",
+        password_hash=b"$2b$04$hash",
+        password_algorithm="bcrypt",
+        password_params={"rounds": 4},
+    )
+
+
+@pytest.fixture
+def inner_repository(user_entity):
+    repository = AsyncMock(spec=UserRepository)
+    repository.get_by_id.return_value = user_entity
+    repository.get_by_email.return_value = user_entity
+    repository.save.side_effect = lambda user: user
+    return repository
+
+
+@pytest.fixture
+def shared_cache():
+    return InMemorySharedCache()
+
+
+@pytest.fixture
+def repository(inner_repository, shared_cache):
+    return CachingUserRepository(
+        inner_repository,
+        local_cache=LocalTTLCache(max_size=100, ttl_seconds=60),
+        shared_cache=shared_cache,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_is_served_from_local_tier(repository, inner_repository, user_entity):
+    first = await repository.get_by_id(user_entity.id)
+    second = await repository.get_by_id(user_entity.id)
+
+    assert first == user_entity
+    assert second == user_entity
+    inner_repository.get_by_id.assert_awaited_once_with(user_entity.id, projection=None)
+    assert repository.stats()["hits"] == 1
+    assert repository.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_entities_are_copies(repository, user_entity):
+    first = await repository.get_by_email(TEST_EMAIL)
+    first.first_name = "Mutated"
+
+    second = await repository.get_by_email(TEST_EMAIL)
+
+    assert second.first_name == "John"
+
+
+@pytest.mark.asyncio
+async def test_cached_entities_do_not_share_lists(repository, user_entity):
+    first = await repository.get_by_email(TEST_EMAIL)
+    first.addresses.append(ADDRESS)
+    first.password_params["rounds"] = 12
+
+    second = await repository.get_by_email(TEST_EMAIL)
+
+    assert second.addresses == []
+    assert second.password_params == {"rounds": 4}
+
+
+@pytest.mark.asyncio
+async def test_cached_projections_are_shared(repository, inner_repository, user_entity):
+    inner_repository.get_by_id.return_value = UserPublic.model_validate(user_entity.model_dump())
+
+    first = await repository.get_by_id(user_entity.id, projection=UserPublic)
+    second = await repository.get_by_id(user_entity.id, projection=UserPublic)
+
+    # Projections are immutable, so the cached instance itself is handed out
+    assert second is first
+    with pytest.raises(AttributeError):
+        second.addresses.append(ADDRESS)
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_fills_local_tier(inner_repository, shared_cache, user_entity):
+    public = UserPublic.model_validate(user_entity.model_dump())
+    inner_repository.get_by_email.return_value = public
+    warm = CachingUserRepository(
+        inner_repository, local_cache=LocalTTLCache(max_size=10, ttl_seconds=60),
+        shared_cache=shared_cache,
+    )
+    cold = CachingUserRepository(
+        inner_repository, local_cache=LocalTTLCache(max_size=10, ttl_seconds=60),
+        shared_cache=shared_cache,
+    )
+    await warm.get_by_email(TEST_EMAIL, projection=UserPublic)
+
+    found = await cold.get_by_email(TEST_EMAIL, projection=UserPublic)
+    await cold.get_by_email(TEST_EMAIL, projection=UserPublic)
+
+    assert found == public
+    inner_repository.get_by_email.assert_awaited_once()
+    assert cold.stats()["shared_hits"] == 1
+    assert cold.stats()["hits"] == 1
+    assert cold.stats()["misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_entities_stay_out_of_shared_tier(
+    repository, inner_repository, shared_cache, user_entity
+):
+    await repository.get_by_email(TEST_EMAIL)
+    inner_repository.get_by_email.return_value = None
+    await repository.get_by_email("missing@example.com")
+
+    # Entities carry the password hash, only the in-process tier may hold them
+    assert shared_cache._entries == {}
+    assert await repository.get_by_email(TEST_EMAIL) == user_entity
+    assert inner_repository.get_by_email.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_cached(repository, inner_repository, shared_cache):
+    inner_repository.get_by_id.return_value = None
+    user_id = uuid.uuid4()
+
+    assert await repository.get_by_id(user_id, projection=UserSummary) is None
+    assert await repository.get_by_id(user_id, projection=UserSummary) is None
+
+    inner_repository.get_by_id.assert_awaited_once()
+    assert await shared_cache.get(f"user:id:{user_id}:UserSummary") is not None
+
+
+@pytest.mark.asyncio
+async def test_negative_entry_from_shared_tier(inner_repository, shared_cache):
+    inner_repository.get_by_email.return_value = None
+    for _ in range(2):
+        repository = CachingUserRepository(
+            inner_repository, local_cache=LocalTTLCache(max_size=10, ttl_seconds=60),
+            shared_cache=shared_cache,
+        )
+        found = await repository.get_by_email("missing@example.com", projection=UserSummary)
+        assert found is None
+
+    inner_repository.get_by_email.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_load_invalidated_in_flight_is_not_cached(
+    repository, inner_repository, shared_cache, user_entity
+):
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_get_by_email(email, projection=None):
+        loading.set()
+        await release.wait()
+        return None
+
+    inner_repository.get_by_email.side_effect = slow_get_by_email
+    load = asyncio.create_task(repository.get_by_email(TEST_EMAIL, projection=UserSummary))
+    await loading.wait()
+
+    # The user is created while the lookup that missed it is still running
+    await repository.save(user_entity)
+    release.set()
+    assert await load is None
+
+    inner_repository.get_by_email.side_effect = None
+    inner_repository.get_by_email.return_value = UserSummary(
+        id=user_entity.id, email=user_entity.email
+    )
+    assert await shared_cache.get(f"user:email:{TEST_EMAIL}:UserSummary") is None
+    assert await repository.get_by_email(TEST_EMAIL, projection=UserSummary) is not None
+
+
+@pytest.mark.asyncio
+async def test_shared_hit_invalidated_in_flight_is_not_cached(
+    repository, shared_cache, user_entity
+):
+    key = f"user:id:{user_entity.id}:UserSummary"
+    await shared_cache.set(key, b"\x00", 60)
+    get = shared_cache.get
+
+    async def get_then_invalidate(cache_key):
+        raw = await get(cache_key)
+        await repository.invalidate(user_entity)
+        return raw
+
+    shared_cache.get = get_then_invalidate
+    assert await repository.get_by_id(user_entity.id, projection=UserSummary) is None
+
+    assert len(repository.local_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_trigger_single_query(repository, inner_repository, user_entity):
+    async def slow_get_by_id(user_id, projection=None):
+        await asyncio.sleep(0.01)
+        return user_entity
+
+    inner_repository.get_by_id.side_effect = slow_get_by_id
+
+    results = await asyncio.gather(*(repository.get_by_id(user_entity.id) for _ in range(10)))
+
+    assert all(result == user_entity for result in results)
+    inner_repository.get_by_id.assert_awaited_once()
+    assert repository.stats()["coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_save_invalidates_both_tiers(repository, inner_repository, shared_cache, user_entity):
+    inner_repository.get_by_email.return_value = None
+    assert await repository.get_by_email(TEST_EMAIL) is None
+
+    await repository.save(user_entity)
+    inner_repository.get_by_email.return_value = user_entity
+
+    assert await repository.get_by_email(TEST_EMAIL) == user_entity
+    assert inner_repository.get_by_email.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_projections_are_cached_separately(
+    inner_repository, shared_cache, user_entity
+):
+    summary = UserSummary(id=user_entity.id, email=user_entity.email)
+    inner_repository.get_by_id.side_effect = lambda user_id, projection=None: (
+        summary if projection is UserSummary else user_entity
+    )
+    repository = CachingUserRepository(
+        inner_repository, local_cache=LocalTTLCache(max_size=10, ttl_seconds=60),
+        shared_cache=shared_cache,
+    )
+
+    assert await repository.get_by_id(user_entity.id, projection=UserSummary) == summary
+    assert await repository.get_by_id(user_entity.id) == user_entity
+    assert inner_repository.get_by_id.await_count == 2
+
+    # A cold process rebuilds the projection from the shared tier
+    cold = CachingUserRepository(
+        inner_repository, local_cache=LocalTTLCache(max_size=10, ttl_seconds=60),
+        shared_cache=shared_cache,
+    )
+    found = await cold.get_by_id(user_entity.id, projection=UserSummary)
+    assert isinstance(found, UserSummary)
+    assert found == summary
+    assert cold.stats()["shared_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_save_invalidates_projections(repository, shared_cache, user_entity):
+    await shared_cache.set(f"user:id:{user_entity.id}:UserPublic", b"{}", 60)
+    await shared_cache.set(f"user:email:{TEST_EMAIL}:UserSummary", b"{}", 60)
+
+    await repository.save(user_entity)
+
+    assert await shared_cache.get(f"user:id:{user_entity.id}:UserPublic") is None
+    assert await shared_cache.get(f"user:email:{TEST_EMAIL}:UserSummary") is None
+
+
+@pytest.mark.asyncio
+async def test_update_password_invalidates(repository, inner_repository, user_entity):
+    await repository.get_by_id(user_entity.id)
+
+    await repository.update_password(user_entity)
+    await repository.get_by_id(user_entity.id)
+
+    inner_repository.update_password.assert_awaited_once_with(user_entity)
+    assert inner_repository.get_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_evictions_are_counted(inner_repository):
+    repository = CachingUserRepository(
+        inner_repository, local_cache=LocalTTLCache(max_size=1, ttl_seconds=60)
+    )
+
+    await repository.get_by_id(uuid.uuid4())
+    await repository.get_by_id(uuid.uuid4())
+
+    assert repository.stats()["evictions"] == 1
+    assert repository.stats()["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_save_many_invalidates(repository, inner_repository, user_entity):
+    inner_repository.get_by_email.return_value = None
+    await repository.get_by_email(TEST_EMAIL)
+    inner_repository.save_many.side_effect = lambda users: users
+
+    await repository.save_many([user_entity])
+    inner_repository.get_by_email.return_value = user_entity
+
+    assert await repository.get_by_email(TEST_EMAIL) == user_entity
+
+
+@pytest.mark.asyncio
+async def test_get_many_by_email_passes_through(repository, inner_repository, user_entity):
+    inner_repository.get_many_by_email.return_value = [user_entity]
+
+    assert await repository.get_many_by_email([TEST_EMAIL]) == [user_entity]
+    inner_repository.get_many_by_email.assert_awaited_once_with([TEST_EMAIL], projection=None)
+
+
+@pytest.mark.asyncio
+async def test_get_many_by_ids_passes_through(repository, inner_repository, user_entity):
+    inner_repository.get_many_by_ids.return_value = [user_entity]
+
+    assert await repository.get_many_by_ids([user_entity.id]) == [user_entity]
+    inner_repository.get_many_by_ids.assert_awaited_once_with([user_entity.id], projection=None)
+
+
+def test_stream_passes_through(repository, inner_repository):
+    rows = object()
+    inner_repository.stream = lambda *args, **kwargs: (args, kwargs, rows)
+
+    args, kwargs, result = repository.stream(UserFilter(is_active=True), fields=["id"], batch_size=10)
+
+    assert result is rows
+    assert args == (UserFilter(is_active=True),)
+    assert kwargs == {"fields": ["id"], "batch_size": 10}
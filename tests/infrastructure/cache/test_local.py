@@ -0,0 +1,87 @@
+import pytest
+
+from src.infrastructure.cache.local import MISSING, LocalTTLCache
+from src.infrastructure.cache.shared import InMemorySharedCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_get_missing_key(clock):
+    cache = LocalTTLCache(max_size=2, ttl_seconds=10, clock=clock)
+
+    assert cache.get("absent") is MISSING
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LocalTTLCache(max_size=2, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=1)
+
+    clock.now = 5
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+
+    clock.now = 10
+    assert cache.get("a") is MISSING
+    assert cache.expirations == 2
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = LocalTTLCache(max_size=2, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_delete_and_clear(clock):
+    cache = LocalTTLCache(max_size=4, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    cache.delete("a", "missing")
+    assert cache.get("a") is MISSING
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalid_max_size():
+    with pytest.raises(ValueError):
+        LocalTTLCache(max_size=0, ttl_seconds=10)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_shared_cache(clock):
+    cache = InMemorySharedCache(clock=clock)
+    await cache.set("a", b"1", ttl_seconds=10)
+    await cache.set("b", b"2", ttl_seconds=10)
+
+    assert await cache.get("a") == b"1"
+    assert await cache.get("missing") is None
+
+    await cache.delete("a")
+    assert await cache.get("a") is None
+
+    clock.now = 10
+    assert await cache.get("b") is None
@@ -0,0 +1,130 @@
+import asyncio
+import ssl
+from dataclasses import dataclass, field
+from email import message_from_bytes, policy
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+
+@dataclass
+class LocalSMTPServer:
+    """
+    Minimal SMTP server standing in for a real relay in tests.
+
+    Recipients whose address starts with "reject" are refused at RCPT TO. With
+    ``tls_context`` set, STARTTLS is offered; without ``ehlo``, only HELO is known.
+    """
+
+    ehlo: bool = True
+    tls_context: ssl.SSLContext = None
+    encrypted_sessions: int = 0
+    messages: list = field(default_factory=list)
+    sessions: int = 0
+    commands: list = field(default_factory=list)
+    host: str = "127.0.0.1"
+    port: int = 0
+    server: asyncio.AbstractServer = None
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._handle, self.host, 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.sessions += 1
+        recipients = []
+        encrypted = False
+
+        def reply(line: str) -> None:
+            writer.write(line.encode() + b"\r\n")
+
+        reply("220 localhost ESMTP test server")
+        await writer.drain()
+        while line := await reader.readline():
+            command = line.decode().rstrip("\r\n")
+            verb = command.split(" ", 1)[0].split(":", 1)[0].upper()
+            self.commands.append(verb)
+            if verb == "EHLO" and self.ehlo:
+                extensions = ["AUTH PLAIN", "PIPELINING"]
+                if self.tls_context is not None and not encrypted:
+                    extensions.append("STARTTLS")
+                for extension in ["localhost", *extensions[:-1]]:
+                    reply(f"250-{extension}")
+                reply(f"250 {extensions[-1]}")
+            elif verb == "HELO":
+                reply("250 localhost")
+            elif verb == "STARTTLS" and self.tls_context is not None and not encrypted:
+                reply("220 Ready to start TLS")
+                await writer.drain()
+                await writer.start_tls(self.tls_context)
+                encrypted = True
+                self.encrypted_sessions += 1
+                continue
+            elif verb == "AUTH":
+                reply("235 Authenticated")
+            elif verb == "MAIL":
+                recipients = []
+                reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split("<", 1)[1].rstrip(">")
+                if address.startswith("reject"):
+                    reply("550 No such user")
+                else:
+                    recipients.append(address)
+                    reply("250 OK")
+            elif verb == "DATA":
+                if not recipients:
+                    reply("554 No valid recipients")
+                    continue
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                await writer.drain()
+                data = b""
+                while (chunk := await reader.readline()) != b".\r\n":
+                    data += chunk[1:] if chunk.startswith(b".") else chunk
+                self.messages.append(
+                    message_from_bytes(data.replace(b"\r\n", b"\n"), policy=policy.default)
+                )
+                reply("250 Queued")
+            elif verb == "RSET":
+                recipients = []
+                reply("250 OK")
+            elif verb == "QUIT":
+                reply("221 Bye")
+                await writer.drain()
+                break
+            else:
+                reply("502 Command not implemented")
+            await writer.drain()
+        writer.close()
+
+
+@pytest_asyncio.fixture
+async def smtp_server():
+    server = LocalSMTPServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+# A self-signed certificate for 127.0.0.1 and localhost, with its key
+CERTIFICATE = Path(__file__).parent / "certs" / "localhost.pem"
+
+
+@pytest_asyncio.fixture
+async def tls_smtp_server():
+    tls_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    tls_context.load_cert_chain(CERTIFICATE)
+    server = LocalSMTPServer(tls_context=tls_context)
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+def client_tls_context() -> ssl.SSLContext:
+    return ssl.create_default_context(cafile=str(CERTIFICATE))
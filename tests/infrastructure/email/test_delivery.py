@@ -0,0 +1,117 @@
+import asyncio
+from contextlib import asynccontextmanager
+from collections import defaultdict
+
+import pytest
+
+from src.domain.email.exceptions import EmailDeliveryError
+from src.domain.email.value_objects import EmailMessage
+from src.infrastructure.email.delivery import SMTPEmailSender
+from src.infrastructure.email.smtp import InsecureSMTPAuthError, SMTPConnectionPool
+
+
+def make_message(recipient: str) -> EmailMessage:
+    return EmailMessage(recipient=recipient, subject="Welcome", body="Hello\n")
+
+
+@pytest.mark.asyncio
+async def test_send_many_groups_by_domain(smtp_server):
+    pool = SMTPConnectionPool(smtp_server.host, smtp_server.port, sender="no-reply@example.com")
+    sender = SMTPEmailSender(pool, max_messages_per_session=2)
+    recipients = [
+        "a@one.example", "a@two.example", "b@one.example", "reject@one.example", "b@two.example",
+    ]
+
+    results = await sender.send_many([make_message(recipient) for recipient in recipients])
+    await sender.close()
+
+    assert [result is None for result in results] == [True, True, True, False, True]
+    assert isinstance(results[3], EmailDeliveryError)
+    assert sorted(message["To"] for message in smtp_server.messages) == sorted(
+        recipient for recipient in recipients if not recipient.startswith("reject")
+    )
+    stats = sender.stats()
+    assert stats["sent"] == 4
+    assert stats["failed"] == 1
+    assert stats["latency_seconds_max"] > 0
+    assert stats["latency_seconds_sum"] >= stats["latency_seconds_max"]
+    assert stats["connections_idle"] == 0
+
+
+@pytest.mark.asyncio
+async def test_session_failures_fail_their_messages(smtp_server):
+    await smtp_server.stop()
+    pool = SMTPConnectionPool(smtp_server.host, smtp_server.port, sender="no-reply@example.com")
+    sender = SMTPEmailSender(pool)
+
+    results = await sender.send_many([make_message("a@example.com"), make_message("b@example.com")])
+
+    assert all(isinstance(result, OSError) for result in results)
+    assert sender.stats()["failed"] == 2
+    await smtp_server.start()
+
+
+@pytest.mark.asyncio
+async def test_refused_sessions_fail_their_messages(smtp_server):
+    pool = SMTPConnectionPool(
+        smtp_server.host, smtp_server.port, sender="no-reply@example.com", username="user"
+    )
+    sender = SMTPEmailSender(pool)
+
+    results = await sender.send_many([make_message("a@example.com")])
+
+    assert isinstance(results[0], InsecureSMTPAuthError)
+    assert sender.stats()["failed"] == 1
+
+
+class RecordingConnection:
+    def __init__(self, active, peaks):
+        self.active = active
+        self.peaks = peaks
+
+    async def send_many(self, messages):
+        domain = messages[0].domain
+        self.active[domain] += 1
+        self.peaks[domain] = max(self.peaks[domain], self.active[domain])
+        await asyncio.sleep(0.01)
+        self.active[domain] -= 1
+        return [None] * len(messages)
+
+
+class RecordingPool:
+    opened = 0
+    idle = 0
+
+    def __init__(self):
+        self.active = defaultdict(int)
+        self.peaks = defaultdict(int)
+
+    @asynccontextmanager
+    async def connection(self):
+        yield RecordingConnection(self.active, self.peaks)
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_per_domain_concurrency_is_bounded():
+    pool = RecordingPool()
+    sender = SMTPEmailSender(pool, per_domain_concurrency=2, max_messages_per_session=1)
+    messages = [make_message(f"user{i}@busy.example") for i in range(6)]
+    messages.append(make_message("user@quiet.example"))
+
+    results = await sender.send_many(messages)
+
+    assert results == [None] * 7
+    assert pool.peaks == {"busy.example": 2, "quiet.example": 1}
+    # Domains nothing is sent to any more do not keep their slots
+    assert sender._domain_slots == {}
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"per_domain_concurrency": 0}, {"max_messages_per_session": 0}]
+)
+def test_limits_must_be_positive(kwargs):
+    with pytest.raises(ValueError):
+        SMTPEmailSender(RecordingPool(), **kwargs)
@@ -0,0 +1,213 @@
+import asyncio
+
+import aiosmtplib
+import pytest
+
+from src.domain.email.exceptions import EmailDeliveryError
+from src.domain.email.value_objects import EmailMessage
+from src.infrastructure.email.smtp import (
+    InsecureSMTPAuthError,
+    SMTPConnection,
+    SMTPConnectionPool,
+)
+
+SENDER = "no-reply@example.com"
+
+
+def make_message(recipient: str, body: str = "Hello there\n") -> EmailMessage:
+    return EmailMessage(recipient=recipient, subject="Welcome", body=body)
+
+
+def make_pool(server, **kwargs) -> SMTPConnectionPool:
+    return SMTPConnectionPool(server.host, server.port, sender=SENDER, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_send_many_reports_each_message(smtp_server):
+    connection = SMTPConnection(smtp_server.host, smtp_server.port, sender=SENDER)
+    await connection.connect()
+
+    results = await connection.send_many([
+        make_message("first@example.com"),
+        make_message("reject@example.com"),
+        make_message("second@example.com", body=".starts with a dot\n.\nend\n"),
+    ])
+    await connection.close()
+
+    assert results[0] is None
+    assert isinstance(results[1], EmailDeliveryError)
+    assert results[1].code == 550
+    assert not results[1].is_transient
+    assert results[2] is None
+
+    first, second = smtp_server.messages
+    assert first["To"] == "first@example.com"
+    assert first["From"] == SENDER
+    assert first["Subject"] == "Welcome"
+    assert first.get_content() == "Hello there\n"
+    # Dot-stuffed lines arrive unchanged
+    assert second.get_content() == ".starts with a dot\n.\nend\n"
+    assert smtp_server.commands.count("RSET") == 1
+
+
+@pytest.mark.asyncio
+async def test_send_many_without_messages(smtp_server):
+    connection = SMTPConnection(smtp_server.host, smtp_server.port, sender=SENDER)
+    await connection.connect()
+
+    assert await connection.send_many([]) == []
+    await connection.close()
+
+
+@pytest.mark.asyncio
+async def test_authenticates_after_start_tls(tls_smtp_server, client_tls_context):
+    connection = SMTPConnection(
+        tls_smtp_server.host,
+        tls_smtp_server.port,
+        sender=SENDER,
+        username="user",
+        password="secret",
+        tls_context=client_tls_context,
+    )
+    await connection.connect()
+    assert connection.is_encrypted
+    assert await connection.send_many([make_message("a@example.com")]) == [None]
+    await connection.close()
+
+    assert tls_smtp_server.commands[:3] == ["EHLO", "STARTTLS", "EHLO"]
+    assert "AUTH" in tls_smtp_server.commands
+    assert tls_smtp_server.encrypted_sessions == 1
+
+
+@pytest.mark.asyncio
+async def test_credentials_are_not_sent_in_cleartext(smtp_server):
+    connection = SMTPConnection(
+        smtp_server.host, smtp_server.port, sender=SENDER, username="user", password="secret"
+    )
+
+    with pytest.raises(InsecureSMTPAuthError):
+        await connection.connect()
+
+    assert "AUTH" not in smtp_server.commands
+    assert not connection.is_connected
+
+
+@pytest.mark.asyncio
+async def test_required_start_tls_must_be_offered(smtp_server):
+    connection = SMTPConnection(
+        smtp_server.host, smtp_server.port, sender=SENDER, start_tls=True
+    )
+
+    with pytest.raises(aiosmtplib.SMTPException):
+        await connection.connect()
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_helo(smtp_server):
+    smtp_server.ehlo = False
+    connection = SMTPConnection(smtp_server.host, smtp_server.port, sender=SENDER)
+    await connection.connect()
+
+    assert await connection.send_many([make_message("a@example.com")]) == [None]
+    await connection.close()
+    assert "HELO" in smtp_server.commands
+
+
+@pytest.mark.asyncio
+async def test_unexpected_greeting_raises():
+    async def refuse(reader, writer):
+        writer.write(b"554 Go away\r\n")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(refuse, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        with pytest.raises(aiosmtplib.SMTPConnectResponseError):
+            await SMTPConnectionPool("127.0.0.1", port, sender=SENDER)._open()
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_malformed_reply_raises():
+    async def garbage(reader, writer):
+        writer.write(b"hello\r\n")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(garbage, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        with pytest.raises(aiosmtplib.SMTPException):
+            await SMTPConnection("127.0.0.1", port, sender=SENDER).connect()
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_sessions(smtp_server):
+    pool = make_pool(smtp_server, size=2)
+
+    for recipient in ("a@example.com", "b@example.com"):
+        async with pool.connection() as connection:
+            await connection.send_many([make_message(recipient)])
+
+    assert smtp_server.sessions == 1
+    assert pool.opened == 1
+    assert pool.idle == 1
+    await pool.close()
+    assert pool.idle == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_discards_failed_sessions(smtp_server):
+    pool = make_pool(smtp_server)
+
+    with pytest.raises(ConnectionResetError):
+        async with pool.connection():
+            raise ConnectionResetError()
+    async with pool.connection():
+        pass
+
+    assert pool.opened == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_idle_sessions(smtp_server):
+    pool = make_pool(smtp_server, max_idle_seconds=0)
+
+    for _ in range(2):
+        async with pool.connection():
+            pass
+
+    assert pool.opened == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_bounds_open_sessions(smtp_server):
+    pool = make_pool(smtp_server, size=2)
+    active = peak = 0
+
+    async def use():
+        nonlocal active, peak
+        async with pool.connection():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(use() for _ in range(6)))
+
+    assert peak == 2
+    assert pool.opened == 2
+    await pool.close()
+
+
+def test_pool_size_must_be_positive():
+    with pytest.raises(ValueError):
+        SMTPConnectionPool("localhost", 25, sender=SENDER, size=0)
@@ -0,0 +1,23 @@
+import pytest
+
+from src.infrastructure.email.templates import EmailTemplateRenderer, compile_template
+
+
+def test_render_welcome_email():
+    renderer = EmailTemplateRenderer(service_name="starter")
+
+    message = renderer.render("welcome", "jane@example.com")
+
+    assert message.recipient == "jane@example.com"
+    assert message.subject == "Welcome to starter"
+    assert "Hi jane@example.com," in message.body
+    assert message.domain == "example.com"
+
+
+def test_templates_are_compiled_once():
+    assert compile_template("welcome") is compile_template("welcome")
+
+
+def test_unknown_template():
+    with pytest.raises(ValueError):
+        EmailTemplateRenderer().render("missing", "jane@example.com")
@@ -0,0 +1,76 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.application.dto.user_dto import WelcomeEmailTaskPayload
+from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.infrastructure.idempotency.processor import DeduplicatingTaskProcessor
+from src.infrastructure.idempotency.store import MongoTaskDeduplicationStore
+
+PAYLOAD = WelcomeEmailTaskPayload(recipients=["a@example.com"])
+
+
+@pytest.fixture
+def inner():
+    inner = AsyncMock(spec=BackgroundTaskProcessor)
+    inner.execute_task.side_effect = (
+        lambda task_name, payload, task_id=None, idempotency_key=None: task_id or "generated"
+    )
+    return inner
+
+
+@pytest.fixture
+def processor(inner):
+    return DeduplicatingTaskProcessor(inner, MongoTaskDeduplicationStore())
+
+
+@pytest.mark.asyncio
+async def test_repeated_kicks_are_dropped(processor, inner):
+    first = await processor.execute_task("send_welcome_email", PAYLOAD, idempotency_key="k")
+    second = await processor.execute_task("send_welcome_email", PAYLOAD, idempotency_key="k")
+
+    assert second == first
+    inner.execute_task.assert_awaited_once_with(
+        "send_welcome_email", PAYLOAD, task_id=first, idempotency_key="k"
+    )
+    assert processor.stats() == {"kicks": 2, "duplicates": 1, "duplicate_rate": 0.5}
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_to_the_task(processor, inner):
+    await processor.execute_task("send_welcome_email", PAYLOAD, idempotency_key="k")
+    await processor.execute_task("other", PAYLOAD, idempotency_key="k")
+
+    assert inner.execute_task.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_kicks_without_a_key_go_straight_through(processor, inner):
+    await processor.execute_task("send_welcome_email", PAYLOAD)
+    await processor.execute_task("send_welcome_email", PAYLOAD)
+
+    assert inner.execute_task.await_count == 2
+    assert processor.stats()["kicks"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_kick_can_be_retried(processor, inner):
+    inner.execute_task.side_effect = ConnectionError("broker down")
+    with pytest.raises(ConnectionError):
+        await processor.execute_task("send_welcome_email", PAYLOAD, idempotency_key="k")
+
+    inner.execute_task.side_effect = None
+    inner.execute_task.return_value = "task-id"
+    assert await processor.execute_task(
+        "send_welcome_email", PAYLOAD, idempotency_key="k"
+    ) == "task-id"
+    assert processor.stats()["duplicates"] == 0
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_is_delegated(processor, inner):
+    await processor.register_tasks()
+    await processor.close()
+
+    inner.register_tasks.assert_awaited_once()
+    inner.close.assert_awaited_once()
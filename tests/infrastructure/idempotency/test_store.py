@@ -0,0 +1,69 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.infrastructure.cache.local import LocalTTLCache
+from src.infrastructure.idempotency.store import MongoTaskDeduplicationStore
+from src.infrastructure.mongodb.models.idempotency import IdempotencyKeyDocument
+
+
+@pytest.mark.asyncio
+async def test_first_claim_wins():
+    store = MongoTaskDeduplicationStore(window_seconds=60)
+
+    assert await store.claim("key", "task-1") is None
+    assert await store.claim("key", "task-2") == "task-1"
+    assert await store.claim("other", "task-3") is None
+
+    document = await IdempotencyKeyDocument.get("key")
+    assert document.task_id == "task-1"
+    assert store.stats() == {
+        "claimed": 2,
+        "duplicates": 1,
+        "local_hits": 0,
+        "duplicate_rate": 1 / 3,
+        "local_hit_rate": 0.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrent_processes_agree_on_the_winner():
+    first = MongoTaskDeduplicationStore(local_cache=LocalTTLCache(max_size=10, ttl_seconds=60))
+    second = MongoTaskDeduplicationStore(local_cache=LocalTTLCache(max_size=10, ttl_seconds=60))
+
+    assert await first.claim("key", "task-1") is None
+    assert await second.claim("key", "task-2") == "task-1"
+    # Answered from the local cache the second time round
+    assert await second.claim("key", "task-3") == "task-1"
+    assert second.stats()["local_hits"] == 1
+    assert second.stats()["local_hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_expired_keys_are_taken_over():
+    store = MongoTaskDeduplicationStore(window_seconds=60)
+    # Not removed by the TTL monitor yet
+    await IdempotencyKeyDocument(
+        id="key", task_id="task-1", expires_at=datetime.now(UTC) - timedelta(seconds=1)
+    ).insert()
+
+    assert await store.claim("key", "task-2") is None
+    assert (await IdempotencyKeyDocument.get("key")).task_id == "task-2"
+
+
+@pytest.mark.asyncio
+async def test_release_frees_the_key():
+    store = MongoTaskDeduplicationStore(local_cache=LocalTTLCache(max_size=10, ttl_seconds=60))
+    await store.claim("key", "task-1")
+
+    # Only the owner can release a key
+    await store.release("key", "task-2")
+    assert await IdempotencyKeyDocument.get("key") is not None
+
+    await store.release("key", "task-1")
+    assert await store.claim("key", "task-3") is None
+
+
+def test_window_must_be_positive():
+    with pytest.raises(ValueError):
+        MongoTaskDeduplicationStore(window_seconds=0)
@@ -1,11 +1,15 @@
 import uuid
+from datetime import datetime, timedelta
 
 import pytest
 import pytest_asyncio
 from mongomock_motor import AsyncMongoMockClient
 
 from src.domain.users.entities import User
+from src.domain.users.exceptions import UserAlreadyExistsError
+from src.domain.users.value_objects import HashedPassword, UserFilter, UserPublic, UserSummary
 from src.infrastructure.mongodb.config import BeanieClient
+from src.infrastructure.mongodb.models.user import UserDocument
 from src.infrastructure.mongodb.repositories.user import BeanieUserRepository
 
 
@@ -33,7 +37,9 @@ def user_entity():
         first_name="John",
         last_name="Doe"
     )
-    user.set_password("secure_password123")
+    user.set_password_hash(
+        HashedPassword(value=b"hash", algorithm="bcrypt", params={"rounds": 12})
+    )
     return user
 
 
@@ -48,6 +54,8 @@ async def test_save_user(repository, user_entity):
     assert saved_user.first_name == user_entity.first_name
     assert saved_user.last_name == user_entity.last_name
     assert saved_user.password_hash == user_entity.password_hash
+    assert saved_user.password_algorithm == "bcrypt"
+    assert saved_user.password_params == user_entity.password_params
 
 
 @pytest.mark.asyncio
@@ -97,4 +105,237 @@ async def test_get_user_by_email_not_found(repository):
     found_user = await repository.get_by_email("nonexistent@example.com")
 
     # Assert
-    assert found_user is None 
\ No newline at end of file
+    assert found_user is None 
+
+
+@pytest.mark.asyncio
+async def test_update_password(repository, user_entity):
+    # Setup
+    await repository.save(user_entity)
+    user_entity.set_password_hash(
+        HashedPassword(value=b"new-hash", algorithm="bcrypt", params={"rounds": 14})
+    )
+
+    # Execute
+    await repository.update_password(user_entity)
+
+    # Assert
+    found_user = await repository.get_by_id(user_entity.id)
+    assert bytes(found_user.password_hash) == b"new-hash"
+    assert found_user.password_params == {"rounds": 14}
+
+
+def make_user(email: str) -> User:
+    return User(email=email, first_name="Batch", last_name="User", password_hash=b"hash")
+
+
+@pytest.mark.asyncio
+async def test_save_many(repository, user_entity):
+    # Setup
+    await repository.save(user_entity)
+    users = [
+        make_user(f"batch_{uuid.uuid4()}@example.com"),
+        make_user(user_entity.email),
+        make_user(f"batch_{uuid.uuid4()}@example.com"),
+    ]
+
+    # Execute
+    results = await repository.save_many(users)
+
+    # Assert
+    assert results[0].id == users[0].id
+    assert isinstance(results[1], UserAlreadyExistsError)
+    assert results[2].id == users[2].id
+    assert await repository.get_by_id(users[2].id) is not None
+
+
+@pytest.mark.asyncio
+async def test_save_many_empty(repository):
+    assert await repository.save_many([]) == []
+
+
+@pytest.mark.asyncio
+async def test_get_many_by_email(repository):
+    # Setup
+    users = [make_user(f"many_{uuid.uuid4()}@example.com") for _ in range(3)]
+    await repository.save_many(users)
+
+    # Execute
+    found_users = await repository.get_many_by_email(
+        [users[0].email, users[2].email, "nonexistent@example.com"]
+    )
+
+    # Assert
+    assert {user.id for user in found_users} == {users[0].id, users[2].id}
+    assert await repository.get_many_by_email([]) == []
+
+
+@pytest.mark.asyncio
+async def test_get_many_by_ids(repository):
+    # Setup
+    users = [make_user(f"ids_{uuid.uuid4()}@example.com") for _ in range(3)]
+    await repository.save_many(users)
+
+    # Execute
+    found_users = await repository.get_many_by_ids([users[1].id, uuid.uuid4(), users[2].id])
+
+    # Assert
+    assert {user.id for user in found_users} == {users[1].id, users[2].id}
+    assert await repository.get_many_by_ids([]) == []
+
+
+async def collect(rows):
+    return [row async for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_stream_filters_and_projects(repository):
+    # Setup
+    active = make_user(f"stream_{uuid.uuid4()}@example.com")
+    await repository.save(active)
+    inactive = UserDocument(
+        email=f"stream_{uuid.uuid4()}@example.com", password_hash=b"hash", is_active=False
+    )
+    await UserDocument.insert_one(inactive)
+
+    # Execute
+    active_rows = await collect(
+        repository.stream(UserFilter(is_active=True), fields=["id", "email"], batch_size=2)
+    )
+    inactive_rows = await collect(repository.stream(UserFilter(is_active=False)))
+
+    # Assert
+    assert {"id": active.id, "email": active.email} in active_rows
+    assert all(set(row) == {"id", "email"} for row in active_rows)
+    assert inactive.id not in {row["id"] for row in active_rows}
+    inactive_row = next(row for row in inactive_rows if row["id"] == inactive.id)
+    assert inactive_row["is_active"] is False
+    assert "password_hash" not in inactive_row
+
+
+@pytest.mark.asyncio
+async def test_stream_created_at_range(repository):
+    # Setup
+    user = make_user(f"range_{uuid.uuid4()}@example.com")
+    await repository.save(user)
+    document = await UserDocument.get(user.id)
+    created_at = document.created_at.replace(tzinfo=None)
+    second = timedelta(seconds=1)
+
+    # Execute
+    in_range = await collect(repository.stream(
+        UserFilter(created_after=created_at - second, created_before=created_at + second),
+        fields=["id"],
+    ))
+    before = await collect(repository.stream(UserFilter(created_before=created_at), fields=["id"]))
+
+    # Assert
+    assert {"id": user.id} in in_range
+    assert {"id": user.id} not in before
+
+
+@pytest.mark.asyncio
+async def test_stream_without_id(repository):
+    rows = await collect(repository.stream(UserFilter(), fields=["email"]))
+
+    assert rows
+    assert all(set(row) == {"email"} for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_password_fields(repository):
+    with pytest.raises(ValueError):
+        await collect(repository.stream(UserFilter(), fields=["email", "password_hash"]))
+
+
+@pytest.mark.asyncio
+async def test_list_page_walks_every_user_once(repository):
+    # Setup, users sharing a timestamp are ordered by id
+    created_at = datetime(2000, 1, 1)
+    documents = [
+        UserDocument(
+            email=f"page_{uuid.uuid4()}@example.com",
+            password_hash=None,
+            created_at=created_at + timedelta(seconds=index // 2),
+        )
+        for index in range(5)
+    ]
+    await UserDocument.insert_many(documents)
+
+    # Execute, walk pages until the seeded (oldest) users are exhausted
+    seen, after = [], None
+    while True:
+        users, after = await repository.list_page(2, after=after)
+        seen.extend(user.id for user in users)
+        assert len(users) <= 2
+        if after is None:
+            break
+
+    # Assert
+    seeded = [document.id for document in documents]
+    assert len(seen) == len(set(seen))
+    assert set(seeded) <= set(seen)
+    expected = [
+        document.id
+        for document in sorted(
+            documents, key=lambda document: (document.created_at, document.id.bytes), reverse=True
+        )
+    ]
+    assert [user_id for user_id in seen if user_id in set(seeded)] == expected
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_with_projection(repository, user_entity):
+    # Setup
+    await repository.save(user_entity)
+
+    # Execute
+    found = await repository.get_by_id(user_entity.id, projection=UserPublic)
+
+    # Assert, only the projected fields are loaded
+    assert isinstance(found, UserPublic)
+    assert found.model_dump() == {
+        "id": user_entity.id,
+        "email": user_entity.email,
+        "first_name": "John",
+        "last_name": "Doe",
+        "addresses": (),
+    }
+    assert not hasattr(found, "password_hash")
+    assert await repository.get_by_id(uuid.uuid4(), projection=UserPublic) is None
+
+
+@pytest.mark.asyncio
+async def test_get_by_email_with_projection(repository, user_entity):
+    await repository.save(user_entity)
+
+    found = await repository.get_by_email(user_entity.email, projection=UserSummary)
+
+    assert found == UserSummary(id=user_entity.id, email=user_entity.email)
+
+
+@pytest.mark.asyncio
+async def test_get_many_with_projection(repository):
+    users = [make_user(f"proj_{uuid.uuid4()}@example.com") for _ in range(2)]
+    await repository.save_many(users)
+
+    by_ids = await repository.get_many_by_ids([user.id for user in users], projection=UserSummary)
+    by_emails = await repository.get_many_by_email(
+        [user.email for user in users], projection=UserSummary
+    )
+
+    for found in (by_ids, by_emails):
+        assert all(isinstance(user, UserSummary) for user in found)
+        assert {user.id for user in found} == {user.id for user in users}
+
+
+@pytest.mark.asyncio
+async def test_list_page_with_projection(repository):
+    await repository.save_many([make_user(f"proj_page_{uuid.uuid4()}@example.com") for _ in range(3)])
+
+    users, after = await repository.list_page(2, projection=UserPublic)
+    next_users, _ = await repository.list_page(2, after=after, projection=UserPublic)
+
+    assert all(isinstance(user, UserPublic) for user in users + next_users)
+    assert after is not None
+    assert not {user.id for user in users} & {user.id for user in next_users}
@@ -0,0 +1,17 @@
+import pytest_asyncio
+from mongomock_motor import AsyncMongoMockClient
+
+from src.infrastructure.mongodb.config import BeanieClient
+from src.infrastructure.mongodb.models.outbox import OutboxMessageDocument
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def beanie_client():
+    beanie_client = BeanieClient(
+        mongo_uri="mongodb://localhost:27017",
+        mongo_database="test_outbox",
+        client=AsyncMongoMockClient(),
+    )
+    await beanie_client.initialize()
+    yield beanie_client
+    await OutboxMessageDocument.get_motor_collection().delete_many({})
@@ -0,0 +1,153 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.application.dto.user_dto import WelcomeEmailTaskPayload
+from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.infrastructure.mongodb.models.outbox import OutboxMessageDocument, OutboxStatus
+from src.infrastructure.outbox.processor import OutboxTaskProcessor
+from src.infrastructure.outbox.relay import OutboxRelay
+
+
+@pytest.fixture
+def publisher():
+    publisher = AsyncMock(spec=BackgroundTaskProcessor)
+    publisher.execute_task.side_effect = (
+        lambda task_name, payload, task_id=None, idempotency_key=None: task_id
+    )
+    return publisher
+
+
+@pytest.fixture
+def relay(publisher):
+    return OutboxRelay(publisher, batch_size=2, flush_interval_seconds=0.01)
+
+
+@pytest.mark.asyncio
+async def test_execute_task_only_writes_the_outbox(relay, publisher):
+    processor = OutboxTaskProcessor(relay)
+
+    task_id = await processor.execute_task(
+        "send_welcome_email", WelcomeEmailTaskPayload(recipients=["a@example.com"])
+    )
+
+    message = await OutboxMessageDocument.get(task_id)
+    assert message.task_name == "send_welcome_email"
+    assert message.payload == {"recipients": ["a@example.com"]}
+    publisher.execute_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_register_tasks_registers_the_publisher(relay, publisher):
+    await OutboxTaskProcessor(relay).register_tasks()
+
+    publisher.register_tasks.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_drain_publishes_in_batches_with_the_same_task_id(relay, publisher):
+    processor = OutboxTaskProcessor(relay)
+    task_ids = [
+        await processor.execute_task(
+            "send_welcome_email", WelcomeEmailTaskPayload(recipients=[f"{i}@example.com"])
+        )
+        for i in range(3)
+    ]
+
+    assert await relay.drain_batch() == 2
+    assert await relay.drain_batch() == 1
+    assert await relay.drain_batch() == 0
+
+    published = publisher.execute_task.await_args_list
+    assert sorted(call.kwargs["task_id"] for call in published) == sorted(task_ids)
+    assert published[0].args[0] == "send_welcome_email"
+    assert published[0].args[1].model_dump() == {"recipients": ["0@example.com"]}
+    assert await OutboxMessageDocument.count() == 0
+    assert relay.stats() == {"published": 3, "failed": 0, "dead": 0}
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_is_relayed(relay, publisher):
+    await OutboxTaskProcessor(relay).execute_task(
+        "send_welcome_email",
+        WelcomeEmailTaskPayload(recipients=[]),
+        idempotency_key="welcome_email:1",
+    )
+
+    await relay.drain_batch()
+
+    assert publisher.execute_task.await_args.kwargs["idempotency_key"] == "welcome_email:1"
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_is_retried_later(relay, publisher):
+    publisher.execute_task.side_effect = ConnectionError("broker down")
+    task_id = await OutboxTaskProcessor(relay).execute_task(
+        "send_welcome_email", WelcomeEmailTaskPayload(recipients=["a@example.com"])
+    )
+
+    assert await relay.drain_batch() == 1
+    # Backing off, not picked up again right away
+    assert await relay.drain_batch() == 0
+
+    message = await OutboxMessageDocument.get(task_id)
+    assert message.status == OutboxStatus.Pending
+    assert message.attempts == 1
+    assert message.last_error == "broker down"
+    assert message.claim is None
+
+
+@pytest.mark.asyncio
+async def test_message_is_dead_after_max_attempts(publisher):
+    publisher.execute_task.side_effect = ValueError("Task 'unknown' is not registered.")
+    relay = OutboxRelay(publisher, max_attempts=1)
+    task_id = await OutboxTaskProcessor(relay).execute_task(
+        "unknown", WelcomeEmailTaskPayload(recipients=[])
+    )
+
+    await relay.drain_batch()
+
+    message = await OutboxMessageDocument.get(task_id)
+    assert message.status == OutboxStatus.Dead
+    assert relay.stats()["dead"] == 1
+
+
+@pytest.mark.asyncio
+async def test_claimed_messages_are_skipped(relay, publisher):
+    await OutboxMessageDocument(
+        task_name="send_welcome_email",
+        payload={},
+        available_at=datetime.now(UTC) + timedelta(seconds=30),
+    ).insert()
+
+    assert await relay.drain_batch() == 0
+    publisher.execute_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_background_loop_flushes_and_drains_on_stop(relay, publisher):
+    processor = OutboxTaskProcessor(relay)
+    await relay.start()
+    await relay.start()
+
+    await processor.execute_task("send_welcome_email", WelcomeEmailTaskPayload(recipients=[]))
+    # A lone message goes out on the flush interval
+    for _ in range(100):
+        if publisher.execute_task.await_count:
+            break
+        await asyncio.sleep(0.01)
+    assert publisher.execute_task.await_count == 1
+
+    await processor.execute_task("send_welcome_email", WelcomeEmailTaskPayload(recipients=[]))
+    await relay.stop()
+    await relay.stop()
+
+    assert publisher.execute_task.await_count == 2
+    assert await OutboxMessageDocument.count() == 0
+
+
+def test_batch_size_must_be_positive(publisher):
+    with pytest.raises(ValueError):
+        OutboxRelay(publisher, batch_size=0)
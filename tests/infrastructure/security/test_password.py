@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from src.config import PasswordHashingSettings
+from src.infrastructure.security.password import (
+    BcryptPasswordHasher,
+    PooledPasswordHashingService,
+    build_password_hasher,
+)
+
+TEST_PASSWORD = "secure_password123"
+# Cheapest bcrypt cost, keeps the suite fast
+TEST_ROUNDS = 4
+
+
+@pytest_asyncio.fixture
+async def hashing_service():
+    service = PooledPasswordHashingService(BcryptPasswordHasher(TEST_ROUNDS), executor="thread", pool_size=2, queue_depth=2)
+    yield service
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify(hashing_service):
+    hashed = await hashing_service.hash_password(TEST_PASSWORD)
+
+    assert hashed.value != TEST_PASSWORD.encode("utf-8")
+    assert hashed.algorithm == "bcrypt"
+    assert hashed.params == {"rounds": TEST_ROUNDS}
+    assert await hashing_service.verify_password(TEST_PASSWORD, hashed.value)
+    assert not await hashing_service.verify_password("wrong_password", hashed.value)
+
+
+@pytest.mark.asyncio
+async def test_verify_without_hash(hashing_service):
+    assert not await hashing_service.verify_password(TEST_PASSWORD, None)
+
+
+@pytest.mark.asyncio
+async def test_process_pool_executor():
+    service = PooledPasswordHashingService(BcryptPasswordHasher(TEST_ROUNDS), executor="process", pool_size=1, queue_depth=1)
+    try:
+        hashed = await service.hash_password(TEST_PASSWORD)
+        assert await service.verify_password(TEST_PASSWORD, hashed.value)
+    finally:
+        await service.close()
+
+
+@pytest.mark.asyncio
+async def test_does_not_block_event_loop(hashing_service):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticker_task = asyncio.create_task(ticker())
+    await hashing_service.hash_password(TEST_PASSWORD)
+    ticker_task.cancel()
+
+    # The loop kept running other coroutines while bcrypt was hashing
+    assert ticks > 1
+
+
+@pytest.mark.asyncio
+async def test_admission_is_bounded():
+    service = PooledPasswordHashingService(BcryptPasswordHasher(TEST_ROUNDS), executor="thread", pool_size=1, queue_depth=1)
+    lock = threading.Lock()
+    running = 0
+    max_admitted = 0
+
+    def slow():
+        nonlocal running
+        with lock:
+            running += 1
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    async def submit():
+        nonlocal max_admitted
+        task = asyncio.create_task(service._submit(slow))
+        await asyncio.sleep(0)
+        max_admitted = max(max_admitted, service.in_flight)
+        await task
+
+    try:
+        await asyncio.gather(*(submit() for _ in range(6)))
+    finally:
+        await service.close()
+
+    assert max_admitted <= 2
+    assert service.in_flight == 0
+
+
+@pytest.mark.parametrize("pool_size,queue_depth", [(0, 1), (1, -1)])
+def test_invalid_pool_configuration(pool_size, queue_depth):
+    with pytest.raises(ValueError):
+        PooledPasswordHashingService(
+            BcryptPasswordHasher(TEST_ROUNDS), pool_size=pool_size, queue_depth=queue_depth)
+
+
+@pytest.mark.parametrize("algorithm,params,expected", [
+    ("bcrypt", {"rounds": TEST_ROUNDS}, False),
+    ("bcrypt", {"rounds": TEST_ROUNDS - 1}, True),
+    ("bcrypt", {"rounds": TEST_ROUNDS + 1}, False),
+    ("bcrypt", {}, True),
+    (None, {}, True),
+])
+def test_needs_rehash(hashing_service, algorithm, params, expected):
+    assert hashing_service.needs_rehash(algorithm, params) is expected
+
+
+def test_bcrypt_hash_embeds_rounds():
+    password_hash = BcryptPasswordHasher(TEST_ROUNDS).hash(TEST_PASSWORD)
+
+    assert password_hash.startswith(b"$2b$04$")
+
+
+@pytest.mark.parametrize("rounds", [3, 32])
+def test_bcrypt_rejects_invalid_rounds(rounds):
+    with pytest.raises(ValueError):
+        BcryptPasswordHasher(rounds)
+
+
+@pytest.mark.parametrize("elapsed_ms,expected_rounds", [
+    (10.0, 14),   # 10ms * 2^4 = 160ms fits, 320ms would not
+    (100.0, 11),  # 100ms * 2 = 200ms fits
+    (300.0, 10),  # Already over budget, stay at the floor
+    (0.1, 16),    # Capped at max_rounds
+])
+def test_calibrate_picks_highest_cost_within_target(elapsed_ms, expected_rounds):
+    with patch.object(BcryptPasswordHasher, "measure", return_value=elapsed_ms) as measure:
+        hasher = BcryptPasswordHasher.calibrate(250.0, min_rounds=10, max_rounds=16)
+
+    measure.assert_called_once_with(10)
+    assert hasher.rounds == expected_rounds
+
+
+def test_calibrate_on_real_hardware():
+    hasher = BcryptPasswordHasher.calibrate(1.0, min_rounds=TEST_ROUNDS, max_rounds=6)
+
+    assert TEST_ROUNDS <= hasher.rounds <= 6
+
+
+def test_calibrate_rejects_inverted_bounds():
+    with pytest.raises(ValueError):
+        BcryptPasswordHasher.calibrate(250.0, min_rounds=12, max_rounds=10)
+
+
+def test_build_password_hasher_with_pinned_rounds():
+    with patch.object(BcryptPasswordHasher, "measure") as measure:
+        hasher = build_password_hasher(PasswordHashingSettings(rounds=TEST_ROUNDS))
+
+    measure.assert_not_called()
+    assert hasher.params == {"rounds": TEST_ROUNDS}
+
+
+def test_build_password_hasher_calibrates_by_default():
+    with patch.object(BcryptPasswordHasher, "measure", return_value=250.0):
+        hasher = build_password_hasher(PasswordHashingSettings())
+
+    assert hasher.rounds == PasswordHashingSettings().min_rounds
@@ -0,0 +1,114 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.domain.background_task.value_objects import BackgroundTaskPayload
+from src.domain.users.repositories import UserRepository
+from src.domain.users.value_objects import UserFilter
+from src.observability.instrumentation import (
+    TimedTaskProcessor,
+    TimedUserRepository,
+    processor_stats,
+)
+from src.observability.metrics import MetricsRegistry
+
+
+def samples(registry: MetricsRegistry, name: str) -> dict[tuple[str, ...], float]:
+    return {
+        tuple(sample.labels.values()): sample.value
+        for metric in registry.registry.collect()
+        for sample in metric.samples
+        if sample.name == name
+    }
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.mark.asyncio
+async def test_repository_calls_are_timed_per_method(registry):
+    repository = AsyncMock(spec=UserRepository)
+    repository.get_by_id.return_value = None
+    repository.save.side_effect = RuntimeError("down")
+    timed = TimedUserRepository(repository, registry)
+    user_id = uuid.uuid4()
+
+    assert await timed.get_by_id(user_id) is None
+    await timed.get_many_by_ids([user_id])
+    await timed.get_by_email("a@example.com")
+    await timed.get_many_by_email(["a@example.com"])
+    await timed.save_many([])
+    await timed.update_password(MagicMock())
+    await timed.list_page(10)
+    with pytest.raises(RuntimeError):
+        await timed.save(MagicMock())
+
+    repository.get_by_id.assert_awaited_once_with(user_id, projection=None)
+    durations = samples(registry, "user_repository_duration_seconds_count")
+    assert durations[("get_by_id", "ok")] == 1
+    assert durations[("save", "error")] == 1
+    assert {method for method, _ in durations} == {
+        "get_by_id",
+        "get_many_by_ids",
+        "get_by_email",
+        "get_many_by_email",
+        "save_many",
+        "update_password",
+        "list_page",
+        "save",
+    }
+
+
+@pytest.mark.asyncio
+async def test_stream_is_timed_until_exhausted(registry):
+    async def rows(*args, **kwargs):
+        yield {"email": "a@example.com"}
+        yield {"email": "b@example.com"}
+
+    repository = MagicMock(spec=UserRepository)
+    repository.stream.side_effect = rows
+    timed = TimedUserRepository(repository, registry)
+
+    assert [row async for row in timed.stream(UserFilter(), fields=["email"])] == [
+        {"email": "a@example.com"},
+        {"email": "b@example.com"},
+    ]
+    assert samples(registry, "user_repository_duration_seconds_count")[("stream", "ok")] == 1
+
+
+class Payload(BackgroundTaskPayload):
+    value: int = 1
+
+
+@pytest.mark.asyncio
+async def test_task_kicks_are_timed_and_counted(registry):
+    processor = AsyncMock(spec=BackgroundTaskProcessor)
+    processor.execute_task.side_effect = ["task-1", RuntimeError("broker down")]
+    timed = TimedTaskProcessor(processor, registry)
+
+    assert await timed.execute_task("send", Payload(), idempotency_key="k") == "task-1"
+    with pytest.raises(RuntimeError):
+        await timed.execute_task("send", Payload())
+    await timed.register_tasks()
+    await timed.close()
+
+    processor.execute_task.assert_any_await("send", Payload(), task_id=None, idempotency_key="k")
+    totals = samples(registry, "task_publish_total")
+    assert totals[("send", "ok")] == 1
+    assert totals[("send", "error")] == 1
+    assert samples(registry, "task_publish_duration_seconds_count")[("send",)] == 2
+    processor.register_tasks.assert_awaited_once()
+    processor.close.assert_awaited_once()
+
+
+def test_processor_stats_merge_the_chain(registry):
+    inner = MagicMock(spec=["stats"])
+    inner.stats.return_value = {"published": 3, "kicks": 0}
+    outer = MagicMock(spec=["stats", "processor"], processor=inner)
+    outer.stats.return_value = {"kicks": 5}
+
+    assert processor_stats(TimedTaskProcessor(outer, registry)) == {"published": 3, "kicks": 5}
@@ -0,0 +1,160 @@
+import io
+import json
+import logging
+import threading
+
+import pytest
+import structlog
+
+from src.observability.log_queue import QueuedLogHandler, QueuedLogWriter
+from src.observability.logging import AppLogger
+
+
+def render(entry):
+    return str(entry)
+
+
+@pytest.fixture
+def stream():
+    return io.BytesIO()
+
+
+def test_lines_are_written_in_batches(stream):
+    writer = QueuedLogWriter(stream, batch_size=2, flush_interval_seconds=60)
+    writer.start()
+
+    for i in range(5):
+        assert writer.put(render, i)
+    writer.close()
+
+    assert stream.getvalue() == b"0\n1\n2\n3\n4\n"
+    assert writer.stats() == {
+        "queued": 0,
+        "enqueued": 5,
+        "written": 5,
+        "dropped": 0,
+        "blocked": 0,
+        "failed": 0,
+        "batches": 3,
+    }
+
+
+def test_full_queue_drops_new_lines(stream):
+    writer = QueuedLogWriter(stream, max_size=2, batch_size=10, flush_interval_seconds=60)
+    # Started but not draining, so the buffer fills up
+    writer._thread = threading.current_thread()
+
+    assert writer.put(render, 1)
+    assert writer.put(render, 2)
+    assert not writer.put(render, 3)
+
+    writer.flush()
+    assert stream.getvalue() == b"1\n2\n"
+    assert writer.dropped == 1
+
+
+def test_full_queue_blocks_until_drained(stream):
+    writer = QueuedLogWriter(
+        stream, max_size=1, overflow="block", batch_size=1, flush_interval_seconds=0.01
+    )
+    writer.start()
+    # Keep the writer thread off the buffer until the producer blocks
+    writer._drain_lock.acquire()
+    writer.put(render, 1)
+
+    producer = threading.Thread(target=writer.put, args=(render, 2))
+    producer.start()
+    while writer.blocked == 0:
+        pass
+    writer._drain_lock.release()
+    producer.join(timeout=5)
+    writer.close()
+
+    assert stream.getvalue() == b"1\n2\n"
+    assert writer.dropped == 0
+    assert writer.blocked == 1
+
+
+def test_failures_are_counted(stream):
+    writer = QueuedLogWriter(stream)
+    writer._thread = threading.current_thread()
+
+    writer.put(lambda entry: 1 / 0, None)
+    writer.put(render, "ok")
+    writer.flush()
+
+    assert stream.getvalue() == b"ok\n"
+    assert writer.failed == 1
+
+    stream.close()
+    writer.put(render, "lost")
+    writer.flush()
+    assert writer.failed == 2
+
+
+def test_lines_are_written_straight_away_when_not_running(stream):
+    writer = QueuedLogWriter(stream)
+
+    writer.put(render, "now")
+
+    assert stream.getvalue() == b"now\n"
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        QueuedLogWriter(max_size=0)
+
+
+def test_processor_queues_events_and_captures_exceptions(stream):
+    writer = QueuedLogWriter(stream)
+    writer._thread = threading.current_thread()
+    processor = writer.processor(
+        [structlog.processors.dict_tracebacks, structlog.processors.JSONRenderer()]
+    )
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        with pytest.raises(structlog.DropEvent):
+            processor(None, "error", {"event": "failed", "exc_info": True})
+
+    writer.flush()
+    line = json.loads(stream.getvalue())
+    assert line["event"] == "failed"
+    assert line["exception"][0]["exc_type"] == "ValueError"
+
+
+def test_stdlib_records_are_formatted_on_the_writer(stream):
+    writer = QueuedLogWriter(stream)
+    writer._thread = threading.current_thread()
+    handler = QueuedLogHandler(writer)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    names = ["a"]
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "hello %s", (names,), None)
+
+    handler.emit(record)
+    # The message is fixed when the record is queued
+    names.append("b")
+    writer.flush()
+
+    assert stream.getvalue() == b"INFO hello ['a']\n"
+
+
+def test_app_logger_with_queue(capsys):
+    writer = QueuedLogWriter(flush_interval_seconds=60)
+    AppLogger(
+        service_name="test_service",
+        log_level="info",
+        environment="production",
+        log_writer=writer,
+    )
+
+    structlog.get_logger().info("queued message", extra_field="extra_value")
+    logging.getLogger("asyncio").warning("stdlib message")
+    assert capsys.readouterr().out == ""
+
+    writer.close()
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["body"] for line in lines] == ["queued message", "stdlib message"]
+    assert lines[0]["attributes"]["extra_field"] == "extra_value"
+    structlog.reset_defaults()
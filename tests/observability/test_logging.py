@@ -1,8 +1,11 @@
 import json
+import logging
+import uuid
+from datetime import datetime, timezone
 
 import structlog
 
-from src.observability.logging import AppLogger
+from src.observability.logging import AppLogger, StructuredAppLogRenderer
 
 SERVICE_NAME = "test_service"
 LOG_LEVEL = "info"
@@ -60,3 +63,53 @@ def test_init_development(capsys):
     assert isinstance(log_entry, str)
     assert "test message" in log_entry
     assert "extra_field" in log_entry
+
+
+def test_renderer_writes_bytes_with_native_attributes():
+    renderer = StructuredAppLogRenderer(
+        SERVICE_NAME,
+        "production",
+        service_namespace=SERVICE_NAMESPACE,
+        service_version=SERVICE_VERSION,
+    )
+    user_id = uuid.uuid4()
+    created_at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    line = renderer(
+        None,
+        "info",
+        {
+            "timestamp": 1700000000.5,
+            "level": "info",
+            "event": "created",
+            "user_id": user_id,
+            "created_at": created_at,
+            "other": object,
+        },
+    )
+
+    assert isinstance(line, bytes)
+    log_data = json.loads(line)
+    assert log_data["timestamp"] == 1700000000
+    assert log_data["body"] == "created"
+    assert log_data["attributes"]["user_id"] == str(user_id)
+    assert log_data["attributes"]["created_at"] == "2024-01-02T03:04:05Z"
+    assert log_data["attributes"]["other"] == str(object)
+    assert log_data["resource"] == {
+        "service": {
+            "name": SERVICE_NAME,
+            "namespace": SERVICE_NAMESPACE,
+            "version": SERVICE_VERSION,
+        },
+        "environment": {"name": "production"},
+    }
+
+
+def test_production_stdlib_records_are_rendered_as_json(capsys):
+    AppLogger(service_name=SERVICE_NAME, log_level=LOG_LEVEL, environment="production")
+
+    logging.getLogger("asyncio").warning("stdlib %s", "message")
+
+    log_data = json.loads(capsys.readouterr().out)
+    assert log_data["body"] == "stdlib message"
+    assert log_data["resource"]["service"]["name"] == SERVICE_NAME
@@ -0,0 +1,174 @@
+import os
+
+import pytest
+from prometheus_client import Counter, Gauge, multiprocess, values
+
+from src.observability.metrics import MetricsRegistry, process_stats
+
+OTHER_PID = 999_999_999
+
+
+@pytest.fixture
+def multiprocess_dir(tmp_path, monkeypatch):
+    # The registry switches prometheus_client to multiprocess mode, undone afterwards
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(values, "ValueClass", values.ValueClass)
+    return str(tmp_path)
+
+
+def record_in_other_process() -> None:
+    value_class = values.ValueClass
+    values.ValueClass = values.MultiProcessValue(lambda: OTHER_PID)
+    try:
+        Counter("kicks_total", "Kicks", ["task_name"], registry=None).labels("b").inc(3)
+        Gauge("in_flight", "In flight", registry=None, multiprocess_mode="livesum").set(2)
+        Gauge("peak_bytes", "Peak", registry=None, multiprocess_mode="livemax").set(7)
+    finally:
+        values.ValueClass = value_class
+
+
+@pytest.mark.asyncio
+async def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ["route"], buckets=[0.1, 1])
+
+    child = histogram.labels("/users")
+    for value in (0.05, 0.1, 0.5, 3):
+        child.observe(value)
+    text = (await registry.render()).decode()
+
+    assert 'latency_seconds_bucket{le="0.1",route="/users"} 2.0' in text
+    assert 'latency_seconds_bucket{le="1.0",route="/users"} 3.0' in text
+    assert 'latency_seconds_bucket{le="+Inf",route="/users"} 4.0' in text
+    assert 'latency_seconds_sum{route="/users"} 3.65' in text
+
+
+@pytest.mark.asyncio
+async def test_render_text_format():
+    registry = MetricsRegistry()
+    registry.counter("kicks_total", "Kicks", ["task_name"]).labels('say "hi"').inc(2)
+    registry.gauge("in_flight", "In flight").set(3)
+    registry.histogram("latency_seconds", "Latency", buckets=[0.1, 1]).observe(0.5)
+
+    text = (await registry.render()).decode()
+
+    assert 'kicks_total{task_name="say \\"hi\\""} 2.0' in text
+    assert "# TYPE in_flight gauge" in text
+    assert "in_flight 3.0" in text
+    assert "latency_seconds_count 1.0" in text
+    assert "latency_seconds_sum 0.5" in text
+
+
+def test_registration_is_idempotent():
+    registry = MetricsRegistry()
+    counter = registry.counter("kicks_total", "Kicks", ["task_name"])
+
+    assert registry.counter("kicks_total", "Kicks", ["task_name"]) is counter
+    with pytest.raises(ValueError):
+        registry.gauge("kicks_total", "Kicks", ["task_name"])
+    with pytest.raises(ValueError):
+        counter.labels("a", "b")
+
+
+@pytest.mark.asyncio
+async def test_stats_sources_are_read_on_scrape():
+    registry = MetricsRegistry()
+    stats = {"hits": 1, "name": "cache", "enabled": True}
+
+    async def depths():
+        return {"taskiq": 4}
+
+    def broken():
+        raise RuntimeError("gone")
+
+    registry.register_stats("user_cache", "User cache", lambda: stats)
+    registry.register_stats("queue_depth", "Queue depth", depths, label="queue")
+    registry.register_stats("broken", "Broken", broken)
+
+    stats["hits"] = 5
+    text = (await registry.render()).decode()
+
+    assert "user_cache_hits 5.0" in text
+    # Only numbers are published
+    assert "user_cache_name" not in text
+    assert "user_cache_enabled" not in text
+    assert 'queue_depth{queue="taskiq"} 4.0' in text
+    assert "broken" not in text
+    # Coroutine sources are left to scrapes
+    assert "queue_depth" not in await registry.snapshot()
+
+
+@pytest.mark.asyncio
+async def test_stats_counters_only_go_up():
+    registry = MetricsRegistry()
+    stats = {"cpu_seconds_total": 1.5}
+    registry.register_stats("process", "Process", lambda: stats, counters=["cpu_seconds_total"])
+
+    await registry.refresh()
+    stats["cpu_seconds_total"] = 2.0
+    text = (await registry.render()).decode()
+
+    assert (await registry.snapshot())["process_cpu_seconds"].type == "counter"
+    assert "process_cpu_seconds_total 2.0" in text
+
+
+@pytest.mark.asyncio
+async def test_processes_sharing_a_directory_are_combined(multiprocess_dir):
+    registry = MetricsRegistry(multiprocess_dir=multiprocess_dir)
+    registry.counter("kicks_total", "Kicks", ["task_name"]).labels("a").inc(2)
+    registry.gauge("in_flight", "In flight").set(1)
+    registry.register_stats("peak", "Peak", lambda: {"bytes": 5}, multiprocess_mode="livemax")
+
+    async def depths():
+        return {"taskiq": 4}
+
+    registry.register_stats("queue_depth", "Queue depth", depths, label="queue")
+    record_in_other_process()
+
+    text = (await registry.render()).decode()
+
+    assert 'kicks_total{task_name="a"} 2.0' in text
+    assert 'kicks_total{task_name="b"} 3.0' in text
+    # Gauges are combined by their mode
+    assert "in_flight 3.0" in text
+    assert "peak_bytes 7.0" in text
+    # Coroutine stats are the scraped process's own
+    assert 'queue_depth{queue="taskiq"} 4.0' in text
+
+    # Once the other process is gone, only its counters remain
+    multiprocess.mark_process_dead(OTHER_PID, multiprocess_dir)
+    text = (await registry.render()).decode()
+
+    assert 'kicks_total{task_name="b"} 3.0' in text
+    assert "in_flight 1.0" in text
+    assert "peak_bytes 5.0" in text
+
+
+@pytest.mark.asyncio
+async def test_background_flush(multiprocess_dir):
+    registry = MetricsRegistry(multiprocess_dir=multiprocess_dir)
+    registry.register_stats("peak", "Peak", lambda: {"bytes": 5})
+
+    await registry.start(flush_interval_seconds=60)
+    await registry.stop()
+
+    # Stats were recorded, and this process's live gauges dropped on the way out
+    assert "peak_bytes" in await registry.snapshot()
+    assert not [name for name in os.listdir(multiprocess_dir) if name.startswith("gauge_live")]
+
+
+@pytest.mark.asyncio
+async def test_start_without_directory_does_nothing():
+    registry = MetricsRegistry()
+
+    await registry.start()
+    await registry.stop()
+
+    assert registry._flusher is None
+
+
+def test_process_stats():
+    stats = process_stats()
+
+    assert stats["cpu_seconds_total"] > 0
+    assert stats["max_rss_bytes"] > 0
@@ -0,0 +1,135 @@
+import pytest
+import structlog
+from structlog.testing import LogCapture
+
+from src.observability.logging import AppLogger
+from src.observability.sampling import OTHER_KEY, LogSampler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def kept(sampler: LogSampler, event_dict: dict) -> bool:
+    try:
+        sampler(None, "info", event_dict)
+    except structlog.DropEvent:
+        return False
+    return True
+
+
+def test_lines_are_kept_evenly_per_event():
+    sampler = LogSampler(rates={"noisy": 0.25})
+
+    noisy = [kept(sampler, {"event": "noisy", "level": "info"}) for _ in range(8)]
+    quiet = [kept(sampler, {"event": "quiet", "level": "info"}) for _ in range(8)]
+
+    assert noisy == [True, False, False, False, True, False, False, False]
+    assert all(quiet)
+    assert sampler.suppressed() == {"noisy": 6}
+
+
+def test_requests_are_kept_or_dropped_together():
+    sampler = LogSampler(rates={"a": 0.5, "b": 0.5})
+    request_ids = [f"request-{index}" for index in range(200)]
+
+    decisions = {
+        request_id: [
+            kept(sampler, {"event": event, "level": "debug", "request_id": request_id})
+            for event in ("a", "b", "a")
+        ]
+        for request_id in request_ids
+    }
+
+    assert all(len(set(kept_lines)) == 1 for kept_lines in decisions.values())
+    kept_requests = sum(kept_lines[0] for kept_lines in decisions.values())
+    assert 60 < kept_requests < 140
+    # Another process decides the same
+    other = LogSampler(rates={"a": 0.5})
+    assert all(
+        kept(other, {"event": "a", "level": "info", "request_id": request_id}) == lines[0]
+        for request_id, lines in decisions.items()
+    )
+
+
+def test_warnings_errors_and_stdlib_records_are_always_kept():
+    sampler = LogSampler(default_rate=0)
+
+    assert kept(sampler, {"event": "failed", "level": "warning"})
+    assert kept(sampler, {"event": "failed", "level": "error"})
+    assert kept(sampler, {"event": "from stdlib", "level": "info", "_record": object()})
+    assert not kept(sampler, {"event": "failed", "level": "info"})
+
+
+def test_rate_limit_per_event():
+    clock = Clock()
+    sampler = LogSampler(rate_limit_per_second=2, rate_limit_burst=2, clock=clock)
+
+    burst = [kept(sampler, {"event": "hot", "level": "info"}) for _ in range(3)]
+    clock.now = 0.5
+    refilled = kept(sampler, {"event": "hot", "level": "info"})
+
+    assert burst == [True, True, False]
+    assert refilled
+    assert kept(sampler, {"event": "other", "level": "info"})
+
+
+def test_events_beyond_max_keys_share_a_key():
+    sampler = LogSampler(max_keys=1, rate_limit_per_second=1, rate_limit_burst=1)
+
+    assert kept(sampler, {"event": "first", "level": "info"})
+    assert kept(sampler, {"event": "second", "level": "info"})
+    assert not kept(sampler, {"event": "third", "level": "info"})
+    assert sampler.suppressed() == {OTHER_KEY: 1}
+
+
+def test_invalid_rates():
+    with pytest.raises(ValueError):
+        LogSampler(rates={"a": 2})
+    with pytest.raises(ValueError):
+        LogSampler(rate_limit_per_second=0)
+
+
+def test_suppressed_lines_are_summarized():
+    clock = Clock()
+    sampler = LogSampler(rates={"noisy": 0}, summary_interval_seconds=60, clock=clock)
+    capture = LogCapture()
+    structlog.configure(processors=[sampler, capture])
+    logger = structlog.get_logger()
+
+    logger.info("noisy")
+    logger.info("noisy")
+    clock.now = 61
+    logger.info("kept")
+
+    assert [entry["event"] for entry in capture.entries] == ["Suppressed log lines", "kept"]
+    assert capture.entries[0]["suppressed"] == {"noisy": 2}
+    assert capture.entries[0]["total"] == 2
+    assert sampler.suppressed() == {}
+    structlog.reset_defaults()
+
+
+def test_app_logger_samples_after_the_level_is_known(capsys):
+    sampler = LogSampler(rates={"noisy": 0})
+    app_logger = AppLogger(
+        service_name="test_service",
+        log_level="debug",
+        environment="development",
+        log_sampler=sampler,
+    )
+    logger = structlog.get_logger()
+
+    logger.info("noisy")
+    logger.warning("noisy")
+
+    assert app_logger._base_processors.index(sampler) == (
+        app_logger._base_processors.index(structlog.processors.add_log_level) + 1
+    )
+    output = capsys.readouterr().out
+    assert output.count("noisy") == 1
+    assert "warning" in output
+    structlog.reset_defaults()
@@ -0,0 +1,75 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from kink import di
+
+from src.observability.metrics import CONTENT_TYPE, MetricsRegistry
+from src.presentation.fastapi.metrics import MetricsMiddleware, metrics_endpoint
+
+app = FastAPI()
+app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.get("/items/{item_id}")
+async def get_item(item_id: int):
+    return {"item_id": item_id}
+
+
+@app.get("/stream")
+async def stream():
+    async def chunks():
+        yield b"a"
+        yield b"b"
+
+    return StreamingResponse(chunks())
+
+
+def forget_registry():
+    # The container has no public way to unregister a service
+    di._services.pop(MetricsRegistry, None)
+    di._memoized_services.pop(MetricsRegistry, None)
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    di[MetricsRegistry] = registry
+    yield registry
+    forget_registry()
+
+
+def test_requests_are_recorded_per_route_template(registry):
+    client = TestClient(app)
+
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/items/abc")
+    client.get("/stream")
+    client.get("/missing")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    text = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 2'
+        in text
+    )
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="422"} 1'
+        in text
+    )
+    assert 'route="/stream",status="200"} 1' in text
+    assert 'route="<unmatched>",status="404"} 1' in text
+    # The scrape itself is in flight while rendering
+    assert 'http_requests_in_flight{method="GET"} 1' in text
+
+
+def test_disabled_metrics():
+    forget_registry()
+    client = TestClient(app)
+
+    assert client.get("/items/1").status_code == 200
+    assert client.get("/metrics").status_code == 404
@@ -0,0 +1,28 @@
+import json
+import uuid
+
+from src.application.dto.user_dto import UserReadDTO
+from src.domain.users.value_objects import AddressType, UserAddress
+from src.presentation.fastapi.responses import ModelResponse
+
+
+def test_model_response_renders_model_json():
+    dto = UserReadDTO.model_construct(
+        id=uuid.uuid4(),
+        email="user@example.com",
+        first_name="John",
+        last_name=None,
+        addresses=[
+            UserAddress(
+                type=AddressType.Home, street="1 Main St", city="Springfield",
+                state="IL", zipcode=62701, country="US",
+            )
+        ],
+    )
+
+    response = ModelResponse(dto, status_code=201)
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body) == json.loads(dto.model_dump_json())
+    assert json.loads(response.body)["addresses"][0]["type"] == "home"
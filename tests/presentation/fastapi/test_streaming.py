@@ -0,0 +1,53 @@
+import json
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from src.presentation.fastapi.streaming import ndjson_stream
+
+
+async def rows(count: int):
+    for index in range(count):
+        yield {"index": index, "id": uuid.UUID(int=index)}
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.asyncio
+async def test_rows_are_encoded_one_per_line():
+    chunks = await collect(ndjson_stream(rows(3)))
+
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"index": index, "id": str(uuid.UUID(int=index))} for index in range(3)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_lines_are_coalesced_into_chunks():
+    chunks = await collect(ndjson_stream(rows(10), flush_bytes=100))
+
+    assert 1 < len(chunks) < 10
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_empty_stream():
+    assert await collect(ndjson_stream(rows(0))) == []
+
+
+@pytest.mark.asyncio
+async def test_values_are_encoded_like_responses():
+    class Opaque:
+        def __str__(self):
+            return "opaque"
+
+    async def other_rows():
+        yield {"at": datetime(2025, 1, 1, tzinfo=UTC), "value": Opaque()}
+
+    chunks = await collect(ndjson_stream(other_rows()))
+
+    assert chunks == [b'{"at":"2025-01-01T00:00:00Z","value":"opaque"}\n']
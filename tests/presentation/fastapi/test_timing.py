@@ -0,0 +1,116 @@
+import re
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from kink import di
+from structlog.testing import capture_logs
+
+from src.config import Settings
+from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.domain.background_task.value_objects import BackgroundTaskPayload
+from src.domain.users.repositories import UserRepository
+from src.observability.instrumentation import TimedTaskProcessor, TimedUserRepository
+from src.observability.logging import add_correlation
+from src.presentation.fastapi.timing import REQUEST_ID_HEADER, RequestTimingMiddleware
+
+repository = TimedUserRepository(AsyncMock(spec=UserRepository))
+processor = TimedTaskProcessor(AsyncMock(spec=BackgroundTaskProcessor))
+
+app = FastAPI()
+app.add_middleware(RequestTimingMiddleware)
+
+
+@app.get("/users/{user_id}")
+async def get_user(user_id: uuid.UUID):
+    await repository.get_by_id(user_id)
+    await repository.get_by_email("a@example.com")
+    await processor.execute_task("send", BackgroundTaskPayload())
+    return {"request_id": add_correlation(None, "info", {}).get("request_id")}
+
+
+@app.get("/fail")
+async def fail():
+    raise RuntimeError("boom")
+
+
+@app.get("/stream")
+async def stream():
+    async def chunks():
+        await repository.get_by_id(uuid.uuid4())
+        yield b"done"
+
+    return StreamingResponse(chunks())
+
+
+@pytest.fixture
+def settings():
+    di[Settings] = Settings()
+    yield di[Settings]
+    di.clear_cache()
+
+
+@pytest.fixture
+def test_client(settings):
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_request_id_and_server_timing(test_client):
+    with capture_logs() as logs:
+        response = test_client.get(f"/users/{uuid.uuid4()}")
+
+    request_id = response.headers[REQUEST_ID_HEADER]
+    assert re.fullmatch(r"[0-9a-f]{32}", request_id)
+    # Log lines of the request carry its ID
+    assert response.json() == {"request_id": request_id}
+    server_timing = response.headers["Server-Timing"]
+    assert re.fullmatch(
+        r'db;dur=[\d.]+;desc="2 calls", task;dur=[\d.]+;desc="1 kicks", total;dur=[\d.]+',
+        server_timing,
+    )
+
+    [access_log] = [log for log in logs if log["event"] == "Request served"]
+    assert access_log["log_level"] == "info"
+    assert access_log["route"] == "/users/{user_id}"
+    assert access_log["status"] == 200
+    assert access_log["db_calls"] == 2
+    assert access_log["task_kicks"] == 1
+    assert access_log["duration_ms"] >= access_log["db_ms"]
+
+
+def test_client_request_ids_are_kept_when_valid(test_client):
+    response = test_client.get("/users/1", headers={REQUEST_ID_HEADER: "client-id.1"})
+    assert response.headers[REQUEST_ID_HEADER] == "client-id.1"
+
+    response = test_client.get("/users/1", headers={REQUEST_ID_HEADER: "not valid!"})
+    assert response.headers[REQUEST_ID_HEADER] != "not valid!"
+
+
+def test_streamed_responses_are_logged_when_sent(test_client):
+    with capture_logs() as logs:
+        response = test_client.get("/stream")
+
+    assert response.text == "done"
+    # The stream's query runs after the headers were sent
+    assert 'desc="0 calls"' in response.headers["Server-Timing"]
+    [access_log] = [log for log in logs if log["event"] == "Request served"]
+    assert access_log["db_calls"] == 1
+
+
+def test_access_log_is_sampled_except_server_errors(test_client, settings):
+    settings.request_timing.access_log_sample_rate = 0
+    settings.request_timing.server_timing = False
+
+    with capture_logs() as logs:
+        response = test_client.get(f"/users/{uuid.uuid4()}")
+        failed = test_client.get("/fail")
+
+    assert "Server-Timing" not in response.headers
+    assert failed.status_code == 500
+    [access_log] = [log for log in logs if log["event"] == "Request served"]
+    assert access_log["log_level"] == "warning"
+    assert access_log["path"] == "/fail"
+    assert access_log["status"] == 500
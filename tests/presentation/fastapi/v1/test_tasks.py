@@ -0,0 +1,66 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from kink import di
+from starlette import status
+
+from src.config import Settings
+from src.domain.background_task.repositories import TaskResultRepository
+from src.domain.background_task.value_objects import TaskResult, TaskState
+from src.presentation.fastapi.v1.tasks import router
+
+app = FastAPI()
+app.include_router(router)
+
+
+@pytest.fixture
+def results():
+    di.clear_cache()
+    results = AsyncMock(spec=TaskResultRepository)
+    di[TaskResultRepository] = results
+    di[Settings] = Settings(taskiq={"result_max_wait_seconds": 10})
+    yield results
+    di.clear_cache()
+
+
+@pytest.fixture
+def test_client(results):
+    return TestClient(app)
+
+
+def test_get_finished_task(test_client, results):
+    results.wait.return_value = TaskResult(
+        task_id="task-1", state=TaskState.Failed, error="ValueError: no user"
+    )
+
+    response = test_client.get("/task-1")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["state"] == "failed"
+    assert response.json()["error"] == "ValueError: no user"
+    results.wait.assert_awaited_once_with("task-1", 0)
+
+
+def test_unfinished_task_is_pending(test_client, results):
+    results.wait.return_value = None
+
+    response = test_client.get("/task-1", params={"wait": 60})
+
+    assert response.json() == {
+        "task_id": "task-1",
+        "state": "pending",
+        "return_value": None,
+        "error": None,
+        "execution_time": None,
+        "finished_at": None,
+    }
+    # Capped by the server
+    results.wait.assert_awaited_once_with("task-1", 10)
+
+
+def test_wait_must_not_be_negative(test_client):
+    response = test_client.get("/task-1", params={"wait": -1})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -1,5 +1,7 @@
+import json
 import uuid
-from unittest.mock import AsyncMock
+from datetime import datetime, UTC
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi import FastAPI
@@ -7,15 +9,27 @@ from fastapi.testclient import TestClient
 from kink import di
 from starlette import status
 
-from src.application.dto.user_dto import UserReadDTO
+from src.application.dto.user_dto import (
+    USER_BATCH_MAX_SIZE,
+    BatchItemStatus,
+    UserBatchItemResultDTO,
+    UserListDTO,
+    UserReadDTO,
+)
 from src.application.services.user_service import UserService
 from src.domain.users.exceptions import UserAlreadyExistsError, UserNotFoundError
+from src.domain.users.value_objects import UserFilter
+from src.utils.page_token import InvalidPageTokenError
 from src.presentation.fastapi.v1.users import router
 
 # Create a test app instance
 app = FastAPI()
 app.include_router(router)
 
+# Custom methods (":batch") need the real prefix to produce a valid path
+prefixed_app = FastAPI()
+prefixed_app.include_router(router, prefix="/v1/users")
+
 
 # Setup fixtures
 @pytest.fixture
@@ -155,3 +169,169 @@ def test_get_user_invalid_id(test_client):
 
     # Assert response
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+# Tests for register_users_batch endpoint
+def test_register_users_batch(setup_di, sample_user_data, sample_user_response):
+    """Test batch registration returns per-item results."""
+    user_service_mock = setup_di
+    user_service_mock.register_many.return_value = [
+        UserBatchItemResultDTO(
+            index=0,
+            email="test@example.com",
+            status=BatchItemStatus.Created,
+            user=UserReadDTO(**sample_user_response),
+        ),
+        UserBatchItemResultDTO(
+            index=1,
+            email="test@example.com",
+            status=BatchItemStatus.Conflict,
+            detail="User with email test@example.com already exists",
+        ),
+    ]
+
+    response = TestClient(prefixed_app).post(
+        "/v1/users:batch", json={"users": [sample_user_data, sample_user_data]}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["created", "conflict"]
+    assert results[0]["user"] == sample_user_response
+    assert len(user_service_mock.register_many.call_args.args[0]) == 2
+
+
+@pytest.mark.parametrize("size", [0, USER_BATCH_MAX_SIZE + 1])
+def test_register_users_batch_size_limits(setup_di, sample_user_data, size):
+    """Test that empty and oversized batches are rejected."""
+    response = TestClient(prefixed_app).post(
+        "/v1/users:batch", json={"users": [sample_user_data] * size}
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    setup_di.register_many.assert_not_called()
+
+
+# Tests for bulk get endpoints
+def test_get_users_by_ids(test_client, setup_di, sample_user_id, sample_user_response):
+    """Test fetching several users through the query string."""
+    user_service_mock = setup_di
+    missing_id = uuid.uuid4()
+    user_service_mock.get_users.return_value = UserListDTO(
+        users=[UserReadDTO(**sample_user_response)], missing_ids=[missing_id]
+    )
+
+    response = test_client.get("/", params={"ids": [str(sample_user_id), str(missing_id)]})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "users": [sample_user_response],
+        "missing_ids": [str(missing_id)],
+        "next_page_token": None,
+    }
+    user_service_mock.get_users.assert_called_once_with([sample_user_id, missing_id])
+
+
+# Tests for paginated listing
+def test_list_users_first_page(test_client, setup_di, sample_user_response):
+    """Test listing users without IDs returns the first page."""
+    user_service_mock = setup_di
+    user_service_mock.list_users.return_value = UserListDTO(
+        users=[UserReadDTO(**sample_user_response)], next_page_token="next"
+    )
+
+    response = test_client.get("/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["next_page_token"] == "next"
+    user_service_mock.list_users.assert_called_once_with(50, page_token=None)
+    user_service_mock.get_users.assert_not_called()
+
+
+def test_list_users_next_page(test_client, setup_di):
+    """Test that the continuation token and page size are forwarded."""
+    user_service_mock = setup_di
+    user_service_mock.list_users.return_value = UserListDTO(users=[])
+
+    response = test_client.get("/", params={"page_size": 10, "page_token": "token"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["next_page_token"] is None
+    user_service_mock.list_users.assert_called_once_with(10, page_token="token")
+
+
+def test_list_users_invalid_page_token(test_client, setup_di):
+    """Test that a malformed continuation token is a client error."""
+    setup_di.list_users.side_effect = InvalidPageTokenError()
+
+    response = test_client.get("/", params={"page_token": "garbage"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.parametrize("page_size", [0, 501])
+def test_list_users_page_size_limits(test_client, setup_di, page_size):
+    """Test that the page size is bounded."""
+    response = test_client.get("/", params={"page_size": page_size})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_users_batch(setup_di, sample_user_id, sample_user_response):
+    """Test fetching several users through a request body."""
+    user_service_mock = setup_di
+    user_service_mock.get_users.return_value = UserListDTO(
+        users=[UserReadDTO(**sample_user_response)]
+    )
+
+    response = TestClient(prefixed_app).post(
+        "/v1/users:batchGet", json={"ids": [str(sample_user_id)]}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["users"] == [sample_user_response]
+    user_service_mock.get_users.assert_called_once_with([sample_user_id])
+
+
+# Tests for stream_users endpoint
+def test_stream_users(test_client, setup_di, sample_user_id):
+    """Test that users are streamed as newline-delimited JSON."""
+    user_service_mock = setup_di
+    created_at = datetime(2025, 1, 1, tzinfo=UTC)
+
+    async def rows():
+        yield {"id": sample_user_id, "email": "test@example.com", "created_at": created_at}
+        yield {"id": sample_user_id, "email": "other@example.com", "created_at": created_at}
+
+    user_service_mock.stream_users = MagicMock(return_value=rows())
+
+    response = test_client.get(
+        "/stream",
+        params={
+            "is_active": "true",
+            "created_after": "2024-01-01T00:00:00Z",
+            "fields": ["id", "email", "created_at"],
+            "batch_size": 100,
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    # Datetimes are encoded like in the JSON responses
+    assert lines == [
+        {"id": str(sample_user_id), "email": email, "created_at": "2025-01-01T00:00:00Z"}
+        for email in ("test@example.com", "other@example.com")
+    ]
+    user_filter = user_service_mock.stream_users.call_args.args[0]
+    assert user_filter == UserFilter(is_active=True, created_after=datetime(2024, 1, 1, tzinfo=UTC))
+    assert user_service_mock.stream_users.call_args.kwargs == {
+        "fields": ["id", "email", "created_at"], "batch_size": 100
+    }
+
+
+def test_stream_users_rejects_unknown_fields(test_client, setup_di):
+    """Test that password fields cannot be requested."""
+    response = test_client.get("/stream", params={"fields": ["password_hash"]})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,52 @@
+import inspect
+
+import pytest
+from taskiq import InMemoryBroker
+
+from src.presentation.taskiq.tasks.registry import (
+    DEFAULT_QUEUE,
+    TASK_REGISTRY,
+    TaskDefinition,
+    min_worker_slots,
+    task_queues,
+)
+
+
+async def noop(payload: str) -> None:
+    pass
+
+
+def test_welcome_emails_have_a_dedicated_queue():
+    definition = TASK_REGISTRY["send_welcome_email"]
+
+    assert definition.queue == "transactional"
+    assert definition.queue != DEFAULT_QUEUE
+    assert task_queues() == ["transactional"]
+
+
+def test_register_attaches_routing_labels():
+    broker = InMemoryBroker()
+    definition = TaskDefinition(noop, queue="bulk", priority=1, max_concurrency=2)
+
+    task = definition.register(broker, "noop")
+
+    assert task.labels == {"queue": "bulk", "priority": 1}
+    assert broker.find_task("noop") is task
+    assert inspect.unwrap(task.original_func) is noop
+
+
+@pytest.mark.parametrize("priority", [-1, 11])
+def test_priority_must_be_in_range(priority):
+    with pytest.raises(ValueError):
+        TaskDefinition(noop, priority=priority)
+
+
+@pytest.mark.parametrize("limits", [{"max_concurrency": 1}, {"rate_limit": 5.0}])
+def test_limited_tasks_need_a_dedicated_queue(limits):
+    with pytest.raises(ValueError):
+        TaskDefinition(noop, **limits)
+
+
+def test_min_worker_slots_cover_the_prefetch_of_every_queue():
+    assert min_worker_slots(100) == 100 * len([DEFAULT_QUEUE, *task_queues()])
+    assert min_worker_slots(25, ["transactional"]) == 25
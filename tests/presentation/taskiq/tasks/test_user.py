@@ -1,14 +1,25 @@
-from unittest.mock import AsyncMock, MagicMock
+import asyncio
+import uuid
+from unittest.mock import AsyncMock
 
 import pytest
 from kink import di
 
-from src.application.dto.user_dto import WelcomeEmailTaskPayload
+from src.application.dto.user_dto import UserReadDTO, WelcomeEmailTaskPayload
 from src.application.services.user_service import UserService
 from src.domain.background_task.repositories import BackgroundTaskProcessor
+from src.domain.email.exceptions import EmailDeliveryError
+from src.domain.email.services import EmailSender
 from src.domain.users.repositories import UserRepository
+from src.infrastructure.email.templates import EmailTemplateRenderer
+from src.presentation.taskiq.tasks.user import (
+    WelcomeEmailBatcher,
+    send_welcome_email_task,
+    send_welcome_emails,
+)
+
+USER_ID = uuid.uuid4()
 
-USER_ID = "test-user-id"
 
 # Setup DI container with mocks for tests
 @pytest.fixture
@@ -25,19 +36,38 @@ def setup_di():
     di[UserRepository] = mock_user_repo
     di[BackgroundTaskProcessor] = mock_task_processor
 
-    # Configure a mock service to return a mock user
-    mock_user = MagicMock()
-    mock_user.id = USER_ID
+    # Configure a mock service that knows every recipient but "missing@example.com"
     mock_service = AsyncMock(spec=UserService)
-    mock_service.get_user_by_email.return_value = mock_user
+    mock_service.get_users_by_email.side_effect = lambda emails: [
+        UserReadDTO(id=USER_ID, email=email) for email in emails if email != "missing@example.com"
+    ]
+
+    # The sender refuses "bounce@example.com"
+    mock_sender = AsyncMock(spec=EmailSender)
+    mock_sender.send_many.side_effect = lambda messages: [
+        EmailDeliveryError(message.recipient, 550, "No such user")
+        if message.recipient == "bounce@example.com"
+        else None
+        for message in messages
+    ]
 
     # Register the service using the mocks
     di[UserService] = mock_service
+    di[EmailSender] = mock_sender
+    di[EmailTemplateRenderer] = EmailTemplateRenderer(service_name="test")
+    di[WelcomeEmailBatcher] = WelcomeEmailBatcher(
+        lambda payloads: send_welcome_emails(
+            payloads, di[UserService], di[EmailSender], di[EmailTemplateRenderer]
+        ),
+        max_wait_ms=1,
+    )
 
     yield {
         "user_repository": mock_user_repo,
         "task_processor": mock_task_processor,
-        "user_service": di[UserService]
+        "user_service": di[UserService],
+        "email_sender": mock_sender,
+        "batcher": di[WelcomeEmailBatcher],
     }
 
     # Clean up after test
@@ -45,19 +75,63 @@ def setup_di():
 
 
 @pytest.mark.asyncio
-async def test_send_welcome_email_task(setup_di, capsys):
-    """Test that send_welcome_email_task calls the service and logs correctly."""
-    # Import the function here to ensure it uses our mocked DI
-    from src.presentation.taskiq.tasks.user import send_welcome_email_task
-
-    # Get mock service from fixture
-    mock_service = setup_di['user_service']
-
-    # Create test data
-    email = "test@example.com"
-    user_id = "test-user-id"
-    payload = WelcomeEmailTaskPayload(recipients=[email])
-
-    await send_welcome_email_task(payload, svc=mock_service)
-    captured = capsys.readouterr()
-    assert f"Sending welcome email to {user_id}" in captured.out
+async def test_send_welcome_email_task(setup_di):
+    """Test that send_welcome_email_task goes through the batcher and sends the email."""
+    payload = WelcomeEmailTaskPayload(recipients=["test@example.com"])
+
+    await send_welcome_email_task(payload, batcher=setup_di["batcher"])
+
+    setup_di["user_service"].get_users_by_email.assert_awaited_once_with(["test@example.com"])
+    (messages,), _ = setup_di["email_sender"].send_many.await_args
+    assert [message.recipient for message in messages] == ["test@example.com"]
+    assert messages[0].subject == "Welcome to test"
+
+
+@pytest.mark.asyncio
+async def test_send_welcome_emails_resolves_all_recipients_at_once(setup_di):
+    """Test that a batch of payloads costs a single lookup and send, and reports per payload."""
+    mock_service = setup_di["user_service"]
+    mock_sender = setup_di["email_sender"]
+    payloads = [
+        WelcomeEmailTaskPayload(recipients=["first@example.com", "second@example.com"]),
+        WelcomeEmailTaskPayload(recipients=["missing@example.com", "second@example.com"]),
+        WelcomeEmailTaskPayload(recipients=["first@example.com"]),
+        WelcomeEmailTaskPayload(recipients=["bounce@example.com"]),
+    ]
+
+    results = await send_welcome_emails(
+        payloads, mock_service, mock_sender, di[EmailTemplateRenderer]
+    )
+
+    mock_service.get_users_by_email.assert_awaited_once_with(
+        ["first@example.com", "second@example.com", "missing@example.com", "bounce@example.com"]
+    )
+    # Every user gets a single email, even when several payloads name them
+    (messages,), _ = mock_sender.send_many.await_args
+    assert [message.recipient for message in messages] == [
+        "first@example.com", "second@example.com", "bounce@example.com"
+    ]
+    assert results[0] is None
+    # Unknown recipients are skipped, the rest of their payload was delivered
+    assert results[1] is None
+    assert results[2] is None
+    assert isinstance(results[3], EmailDeliveryError)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_share_a_batch(setup_di):
+    """Test that tasks running at the same time are handled together."""
+    batcher = setup_di["batcher"]
+    outcomes = await asyncio.gather(
+        send_welcome_email_task(
+            WelcomeEmailTaskPayload(recipients=["a@example.com"]), batcher=batcher
+        ),
+        send_welcome_email_task(
+            WelcomeEmailTaskPayload(recipients=["missing@example.com"]), batcher=batcher
+        ),
+        return_exceptions=True,
+    )
+
+    assert outcomes == [None, None]
+    setup_di["user_service"].get_users_by_email.assert_awaited_once()
+    assert batcher.stats()["batches"] == 1
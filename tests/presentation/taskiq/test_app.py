@@ -0,0 +1,74 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.application.dto.user_dto import WelcomeEmailTaskPayload
+from src.domain.background_task.repositories import TaskDeduplicationStore
+from src.presentation.taskiq.app import TaskiqProcessor
+
+
+@pytest.fixture
+def processor():
+    processor = TaskiqProcessor(MagicMock())
+    kicker = MagicMock()
+    kicker.with_task_id.return_value = kicker
+    kicker.with_labels.return_value = kicker
+    kicker.kiq = AsyncMock(
+        side_effect=lambda payload, **kwargs: MagicMock(
+            task_id=kicker.with_task_id.call_args.args[0]
+        )
+    )
+    processor.registered_tasks["send_welcome_email"] = MagicMock(
+        kicker=MagicMock(return_value=kicker)
+    )
+    return processor
+
+
+@pytest.mark.asyncio
+async def test_execute_task_keeps_a_given_task_id(processor):
+    task_id = await processor.execute_task(
+        "send_welcome_email", WelcomeEmailTaskPayload(recipients=[]), task_id="outbox-task-id"
+    )
+
+    assert task_id == "outbox-task-id"
+
+
+@pytest.mark.asyncio
+async def test_execute_task_generates_a_task_id(processor):
+    task_id = await processor.execute_task(
+        "send_welcome_email", WelcomeEmailTaskPayload(recipients=[])
+    )
+
+    assert task_id
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_is_sent_with_the_task(processor):
+    processor.dedup_store = AsyncMock(spec=TaskDeduplicationStore)
+    kicker = processor.registered_tasks["send_welcome_email"].kicker()
+
+    await processor.execute_task("send_welcome_email", WelcomeEmailTaskPayload(recipients=[]))
+    assert kicker.kiq.await_args.kwargs.keys() == {"payload"}
+
+    await processor.execute_task(
+        "send_welcome_email", WelcomeEmailTaskPayload(recipients=[]), idempotency_key="k"
+    )
+    assert kicker.kiq.await_args.kwargs["idempotency_key"] == "k"
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_is_not_sent_without_deduplication(processor):
+    kicker = processor.registered_tasks["send_welcome_email"].kicker()
+
+    await processor.execute_task(
+        "send_welcome_email", WelcomeEmailTaskPayload(recipients=[]), idempotency_key="k"
+    )
+
+    # Workers that predate deduplication would reject the unexpected argument
+    assert kicker.kiq.await_args.kwargs.keys() == {"payload"}
+
+
+@pytest.mark.asyncio
+async def test_execute_task_rejects_unknown_tasks(processor):
+    with pytest.raises(ValueError):
+        await processor.execute_task("unknown", WelcomeEmailTaskPayload(recipients=[]))
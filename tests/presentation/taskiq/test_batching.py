@@ -0,0 +1,179 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.application.dto.user_dto import WelcomeEmailTaskPayload
+from src.domain.background_task.repositories import TaskDeduplicationStore
+from src.presentation.taskiq.batching import BatchingTaskiqProcessor
+
+PAYLOAD = WelcomeEmailTaskPayload(recipients=["a@example.com"])
+
+
+def make_processor(kiq, **kwargs) -> BatchingTaskiqProcessor:
+    processor = BatchingTaskiqProcessor(MagicMock(), **kwargs)
+    kicker = MagicMock()
+    kicker.with_task_id.return_value = kicker
+    kicker.with_labels.return_value = kicker
+    kicker.kiq = kiq
+    processor.registered_tasks["send_welcome_email"] = MagicMock(
+        task_name="send_welcome_email", kicker=MagicMock(return_value=kicker)
+    )
+    return processor
+
+
+@pytest.mark.asyncio
+async def test_kicks_are_flushed_in_batches():
+    batches = []
+    in_flight = 0
+
+    async def kiq(payload):
+        nonlocal in_flight
+        in_flight += 1
+        batches.append(in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return MagicMock(task_id="ignored")
+
+    processor = make_processor(AsyncMock(side_effect=kiq), batch_size=3, linger_ms=50)
+
+    task_ids = [await processor.execute_task("send_welcome_email", PAYLOAD) for _ in range(5)]
+    # Callers are answered before anything is published
+    assert len(set(task_ids)) == 5
+    assert processor.buffer_depth == 5
+
+    await processor.close()
+
+    assert processor.stats()["published"] == 5
+    assert processor.stats()["flushes"] == 2
+    assert processor.buffer_depth == 0
+    # Publishes within a batch are pipelined
+    assert max(batches) == 3
+
+
+@pytest.mark.asyncio
+async def test_lone_kick_goes_out_after_linger():
+    kiq = AsyncMock(return_value=MagicMock())
+    processor = make_processor(kiq, batch_size=100, linger_ms=1)
+
+    await processor.execute_task("send_welcome_email", PAYLOAD, task_id="fixed-id")
+    for _ in range(100):
+        if kiq.await_count:
+            break
+        await asyncio.sleep(0.01)
+
+    assert kiq.await_count == 1
+    await processor.close()
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_applies_backpressure():
+    release = asyncio.Event()
+
+    async def kiq(payload):
+        await release.wait()
+        return MagicMock()
+
+    processor = make_processor(
+        AsyncMock(side_effect=kiq), buffer_size=2, batch_size=1, linger_ms=0
+    )
+    # One kick is held by the flusher, two fill the buffer
+    for _ in range(3):
+        await processor.execute_task("send_welcome_email", PAYLOAD)
+        await asyncio.sleep(0)
+
+    blocked = asyncio.create_task(processor.execute_task("send_welcome_email", PAYLOAD))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    release.set()
+    await blocked
+    await processor.close()
+    assert processor.stats()["published"] == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_publishes_are_counted():
+    processor = make_processor(AsyncMock(side_effect=ConnectionError("broker down")))
+
+    await processor.execute_task("send_welcome_email", PAYLOAD)
+    await processor.close()
+
+    assert processor.stats()["failed"] == 1
+    assert processor.stats()["published"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_publishes_release_idempotency_keys():
+    dedup_store = AsyncMock(spec=TaskDeduplicationStore)
+    processor = make_processor(
+        AsyncMock(side_effect=ConnectionError("broker down")), dedup_store=dedup_store
+    )
+
+    await processor.execute_task(
+        "send_welcome_email", PAYLOAD, task_id="lost", idempotency_key="welcome:1"
+    )
+    await processor.execute_task("send_welcome_email", PAYLOAD)
+    await processor.close()
+
+    # A retry of the lost kick is let through instead of being dropped as a duplicate
+    dedup_store.release.assert_awaited_once_with("kick:send_welcome_email:welcome:1", "lost")
+
+
+@pytest.mark.asyncio
+async def test_failed_release_is_logged():
+    dedup_store = AsyncMock(spec=TaskDeduplicationStore)
+    dedup_store.release.side_effect = ConnectionError("mongo down")
+    processor = make_processor(
+        AsyncMock(side_effect=ConnectionError("broker down")), dedup_store=dedup_store
+    )
+
+    await processor.execute_task("send_welcome_email", PAYLOAD, idempotency_key="welcome:1")
+    await processor.close()
+
+    assert processor.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_close_publishes_what_a_dead_flusher_left_behind():
+    kiq = AsyncMock(return_value=MagicMock(task_id="ignored"))
+    processor = make_processor(kiq, batch_size=2)
+
+    await processor.execute_task("send_welcome_email", PAYLOAD)
+    processor._flusher.cancel()
+    await asyncio.gather(processor._flusher, return_exceptions=True)
+    for _ in range(2):
+        await processor.execute_task("send_welcome_email", PAYLOAD)
+    await asyncio.wait_for(processor.close(), 1)
+
+    assert kiq.await_count == 3
+    assert processor.stats()["published"] == 3
+
+
+@pytest.mark.asyncio
+async def test_close_gives_up_on_a_stuck_flusher():
+    processor = make_processor(
+        AsyncMock(side_effect=asyncio.Event().wait), batch_size=1, drain_timeout_seconds=0.05
+    )
+
+    for _ in range(3):
+        await processor.execute_task("send_welcome_email", PAYLOAD)
+    await asyncio.wait_for(processor.close(), 1)
+
+    # The kick being published is cancelled, the other two were still buffered
+    assert processor.stats()["failed"] == 3
+    assert processor.buffer_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_task_is_rejected_immediately():
+    processor = make_processor(AsyncMock())
+
+    with pytest.raises(ValueError):
+        await processor.execute_task("unknown", PAYLOAD)
+    await processor.close()
+
+
+def test_sizes_must_be_positive():
+    with pytest.raises(ValueError):
+        BatchingTaskiqProcessor(MagicMock(), buffer_size=0)
@@ -0,0 +1,172 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from taskiq import BrokerMessage
+
+from src.presentation.taskiq.broker import PooledAioPikaBroker
+
+
+def make_message(**labels) -> BrokerMessage:
+    return BrokerMessage(
+        task_id="task-id", task_name="send_welcome_email", message=b"{}", labels=labels
+    )
+
+
+@pytest.fixture
+def connection():
+    connection = MagicMock()
+    connection.channel = AsyncMock(side_effect=lambda **kwargs: AsyncMock())
+    connection.close = AsyncMock()
+    return connection
+
+
+@pytest.mark.asyncio
+async def test_kicks_are_spread_over_the_channel_pool(connection):
+    broker = PooledAioPikaBroker("amqp://localhost", publish_channels=3, declare_exchange=False)
+    with patch("taskiq_aio_pika.broker.connect_robust", AsyncMock(return_value=connection)):
+        await broker.startup()
+
+    exchanges = []
+    for channel in broker._channels:
+        exchange = MagicMock(publish=AsyncMock())
+        channel.get_exchange = AsyncMock(return_value=exchange)
+        exchanges.append(exchange)
+
+    for _ in range(6):
+        await broker.kick(make_message(priority="5"))
+
+    assert [exchange.publish.await_count for exchange in exchanges] == [2, 2, 2]
+    published = exchanges[0].publish.await_args
+    assert published.kwargs["routing_key"] == "send_welcome_email"
+    assert published.args[0].headers["task_id"] == "task-id"
+    assert published.args[0].priority == 5
+    # Extra channels ask for publisher confirms
+    connection.channel.assert_any_await(publisher_confirms=True)
+
+    channels = broker._channels
+    await broker.shutdown()
+    for channel in channels:
+        channel.close.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_delayed_kicks_use_the_stock_path():
+    broker = PooledAioPikaBroker("amqp://localhost")
+    broker._next_channel = iter([])
+
+    with patch("taskiq_aio_pika.AioPikaBroker.kick", AsyncMock()) as kick:
+        await broker.kick(make_message(delay="1"))
+
+    kick.assert_awaited_once()
+
+
+def test_publish_channels_must_be_positive():
+    with pytest.raises(ValueError):
+        PooledAioPikaBroker("amqp://localhost", publish_channels=0)
+
+
+@pytest.fixture
+def routed_broker():
+    broker = PooledAioPikaBroker("amqp://localhost", task_queues=["transactional"])
+    channel = MagicMock()
+    channel.default_exchange.publish = AsyncMock()
+    exchange = MagicMock(publish=AsyncMock())
+    channel.get_exchange = AsyncMock(return_value=exchange)
+    broker._next_channel = iter([channel, channel])
+    return broker, channel, exchange
+
+
+@pytest.mark.asyncio
+async def test_routed_kicks_go_straight_to_their_queue(routed_broker):
+    broker, channel, exchange = routed_broker
+
+    await broker.kick(make_message(queue="transactional", priority="5"))
+    await broker.kick(make_message(queue="taskiq"))
+
+    published = channel.default_exchange.publish.await_args
+    assert published.kwargs["routing_key"] == "transactional"
+    assert published.args[0].priority == 5
+    assert exchange.publish.await_args.kwargs["routing_key"] == "send_welcome_email"
+
+
+def make_channel():
+    channel = MagicMock()
+    channel.declared = {}
+
+    async def declare_queue(name, **kwargs):
+        queue = MagicMock(name=name)
+        queue.consume = AsyncMock(return_value=f"consumer-{name}")
+        queue.cancel = AsyncMock()
+        queue.bind = AsyncMock()
+        queue.declaration_result.message_count = len(name)
+        channel.declared[name] = (queue, kwargs)
+        return queue
+
+    channel.declare_queue = AsyncMock(side_effect=declare_queue)
+    channel.set_qos = AsyncMock()
+    channel.close = AsyncMock()
+    return channel
+
+
+@pytest.mark.asyncio
+async def test_dedicated_queues_are_declared_with_priorities():
+    broker = PooledAioPikaBroker(
+        "amqp://localhost", task_queues=["transactional"], task_queue_max_priority=7
+    )
+    channel = make_channel()
+
+    stock = await broker.declare_queues(channel)
+
+    assert stock is channel.declared["taskiq"][0]
+    _, kwargs = channel.declared["transactional"]
+    assert kwargs["arguments"]["x-max-priority"] == 7
+    assert kwargs["arguments"]["x-dead-letter-routing-key"] == "transactional.dead_letter"
+    # The stock queue keeps its original arguments
+    assert "x-max-priority" not in channel.declared["taskiq"][1]["arguments"]
+
+
+@pytest.mark.asyncio
+async def test_listen_consumes_the_selected_queues():
+    broker = PooledAioPikaBroker(
+        "amqp://localhost", task_queues=["transactional"], listen_queues=["transactional"]
+    )
+    broker.read_channel = make_channel()
+
+    messages = broker.listen()
+    first = asyncio.ensure_future(messages.__anext__())
+    await asyncio.sleep(0)
+    queue, _ = broker.read_channel.declared["transactional"]
+    on_message = queue.consume.await_args.args[0]
+    await on_message(MagicMock(body=b"payload", ack=AsyncMock()))
+
+    received = await first
+    await messages.aclose()
+
+    assert received.data == b"payload"
+    broker.read_channel.declared["taskiq"][0].consume.assert_not_awaited()
+    queue.cancel.assert_awaited_once_with("consumer-transactional")
+
+
+@pytest.mark.asyncio
+async def test_listen_requires_startup():
+    with pytest.raises(ValueError):
+        await PooledAioPikaBroker("amqp://localhost").listen().__anext__()
+
+
+@pytest.mark.asyncio
+async def test_queue_depths():
+    broker = PooledAioPikaBroker("amqp://localhost", task_queues=["transactional"])
+    with pytest.raises(ValueError):
+        await broker.queue_depths()
+
+    channel = make_channel()
+    broker.write_conn = MagicMock(channel=AsyncMock(return_value=channel))
+
+    assert await broker.queue_depths() == {"taskiq": 6, "transactional": 13}
+    channel.close.assert_awaited_once()
+
+
+def test_listen_queues_must_be_known():
+    with pytest.raises(ValueError):
+        PooledAioPikaBroker("amqp://localhost", task_queues=["a"], listen_queues=["b"])
@@ -0,0 +1,77 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from taskiq import InMemoryBroker
+from taskiq.exceptions import NoResultError
+
+from src.domain.background_task.repositories import TaskDeduplicationStore
+from src.presentation.taskiq.idempotency import deduplicate_task
+
+
+class MemoryStore(TaskDeduplicationStore):
+    def __init__(self):
+        self.keys: dict[str, str] = {}
+
+    async def claim(self, key: str, task_id: str):
+        existing = self.keys.get(key)
+        if existing is None:
+            self.keys[key] = task_id
+        return existing
+
+    async def release(self, key: str, task_id: str) -> None:
+        if self.keys.get(key) == task_id:
+            del self.keys[key]
+
+
+@pytest.mark.asyncio
+async def test_runs_once_per_key():
+    task = AsyncMock(return_value="sent")
+    deduplicated = deduplicate_task(task, "send", MemoryStore())
+
+    assert await deduplicated(payload="a", idempotency_key="k") == "sent"
+    # No result is recorded over the first run's
+    with pytest.raises(NoResultError):
+        await deduplicated(payload="a", idempotency_key="k")
+    assert await deduplicated(payload="b") == "sent"
+
+    assert [call.kwargs for call in task.await_args_list] == [{"payload": "a"}, {"payload": "b"}]
+
+
+@pytest.mark.asyncio
+async def test_failed_run_releases_its_key():
+    task = AsyncMock(side_effect=[RuntimeError("boom"), "sent"])
+    deduplicated = deduplicate_task(task, "send", MemoryStore())
+
+    with pytest.raises(RuntimeError):
+        await deduplicated(payload="a", idempotency_key="k")
+    assert await deduplicated(payload="a", idempotency_key="k") == "sent"
+
+
+@pytest.mark.asyncio
+async def test_key_is_dropped_without_a_store():
+    task = AsyncMock(return_value="sent")
+    deduplicated = deduplicate_task(task, "send", None)
+
+    await deduplicated(payload="a", idempotency_key="k")
+    await deduplicated(payload="a", idempotency_key="k")
+
+    assert task.await_count == 2
+    task.assert_awaited_with(payload="a")
+
+
+@pytest.mark.asyncio
+async def test_skipped_run_keeps_the_first_result():
+    broker = InMemoryBroker(await_inplace=True)
+    task = broker.register_task(
+        deduplicate_task(AsyncMock(return_value="sent"), "send", MemoryStore()),
+        task_name="send",
+    )
+    await broker.startup()
+
+    for _ in range(2):
+        await task.kicker().with_task_id("t").kiq(payload="a", idempotency_key="k")
+    result = await broker.result_backend.get_result("t")
+    await broker.shutdown()
+
+    # The redelivery did not record its empty result over the first one
+    assert result.return_value == "sent"
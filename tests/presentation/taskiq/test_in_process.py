@@ -0,0 +1,153 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from taskiq_dependencies import Depends
+
+from src.application.dto.user_dto import WelcomeEmailTaskPayload
+from src.domain.background_task.repositories import TaskDeduplicationStore
+from src.domain.background_task.value_objects import RawTaskPayload
+from src.presentation.taskiq.in_process import InProcessTaskProcessor
+from src.presentation.taskiq.tasks.registry import TaskDefinition
+
+calls: list[tuple[WelcomeEmailTaskPayload, str]] = []
+
+
+def get_greeting() -> str:
+    return "hello"
+
+
+async def record_task(payload: WelcomeEmailTaskPayload, greeting: str = Depends(get_greeting)):
+    await asyncio.sleep(0)
+    calls.append((payload, greeting))
+
+
+async def failing_task(payload: WelcomeEmailTaskPayload):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    calls.clear()
+    with patch.dict(
+        "src.presentation.taskiq.in_process.TASK_REGISTRY",
+        {"record": TaskDefinition(record_task), "fail": TaskDefinition(failing_task)},
+        clear=True,
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_runs_tasks_with_dependencies():
+    processor = InProcessTaskProcessor(concurrency=2)
+    await processor.register_tasks()
+
+    task_id = await processor.execute_task(
+        "record", WelcomeEmailTaskPayload(recipients=["a@example.com"])
+    )
+    # Relayed payloads are validated against the task's annotation
+    await processor.execute_task("record", RawTaskPayload(recipients=["b@example.com"]))
+    await processor.close()
+
+    assert task_id
+    assert sorted(payload.recipients[0] for payload, _ in calls) == [
+        "a@example.com",
+        "b@example.com",
+    ]
+    assert all(isinstance(payload, WelcomeEmailTaskPayload) for payload, _ in calls)
+    assert all(greeting == "hello" for _, greeting in calls)
+    assert processor.stats()["succeeded"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_are_counted_and_do_not_stop_workers():
+    processor = InProcessTaskProcessor(concurrency=1)
+    await processor.register_tasks()
+
+    await processor.execute_task("fail", WelcomeEmailTaskPayload(recipients=[]))
+    await processor.execute_task("record", WelcomeEmailTaskPayload(recipients=[]))
+    await processor.close()
+
+    assert processor.stats()["failed"] == 1
+    assert processor.stats()["succeeded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure():
+    processor = InProcessTaskProcessor(concurrency=1, queue_size=1)
+    await processor.register_tasks()
+    release = asyncio.Event()
+
+    async def wait_for_release(**kwargs):
+        await release.wait()
+
+    processor.registered_tasks["record"] = processor.registered_tasks["record"]._replace(
+        fn=wait_for_release
+    )
+
+    payload = WelcomeEmailTaskPayload(recipients=[])
+    await processor.execute_task("record", payload)
+    await asyncio.sleep(0)
+    await processor.execute_task("record", payload)
+
+    blocked = asyncio.create_task(processor.execute_task("record", payload))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    release.set()
+    await blocked
+    await processor.close()
+    assert processor.stats()["succeeded"] == 3
+
+
+@pytest.mark.asyncio
+async def test_repeated_runs_are_skipped():
+    store = AsyncMock(spec=TaskDeduplicationStore)
+    store.claim.side_effect = [None, "earlier-run"]
+    result_backend = AsyncMock()
+    processor = InProcessTaskProcessor(
+        concurrency=1, dedup_store=store, result_backend=result_backend
+    )
+    await processor.register_tasks()
+
+    payload = WelcomeEmailTaskPayload(recipients=[])
+    await processor.execute_task("record", payload, task_id="t", idempotency_key="k")
+    await processor.execute_task("record", payload, task_id="t", idempotency_key="k")
+    await processor.close()
+
+    assert len(calls) == 1
+    assert store.claim.await_args.args[0] == "run:record:k"
+    # Only the run that went through records a result
+    result_backend.set_result.assert_awaited_once()
+    assert processor.stats()["skipped"] == 1
+    assert processor.stats()["failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_results_are_recorded():
+    result_backend = AsyncMock()
+    processor = InProcessTaskProcessor(concurrency=1, result_backend=result_backend)
+    await processor.register_tasks()
+
+    ok = await processor.execute_task("record", WelcomeEmailTaskPayload(recipients=[]))
+    failed = await processor.execute_task("fail", WelcomeEmailTaskPayload(recipients=[]))
+    await processor.close()
+
+    recorded = {call.args[0]: call.args[1] for call in result_backend.set_result.await_args_list}
+    assert not recorded[ok].is_err
+    assert isinstance(recorded[failed].error, RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_unknown_task_is_rejected():
+    processor = InProcessTaskProcessor()
+    await processor.register_tasks()
+
+    with pytest.raises(ValueError):
+        await processor.execute_task("unknown", WelcomeEmailTaskPayload(recipients=[]))
+    await processor.close()
+
+
+def test_sizes_must_be_positive():
+    with pytest.raises(ValueError):
+        InProcessTaskProcessor(concurrency=0)
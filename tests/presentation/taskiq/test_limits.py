@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import get_type_hints
+
+import pytest
+
+from src.presentation.taskiq.limits import TokenBucket, limit_task
+
+
+async def task(payload: str, delay: float = 0.01) -> str:
+    await asyncio.sleep(delay)
+    return payload
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_is_enforced():
+    active = peak = 0
+
+    async def tracked(payload: str) -> str:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return payload
+
+    limited = limit_task(tracked, max_concurrency=2)
+
+    results = await asyncio.gather(*(limited(str(i)) for i in range(6)))
+
+    assert results == [str(i) for i in range(6)]
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_spaces_out_starts():
+    limited = limit_task(task, rate_limit=100)
+
+    started = time.monotonic()
+    await asyncio.gather(*(limited("x", delay=0) for _ in range(5)))
+
+    # One token up front, then one every 10ms
+    assert time.monotonic() - started >= 0.035
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_bursts():
+    bucket = TokenBucket(rate=1, burst=3)
+
+    started = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+
+    assert time.monotonic() - started < 0.1
+
+
+def test_wrapper_keeps_the_signature():
+    limited = limit_task(task, max_concurrency=1, rate_limit=10)
+
+    assert get_type_hints(limited) == get_type_hints(task)
+    assert limited.__wrapped__ is task
+
+
+def test_no_limits_returns_the_task():
+    assert limit_task(task) is task
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"max_concurrency": 0}, {"rate_limit": 0}]
+)
+def test_limits_must_be_positive(kwargs):
+    with pytest.raises(ValueError):
+        limit_task(task, **kwargs)
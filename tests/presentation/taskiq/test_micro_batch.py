@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from src.presentation.taskiq.micro_batch import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_flushed_without_waiting():
+    batches = []
+
+    async def handler(items):
+        batches.append(items)
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=3, max_wait_ms=10_000)
+
+    results = await asyncio.gather(*(batcher.submit(item) for item in range(6)))
+
+    assert results == [0, 2, 4, 6, 8, 10]
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+    assert batcher.stats() == {"batches": 2, "items": 6, "pending": 0}
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_flushed_after_max_wait():
+    async def handler(items):
+        return items
+
+    batcher = MicroBatcher(handler, max_batch_size=100, max_wait_ms=1)
+
+    assert await asyncio.wait_for(batcher.submit("only"), timeout=1) == "only"
+
+
+@pytest.mark.asyncio
+async def test_per_item_failures_only_fail_their_submitter():
+    async def handler(items):
+        return [ValueError(item) if item == "bad" else item for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=2)
+
+    good, bad = await asyncio.gather(
+        batcher.submit("good"), batcher.submit("bad"), return_exceptions=True
+    )
+
+    assert good == "good"
+    assert isinstance(bad, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_handler_failure_fails_the_whole_batch():
+    async def handler(items):
+        raise ConnectionError("database down")
+
+    batcher = MicroBatcher(handler, max_batch_size=2)
+
+    outcomes = await asyncio.gather(
+        batcher.submit(1), batcher.submit(2), return_exceptions=True
+    )
+
+    assert all(isinstance(outcome, ConnectionError) for outcome in outcomes)
+
+
+@pytest.mark.asyncio
+async def test_handler_must_return_one_result_per_item():
+    async def handler(items):
+        return []
+
+    batcher = MicroBatcher(handler, max_batch_size=1)
+
+    with pytest.raises(RuntimeError):
+        await batcher.submit(1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_submitter_does_not_break_the_batch():
+    release = asyncio.Event()
+
+    async def handler(items):
+        await release.wait()
+        return items
+
+    batcher = MicroBatcher(handler, max_batch_size=2)
+    cancelled = asyncio.create_task(batcher.submit(1))
+    kept = asyncio.create_task(batcher.submit(2))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+
+    assert await kept == 2
+
+
+def test_max_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda items: items, max_batch_size=0)
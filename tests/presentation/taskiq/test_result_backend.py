@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from mongomock_motor import AsyncMongoMockClient
+from taskiq import TaskiqResult
+from taskiq.exceptions import ResultGetError
+
+from src.domain.background_task.value_objects import TaskState
+from src.infrastructure.mongodb.config import BeanieClient
+from src.infrastructure.mongodb.models.task_result import TaskResultDocument
+from src.presentation.taskiq.result_backend import MongoResultBackend
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def beanie_client():
+    beanie_client = BeanieClient(
+        mongo_uri="mongodb://localhost:27017",
+        mongo_database="test_task_results",
+        client=AsyncMongoMockClient(),
+    )
+    await beanie_client.initialize()
+    yield beanie_client
+    await TaskResultDocument.get_motor_collection().delete_many({})
+
+
+def succeeded(return_value=None) -> TaskiqResult:
+    return TaskiqResult(is_err=False, return_value=return_value, execution_time=0.5)
+
+
+@pytest.mark.asyncio
+async def test_results_round_trip():
+    backend = MongoResultBackend()
+    assert not await backend.is_result_ready("task-1")
+    with pytest.raises(ResultGetError):
+        await backend.get_result("task-1")
+
+    await backend.set_result("task-1", succeeded({"sent": 2}))
+
+    assert await backend.is_result_ready("task-1")
+    assert (await backend.get_result("task-1")).return_value == {"sent": 2}
+    result = await backend.get("task-1")
+    assert result.state == TaskState.Succeeded
+    assert result.return_value == {"sent": 2}
+    assert result.execution_time == 0.5
+    assert result.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_failures_keep_the_error():
+    backend = MongoResultBackend()
+
+    await backend.set_result(
+        "task-1",
+        TaskiqResult(
+            is_err=True, return_value=None, execution_time=0.1, error=ValueError("no user")
+        ),
+    )
+
+    result = await backend.get("task-1")
+    assert result.state == TaskState.Failed
+    assert result.error == "ValueError: no user"
+    assert isinstance((await backend.get_result("task-1")).error, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_wait_is_woken_by_a_result_set_in_process():
+    backend = MongoResultBackend(poll_interval_seconds=60)
+
+    waiting = asyncio.create_task(backend.wait("task-1", timeout_seconds=5))
+    await asyncio.sleep(0.01)
+    assert backend.waiting == 1
+    await backend.set_result("task-1", succeeded())
+
+    assert (await waiting).state == TaskState.Succeeded
+    assert backend.waiting == 0
+    assert backend.polls == 0
+    await backend.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_waiters_share_one_poll_for_results_of_other_processes():
+    backend = MongoResultBackend(poll_interval_seconds=0.05)
+    worker = MongoResultBackend()
+
+    waiting = [
+        asyncio.create_task(backend.wait(task_id, timeout_seconds=5))
+        for task_id in ("task-1", "task-1", "task-2")
+    ]
+    while backend.waiting < 3:
+        await asyncio.sleep(0.001)
+    await worker.set_result("task-1", succeeded())
+    await worker.set_result("task-2", succeeded())
+
+    results = await asyncio.gather(*waiting)
+    assert [result.task_id for result in results] == ["task-1", "task-1", "task-2"]
+    # One query per interval for every waiter, not one per waiter
+    assert 1 <= backend.polls <= 2
+    await asyncio.sleep(0.1)
+    # The poll loop stops once nobody waits
+    assert backend._poller is None
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out():
+    backend = MongoResultBackend(poll_interval_seconds=0.01)
+
+    assert await backend.wait("task-1", timeout_seconds=0) is None
+    assert await backend.wait("task-1", timeout_seconds=0.03) is None
+    assert backend.waiting == 0
+
+    await backend.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_stops_the_poller():
+    backend = MongoResultBackend(poll_interval_seconds=0.01)
+    waiting = asyncio.create_task(backend.wait("task-1", timeout_seconds=5))
+    while backend._poller is None:
+        await asyncio.sleep(0.001)
+    poller = backend._poller
+
+    await backend.shutdown()
+
+    assert poller.done()
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+
+
+def test_settings_must_be_positive():
+    with pytest.raises(ValueError):
+        MongoResultBackend(ttl_seconds=0)
@@ -0,0 +1,191 @@
+import struct
+from typing import Any
+
+import pytest
+from taskiq import InMemoryBroker
+from taskiq.message import TaskiqMessage
+from taskiq.serializers import JSONSerializer
+
+from src.application.dto.user_dto import WelcomeEmailTaskPayload
+from src.domain.background_task.value_objects import BackgroundTaskPayload, RawTaskPayload
+from src.presentation.taskiq.serialization import (
+    CompactTaskFormatter,
+    JSONArrayCodec,
+    MsgpackCodec,
+    task_payload_types,
+)
+from src.presentation.taskiq.tasks.registry import TASK_REGISTRY, TaskDefinition
+
+RECIPIENTS = ["first@example.com", "second@example.com"]
+
+
+class GreetingV1(BackgroundTaskPayload):
+    name: str
+
+
+class GreetingV2(BackgroundTaskPayload):
+    schema_version = 2
+
+    name: str
+    greeting: str = "Hello"
+
+    @classmethod
+    def upgrade(cls, data: dict[str, Any], schema_version: int) -> dict[str, Any]:
+        return {**data, "name": data["name"].title()}
+
+
+def make_message(payload: Any, task_name: str = "send_welcome_email") -> TaskiqMessage:
+    return TaskiqMessage(
+        task_id="task-1",
+        task_name=task_name,
+        labels={"task_id": "task-1"},
+        args=[],
+        kwargs={"payload": payload},
+    )
+
+
+def make_formatter(**kwargs) -> CompactTaskFormatter:
+    return CompactTaskFormatter({"send_welcome_email": WelcomeEmailTaskPayload}, **kwargs)
+
+
+def test_compact_round_trip_drops_field_names():
+    formatter = make_formatter()
+    payload = WelcomeEmailTaskPayload(recipients=RECIPIENTS)
+
+    data = formatter.dumps(make_message(payload)).message
+    loaded = formatter.loads(data)
+
+    assert data.startswith(b"TQ")
+    assert b"recipients" not in data
+    assert len(data) < len(JSONSerializer().dumpb(make_message(payload).model_dump()))
+    assert loaded.task_id == "task-1"
+    assert loaded.labels == {"task_id": "task-1"}
+    assert loaded.kwargs["payload"] == payload
+    assert isinstance(loaded.kwargs["payload"], WelcomeEmailTaskPayload)
+
+
+def test_default_json_is_still_read():
+    formatter = make_formatter()
+    message = make_message(WelcomeEmailTaskPayload(recipients=RECIPIENTS))
+
+    loaded = formatter.loads(JSONSerializer().dumpb(message.model_dump()))
+
+    assert loaded.kwargs["payload"] == {"recipients": RECIPIENTS}
+
+
+def test_json_wire_format_keeps_taskiq_default():
+    formatter = make_formatter(wire_format="json")
+    message = make_message(WelcomeEmailTaskPayload(recipients=RECIPIENTS))
+
+    data = formatter.dumps(message).message
+
+    assert JSONSerializer().loadb(data)["kwargs"] == {"payload": {"recipients": RECIPIENTS}}
+
+
+def test_newer_producer_fields_are_dropped():
+    producer = CompactTaskFormatter({"greet": GreetingV2})
+    consumer = CompactTaskFormatter({"greet": GreetingV1})
+
+    data = producer.dumps(make_message(GreetingV2(name="jane", greeting="Hi"), "greet")).message
+
+    assert consumer.loads(data).kwargs["payload"] == GreetingV1(name="jane")
+
+
+def test_older_producer_gets_defaults_and_upgrade():
+    producer = CompactTaskFormatter({"greet": GreetingV1})
+    consumer = CompactTaskFormatter({"greet": GreetingV2})
+
+    data = producer.dumps(make_message(GreetingV1(name="jane"), "greet")).message
+
+    assert consumer.loads(data).kwargs["payload"] == GreetingV2(name="Jane", greeting="Hello")
+
+
+def test_incomplete_raw_payload_keeps_field_names():
+    formatter = CompactTaskFormatter({"greet": GreetingV2})
+    payload = RawTaskPayload.model_validate({"name": "jane"})
+
+    loaded = formatter.loads(formatter.dumps(make_message(payload, "greet")).message)
+
+    assert loaded.kwargs["payload"] == {"name": "jane"}
+
+
+def test_complete_raw_payload_is_compacted():
+    formatter = make_formatter()
+    payload = RawTaskPayload.model_validate({"recipients": RECIPIENTS})
+
+    loaded = formatter.loads(formatter.dumps(make_message(payload)).message)
+
+    assert loaded.kwargs["payload"] == WelcomeEmailTaskPayload(recipients=RECIPIENTS)
+
+
+def test_unknown_task_keeps_arguments():
+    formatter = make_formatter()
+    message = TaskiqMessage(
+        task_id="task-1", task_name="other", labels={}, args=[1, "two"], kwargs={"flag": True}
+    )
+
+    loaded = formatter.loads(formatter.dumps(message).message)
+
+    assert loaded.args == [1, "two"]
+    assert loaded.kwargs == {"flag": True}
+
+
+def test_payload_without_schema_is_rejected():
+    data = make_formatter().dumps(
+        make_message(WelcomeEmailTaskPayload(recipients=RECIPIENTS))
+    ).message
+
+    with pytest.raises(ValueError):
+        CompactTaskFormatter({}).loads(data)
+
+
+@pytest.mark.parametrize(
+    "header", [struct.pack("!2sBBH", b"TQ", 9, 1, 1), struct.pack("!2sBBH", b"TQ", 1, 200, 1)]
+)
+def test_unknown_layout_or_codec(header):
+    with pytest.raises(ValueError):
+        make_formatter().loads(header + b"[]")
+
+
+class UnusedCodec(JSONArrayCodec):
+    codec_id = 42
+
+
+def test_codec_of_the_producer_is_used():
+    data = make_formatter(codec=JSONArrayCodec()).dumps(
+        make_message(WelcomeEmailTaskPayload(recipients=RECIPIENTS))
+    ).message
+
+    consumer = make_formatter(codec=UnusedCodec())
+
+    assert consumer.loads(data).kwargs["payload"].recipients == RECIPIENTS
+
+
+def test_msgpack_codec_round_trip():
+    pytest.importorskip("msgpack")
+    formatter = make_formatter(codec=MsgpackCodec())
+    payload = WelcomeEmailTaskPayload(recipients=RECIPIENTS)
+
+    assert formatter.loads(formatter.dumps(make_message(payload)).message).kwargs["payload"] == payload
+
+
+def test_task_payload_types():
+    assert task_payload_types(TASK_REGISTRY) == {"send_welcome_email": WelcomeEmailTaskPayload}
+    assert task_payload_types({"untyped": TaskDefinition(lambda payload: None)}) == {}
+
+
+@pytest.mark.asyncio
+async def test_tasks_receive_the_decoded_payload():
+    broker = InMemoryBroker().with_formatter(CompactTaskFormatter({"greet": GreetingV2}))
+    received = []
+
+    async def greet(payload: GreetingV2) -> None:
+        received.append(payload)
+
+    task = broker.register_task(greet, task_name="greet")
+    await broker.startup()
+    kicked = await task.kiq(payload=GreetingV2(name="jane"))
+    await kicked.wait_result(timeout=1)
+    await broker.shutdown()
+
+    assert received == [GreetingV2(name="jane")]
@@ -0,0 +1,18 @@
+import pytest
+
+from src.utils.page_token import InvalidPageTokenError, decode_page_token, encode_page_token
+
+
+def test_round_trip():
+    position = {"created_at": "2025-01-01T00:00:00", "id": "a5f1"}
+
+    token = encode_page_token(position)
+
+    assert "=" not in token
+    assert decode_page_token(token) == position
+
+
+@pytest.mark.parametrize("token", ["%%%", "bm90IGpzb24", encode_page_token([1, 2])])
+def test_invalid_tokens(token):
+    with pytest.raises(InvalidPageTokenError):
+        decode_page_token(token)